@@ -0,0 +1,101 @@
+"""Benchmark: decoding titleSearchServlet.do result sets.
+
+Builds a 500-row servlet response with the offline stand-in and measures
+rows/sec for the previous decode pipeline (``response.json()`` plus seven
+replace/regex passes per field) against ``src.services.decoding``, with and
+without orjson and with field projection.
+
+Usage:
+    python benchmarks/bench_decode.py [--rows 500] [--repeat 200]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services import decoding  # noqa: E402
+from src.testing.hkex_standin import HKEXStandin, StandinConfig  # noqa: E402
+
+PROJECTION = ("NEWS_ID", "DATE_TIME", "TITLE", "FILE_LINK")
+
+
+def _legacy_clean_html_entities(text: str) -> str:
+    """The cleaner as it was before the single-pass rewrite."""
+    if not text:
+        return text
+    text = text.replace("&lt;", "<")
+    text = text.replace("&gt;", ">")
+    text = text.replace("&amp;", "&")
+    text = re.sub(r"\\u003c", "<", text)
+    text = re.sub(r"\\u003e", ">", text)
+    text = re.sub(r"\\u2013", "-", text)
+    text = text.replace("\\u0026", "-")
+    text = text.replace("\\\\", "")
+    return text
+
+
+def _legacy_decode(body: bytes) -> list[dict]:
+    """The servlet decode path as it was before the rewrite."""
+    result_data = json.loads(body).get("result", [])
+    if isinstance(result_data, str):
+        result_data = result_data.strip()
+        if result_data.startswith("[") and result_data.endswith("]"):
+            result_data = json.loads(result_data)
+    return [
+        {key: _legacy_clean_html_entities(value) if isinstance(value, str) else value for key, value in item.items()}
+        for item in result_data
+        if isinstance(item, dict)
+    ]
+
+
+def _fast_decode(body: bytes, fields=None) -> list[dict]:
+    return decoding.decode_rows(decoding.loads(body).get("result", []), fields)
+
+
+def _measure(label: str, decode, body: bytes, repeat: int) -> float:
+    rows = len(decode(body))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode(body)
+    elapsed = time.perf_counter() - start
+    rate = rows * repeat / elapsed
+    print(f"{label:<34} {rate:>12,.0f} rows/s  ({elapsed / repeat * 1000:6.2f} ms per response)")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = HKEXStandin(StandinConfig(synthetic_per_stock=args.rows))
+    _, _, body = app.handle(
+        "/search/titleSearchServlet.do",
+        {"stockId": "1", "fromDate": "20000101", "toDate": "20991231", "rowRange": str(args.rows)},
+        {},
+    )
+    assert _legacy_decode(body) == _fast_decode(body), "decoders disagree"
+
+    print(f"{args.rows}-row servlet response ({len(body) / 1024:.0f} KiB), {args.repeat} decodes each")
+    before = _measure("before (json + 7 passes per field)", _legacy_decode, body, args.repeat)
+    orjson = decoding.orjson
+    decoding.orjson = None
+    _measure("after, stdlib json", _fast_decode, body, args.repeat)
+    decoding.orjson = orjson
+    if orjson is not None:
+        after = _measure("after, orjson", _fast_decode, body, args.repeat)
+    else:
+        after = before
+        print("after, orjson                      (orjson not installed)")
+    projected = _measure(f"after, projected to {len(PROJECTION)} fields", lambda b: _fast_decode(b, PROJECTION), body, args.repeat)
+    print(f"speedup: {after / before:.1f}x full rows, {projected / before:.1f}x projected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark: per-call httpx.Client vs. the shared pooled client.
+
+Starts a local stand-in for the hkexnews ``prefix.do`` endpoint and measures
+per-request latency of ``HKEXAPIService._get`` with the old "new client per
+call" pattern versus the shared ``HTTPClientManager`` pool. The request goes
+straight to ``_get`` so the stock ID cache does not hide the network cost.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--requests 200]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.hkex_api import HKEXAPIService  # noqa: E402
+from src.services.http_client import HTTPClientConfig, HTTPClientManager  # noqa: E402
+
+PREFIX_BODY = b'callback({"stockInfo":[{"stockId":1,"code":"00001","name":"CKH HOLDINGS"}]});'
+
+
+class _PrefixHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "text/javascript")
+        self.send_header("Content-Length", str(len(PREFIX_BODY)))
+        self.end_headers()
+        self.wfile.write(PREFIX_BODY)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+class _PerCallClientService(HKEXAPIService):
+    """Reproduces the previous behaviour: one fresh client per request."""
+
+    def _get(self, url: str, params: dict[str, str] | None = None) -> httpx.Response:
+        with httpx.Client(headers=self.DEFAULT_HEADERS, timeout=self.timeout, verify=False) as client:
+            response = client.get(url, params=params)
+            response.raise_for_status()
+            return response
+
+
+def _measure(service: HKEXAPIService, requests: int) -> list[float]:
+    url = service._stock_id_url("00001")
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        service._get(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{label:<22} mean={statistics.mean(latencies):7.3f} ms  "
+        f"p50={statistics.median(latencies):7.3f} ms  p95={p95:7.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--base-url", help="Benchmark against an existing server instead of the built-in stand-in")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _PrefixHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    per_call = _PerCallClientService()
+    per_call.BASE_URL = base_url
+    manager = HTTPClientManager(HTTPClientConfig.from_env())
+    pooled = HKEXAPIService(client_manager=manager)
+    pooled.BASE_URL = base_url
+
+    # Warm up both paths once
+    per_call._get(per_call._stock_id_url("00001"))
+    pooled._get(pooled._stock_id_url("00001"))
+
+    print(f"{args.requests} sequential prefix.do requests against {base_url}")
+    _report("new client per call", _measure(per_call, args.requests))
+    _report("shared pooled client", _measure(pooled, args.requests))
+
+    manager.close()
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
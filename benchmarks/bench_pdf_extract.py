@@ -0,0 +1,58 @@
+"""Benchmark: page-parallel PDF extraction, pages/sec by worker count.
+
+Writes a synthetic report (text on every page, headings and ruled tables on
+some) and extracts text, tables and structure with 1, 2, 4, ... worker
+processes up to the CPU count. The pool is started on a small warm-up
+document first, so the figures exclude process start-up.
+
+Usage:
+    python benchmarks/bench_pdf_extract.py [--pages 300] [--max-workers 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.pdf_parser import PDFParserService  # noqa: E402
+from src.testing.pdf_fixtures import report_pdf  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.pdf"
+        report.write_bytes(report_pdf(args.pages))
+        warmup = Path(tmp) / "warmup.pdf"
+        warmup.write_bytes(report_pdf(max(counts) * 2))
+        print(f"{args.pages} pages, {report.stat().st_size / 2**20:.1f} MiB, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in counts:
+            service = PDFParserService(extract_workers=workers, parallel_min_pages=1)
+            service.extract_all(str(warmup))
+            start = time.perf_counter()
+            service.extract_all(str(report))
+            seconds = time.perf_counter() - start
+            service.close()
+            rate = args.pages / seconds
+            baseline = baseline or rate
+            print(f"workers {workers:3d}  {seconds:7.2f} s  {rate:8.1f} pages/s  {rate / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
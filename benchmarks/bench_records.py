@@ -0,0 +1,79 @@
+"""Benchmark: memory of announcement rows as dicts versus ``Announcement`` records.
+
+Generates synthetic title-search rows with the offline stand-in, decodes
+them from JSON in servlet-sized batches (so, as in the service, every row
+owns its strings), and measures the traced allocation of the dict list and
+of the packed record list, plus pack/unpack throughput.
+
+Usage:
+    python benchmarks/bench_records.py [--records 1000000] [--stocks 2000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.records import pack, unpack  # noqa: E402
+from src.testing import hkex_standin  # noqa: E402
+
+BATCH = 500
+
+
+def _batches(records: int, stocks: int) -> list[str]:
+    """Serialize ``records`` synthetic rows as JSON batches of BATCH rows."""
+    universe = [{"code": f"{i:05d}", "stockId": i, "name": f"發行人{i}控股有限公司"} for i in range(1, stocks + 1)]
+    rows = hkex_standin._synthetic(universe, -(-records // stocks), random.Random(0))[:records]
+    return [json.dumps(rows[start : start + BATCH], ensure_ascii=False) for start in range(0, len(rows), BATCH)]
+
+
+def _traced(build) -> tuple[list, int, float]:
+    """Return what ``build`` returns, the memory it still holds and the seconds it took."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--stocks", type=int, default=2000)
+    args = parser.parse_args()
+
+    batches = _batches(args.records, args.stocks)
+    print(f"{args.records:,} rows over {args.stocks:,} stocks, decoded in {len(batches):,} batches")
+
+    rows, dict_bytes, _ = _traced(lambda: [row for batch in batches for row in json.loads(batch)])
+    print(f"dicts    {dict_bytes / 2**20:9.1f} MiB  ({dict_bytes / len(rows):5.0f} B/row)")
+    del rows
+
+    records, record_bytes, _ = _traced(lambda: [record for batch in batches for record in pack(json.loads(batch))])
+    print(
+        f"records  {record_bytes / 2**20:9.1f} MiB  ({record_bytes / len(records):5.0f} B/row)"
+        f"  {dict_bytes / record_bytes:.1f}x smaller"
+    )
+
+    rows = unpack(records)
+    start = time.perf_counter()
+    pack(rows)
+    pack_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    unpack(records)
+    unpack_seconds = time.perf_counter() - start
+    print(f"pack     {len(records) / pack_seconds:12,.0f} rows/s")
+    print(f"unpack   {len(records) / unpack_seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
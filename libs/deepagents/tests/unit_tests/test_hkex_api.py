@@ -0,0 +1,768 @@
+"""Unit tests for the sync and async HKEX API services."""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from src.services.announcement_index import AnnouncementIndex, build_match_query, latest_item_to_record
+from src.services.category_cache import CategoryCache, CategoryIndex
+from src.services.hkex_api import AsyncHKEXAPIService, HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.latest_feed import LatestFeedState
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.pdf_parser import PDFParserService
+from src.services.search_cache import (
+    SearchWindow,
+    SearchWindowCache,
+    merge_window_results,
+    plan_search_windows,
+    split_window,
+)
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+from src.tools import hkex_tools
+from src.tools.hkex_tools import _compact_batch, search_hkex_announcements
+
+SEARCH_RESULT = [
+    {
+        "NEWS_ID": "1",
+        "TITLE": "Results &amp; Dividend",
+        "DATE_TIME": "08/10/2025 16:30",
+        "FILE_LINK": "/listedco/listconews/sehk/2025/1008/a.pdf",
+        "STOCK_CODE": "00673",
+    }
+]
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("prefix.do"):
+        return httpx.Response(200, text='callback({"stockInfo":[{"stockId":7609,"code":"00673"}]});')
+    if path.endswith("titleSearchServlet.do"):
+        return httpx.Response(200, json={"result": json.dumps(SEARCH_RESULT)})
+    if path.endswith("activestock_sehk_c.json"):
+        return httpx.Response(200, json=[{"c": "00001", "i": 1, "n": "CKH"}, {"c": "00673", "i": 7609, "n": "CHINA HEALTH"}])
+    if path.endswith("lcisehk1relsdc_1.json"):
+        return httpx.Response(
+            200,
+            json={
+                "newsInfoLst": [
+                    {"newsId": 1, "market": "SEHK", "stock": [{"sc": "00673"}], "t1Code": "10000"},
+                    {"newsId": 2, "market": "GEM", "stock": [{"sc": "08001"}], "t1Code": "NaN"},
+                ]
+            },
+        )
+    return httpx.Response(404)
+
+
+def _manager(handler=_handler) -> HTTPClientManager:
+    transport = httpx.MockTransport(handler)
+    return HTTPClientManager(HTTPClientConfig(transport=transport, async_transport=transport))
+
+
+def _service(cls=HKEXAPIService, manager=None):
+    return cls(
+        client_manager=manager or _manager(),
+        stock_id_cache=StockIdCache(":memory:"),
+        search_cache=SearchWindowCache(":memory:"),
+        latest_feed=LatestFeedState(),
+        announcement_index=AnnouncementIndex(":memory:"),
+        category_cache=CategoryCache(":memory:"),
+        rate_limiter=RateLimiter(RateLimitConfig(rate=1000, max_rate=1000)),
+        single_flight=SingleFlight(),
+        resilience=Resilience(RetryPolicy(base_delay=0)),
+    )
+
+
+class TestHKEXAPIService:
+    """Test the sync service against a mocked transport."""
+
+    def test_get_stock_id(self):
+        """Test JSONP stock lookup."""
+        service = _service()
+        stock_id, info = service.get_stock_id("00673")
+        assert stock_id == 7609
+        assert info[0]["code"] == "00673"
+
+    def test_search_cleans_entities(self):
+        """Test that search results are decoded and cleaned."""
+        service = _service()
+        _, announcements = service.search_announcements("7609", "20250101", "20251008")
+        assert announcements[0]["TITLE"] == "Results & Dividend"
+
+    def test_http_error_is_reported(self):
+        """Test that HTTP errors are returned as error entries."""
+        service = _service()
+        categories = service.get_categories("tierone")
+        assert "error" in categories[0]
+
+
+class TestAsyncHKEXAPIService:
+    """Test the async service against a mocked transport."""
+
+    def test_matches_sync_results(self):
+        """Test that async endpoints return the same data as the sync ones."""
+        manager = _manager()
+        sync_service = _service(manager=manager)
+        async_service = _service(AsyncHKEXAPIService, manager)
+
+        async def run():
+            stock = await async_service.get_stock_id("00673")
+            search = await async_service.search_announcements("7609", "20250101", "20251008")
+            latest = await async_service.get_latest_announcements(market="SEHK")
+            await manager.aclose()
+            return stock, search, latest
+
+        stock, search, latest = asyncio.run(run())
+        assert stock == sync_service.get_stock_id("00673")
+        assert search == sync_service.search_announcements("7609", "20250101", "20251008")
+        assert [item["newsId"] for item in latest] == [1]
+
+    def test_concurrent_calls_share_client(self):
+        """Test that concurrent coroutines reuse one async client per loop."""
+        manager = _manager()
+        service = _service(AsyncHKEXAPIService, manager)
+
+        async def run():
+            results = await asyncio.gather(*(service.get_stock_id("00673") for _ in range(5)))
+            client = manager.get_async_client()
+            assert client is manager.get_async_client()
+            await manager.aclose()
+            return results
+
+        results = asyncio.run(run())
+        assert all(stock_id == 7609 for stock_id, _ in results)
+
+
+class TestStockIdCache:
+    """Test persistent stock ID resolution."""
+
+    def test_second_lookup_is_served_from_cache(self):
+        """Test that a resolved stock code skips prefix.do."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return _handler(request)
+
+        service = _service(manager=_manager(handler))
+        assert service.get_stock_id("00673")[0] == 7609
+        assert service.get_stock_id("00673")[0] == 7609
+        assert len(calls) == 1
+        assert service.stock_id_cache.stats()["hits"] == 1
+
+    def test_preload_resolves_locally(self):
+        """Test that a bulk preload fills the cache."""
+        service = _service()
+        result = service.preload_stock_ids(markets=("SEHK",))
+        assert result == {"loaded": {"SEHK": 2}, "errors": {}}
+        assert service.stock_id_cache.get("00001") == (1, [{"stockId": 1, "code": "00001", "name": "CKH"}])
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        db_path = tmp_path / "stock_ids.sqlite3"
+        StockIdCache(db_path).put("00673", 7609, [{"stockId": 7609}])
+        assert StockIdCache(db_path).get("00673") == (7609, [{"stockId": 7609}])
+
+    def test_expired_entries_miss(self):
+        """Test that entries older than the TTL are ignored."""
+        cache = StockIdCache(":memory:", ttl_seconds=-1)
+        cache.put("00673", 7609, [])
+        assert cache.get("00673") is None
+        assert cache.stats()["misses"] == 1
+
+
+class TestSearchWindowCache:
+    """Test immutable-window search caching."""
+
+    def test_plan_splits_closed_months_and_open_tail(self):
+        """Test that past months are cached and the current month is the open tail."""
+        plan = plan_search_windows(date(2025, 1, 15), date(2025, 3, 31), today=date(2025, 3, 10))
+        assert plan.closed == [
+            SearchWindow(date(2025, 1, 1), date(2025, 1, 31)),
+            SearchWindow(date(2025, 2, 1), date(2025, 2, 28)),
+        ]
+        assert plan.tail == SearchWindow(date(2025, 3, 1), date(2025, 3, 31))
+
+    def test_plan_keys_are_stable_across_days(self):
+        """Test that a rolling lookback plans the same closed windows on consecutive days."""
+        plans = [
+            plan_search_windows(date(2025, 1, 1), today, today=today)
+            for today in (date(2025, 3, 10), date(2025, 3, 11))
+        ]
+        assert plans[0].closed == plans[1].closed
+        assert all(window.end < date(2025, 3, 1) for window in plans[0].closed)
+
+    def test_plan_past_range_has_no_tail(self):
+        """Test that a range ending before the current month is fully cacheable."""
+        plan = plan_search_windows(date(2025, 1, 15), date(2025, 2, 10), today=date(2025, 3, 10))
+        assert plan.closed == [
+            SearchWindow(date(2025, 1, 1), date(2025, 1, 31)),
+            SearchWindow(date(2025, 2, 1), date(2025, 2, 10)),
+        ]
+        assert plan.tail is None
+
+    def test_historical_search_is_served_from_cache(self, monkeypatch):
+        """Test that a repeated historical search makes no network call."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2026, 1, 5))
+        calls = []
+
+        def handler(request):
+            calls.append(dict(request.url.params))
+            return _handler(request)
+
+        service = _service(manager=_manager(handler))
+        first = service.search_announcements("7609", "20250101", "20251231")
+        second = service.search_announcements("7609", "20250101", "20251231")
+
+        assert first == second
+        assert first[1][0]["NEWS_ID"] == "1"
+        assert len(calls) == 1
+        assert calls[0]["rowRange"] == "500"
+
+    def test_only_open_tail_is_refetched(self, monkeypatch):
+        """Test that only the current month goes to the network when warm."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2025, 10, 8))
+        calls = []
+
+        def handler(request):
+            calls.append(dict(request.url.params))
+            return _handler(request)
+
+        service = _service(manager=_manager(handler))
+        service.search_announcements("7609", "20250101", "20251008")
+        calls.clear()
+        _, announcements = service.search_announcements("7609", "20250101", "20251008")
+
+        assert [(c["fromDate"], c["toDate"]) for c in calls] == [("20251001", "20251008")]
+        assert announcements[0]["NEWS_ID"] == "1"
+
+    def test_results_are_clipped_to_requested_range(self, monkeypatch):
+        """Test that whole-month windows are filtered back to the requested dates."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2026, 1, 5))
+        service = _service()
+        _, announcements = service.search_announcements("7609", "20251009", "20251031")
+        assert announcements == []
+
+
+class TestWindowSplitting:
+    """Test adaptive sub-window searches past the 500-row cap."""
+
+    @staticmethod
+    def _busy_handler(calls):
+        """Serve 20 announcements per day in Jan-Feb 2024, capped at 500 rows like the real servlet."""
+        rows = [
+            {"NEWS_ID": f"{day:%m%d}-{n}", "DATE_TIME": f"{day:%d/%m/%Y} 12:00"}
+            for day in (date(2024, 1, 1) + timedelta(days=offset) for offset in range(60))
+            for n in range(20)
+        ]
+
+        def handler(request):
+            params = request.url.params
+            calls.append((params["fromDate"], params["toDate"]))
+            start, end = params["fromDate"], params["toDate"]
+            matched = [r for r in reversed(rows) if start <= datetime.strptime(r["DATE_TIME"][:10], "%d/%m/%Y").strftime("%Y%m%d") <= end]
+            return httpx.Response(200, json={"result": json.dumps(matched[:500])})
+
+        return handler
+
+    def test_split_window(self):
+        """Test month-boundary splits for long windows and halving for short ones."""
+        assert split_window(SearchWindow(date(2024, 1, 15), date(2024, 3, 10))) == [
+            SearchWindow(date(2024, 1, 15), date(2024, 1, 31)),
+            SearchWindow(date(2024, 2, 1), date(2024, 2, 29)),
+            SearchWindow(date(2024, 3, 1), date(2024, 3, 10)),
+        ]
+        assert split_window(SearchWindow(date(2024, 1, 1), date(2024, 1, 4))) == [
+            SearchWindow(date(2024, 1, 1), date(2024, 1, 2)),
+            SearchWindow(date(2024, 1, 3), date(2024, 1, 4)),
+        ]
+        assert split_window(SearchWindow(date(2024, 1, 1), date(2024, 1, 1))) == []
+
+    def test_merge_dedupes_newest_first(self):
+        """Test that merged windows are ordered newest first without repeated NEWS_IDs."""
+        older, newer = SearchWindow(date(2024, 1, 1), date(2024, 1, 2)), SearchWindow(date(2024, 1, 3), date(2024, 1, 4))
+        merged = merge_window_results({older: [{"NEWS_ID": "1"}, {"NEWS_ID": "2"}], newer: [{"NEWS_ID": "3"}, {"NEWS_ID": "2"}]})
+        assert [item["NEWS_ID"] for item in merged] == ["3", "2", "1"]
+
+    def test_saturated_range_returns_complete_results(self, monkeypatch):
+        """Test that a range beyond the row cap is split until every window is complete."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2025, 1, 5))
+        calls = []
+        service = _service(manager=_manager(self._busy_handler(calls)))
+
+        _, announcements = service.search_announcements("1", "20240101", "20240229", row_range=2000)
+
+        assert len(announcements) == 1200
+        assert len({a["NEWS_ID"] for a in announcements}) == 1200
+        assert announcements[0]["NEWS_ID"] == "0229-19"
+        assert calls[0] == ("20240101", "20240229")
+        assert service.search_cache.stats()["windows"] == 2
+
+        calls.clear()
+        assert service.search_announcements("1", "20240101", "20240229", row_range=2000)[1] == announcements
+        assert calls == []
+
+    def test_sqlite_runs_off_the_event_loop(self, monkeypatch):
+        """Test that index and search cache reads and writes do not block the event loop."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2026, 1, 5))
+        service = _service(AsyncHKEXAPIService)
+        threads = []
+        targets = [(service.announcement_index, "upsert"), (service.announcement_index, "covers")]
+        targets += [(service.search_cache, "get"), (service.search_cache, "put")]
+        for target, name in targets:
+            real = getattr(target, name)
+
+            def recording(*args, _real=real, **kwargs):
+                threads.append(threading.get_ident())
+                return _real(*args, **kwargs)
+
+            monkeypatch.setattr(target, name, recording)
+
+        async def run():
+            await service.search_announcements("7609", "20251001", "20251031")
+            await service.search_announcements("7609", "20251001", "20251031", title="dividend")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        assert threads and loop_thread not in threads
+
+    def test_async_split_matches_sync(self, monkeypatch):
+        """Test that the async engine returns the same complete results."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2025, 1, 5))
+        manager = _manager(self._busy_handler([]))
+        async_service = _service(AsyncHKEXAPIService, manager)
+
+        async def run():
+            result = await async_service.search_announcements("1", "20240101", "20240229", row_range=2000)
+            await manager.aclose()
+            return result
+
+        _, announcements = asyncio.run(run())
+        sync_service = _service(manager=_manager(self._busy_handler([])))
+        assert announcements == sync_service.search_announcements("1", "20240101", "20240229", row_range=2000)[1]
+
+
+class TestBatchSearch:
+    """Test concurrent watchlist searches."""
+
+    @staticmethod
+    def _watchlist_handler(request):
+        if request.url.path.endswith("prefix.do"):
+            code = request.url.params["name"]
+            if code == "99999":
+                return httpx.Response(200, text='callback({"stockInfo":[]});')
+            return httpx.Response(200, text=f'callback({{"stockInfo":[{{"stockId":{int(code)},"code":"{code}"}}]}});')
+        if request.url.params.get("stockId") == "2":
+            return httpx.Response(503)
+        return _handler(request)
+
+    def test_per_stock_results_and_errors(self):
+        """Test that each stock gets its own row and failures stay per item."""
+        service = _service(manager=_manager(self._watchlist_handler))
+        entries = service.search_announcements_batch(["00001", "00002", "99999", "00001", " "], "20250101", "20251008")
+
+        assert [e["stock_code"] for e in entries] == ["00001", "00002", "99999"]
+        assert entries[0]["error"] is None
+        assert entries[0]["announcements"][0]["NEWS_ID"] == "1"
+        assert "503" in entries[1]["error"]
+        assert entries[2] == {"stock_code": "99999", "stock_id": None, "announcements": [], "error": "Stock not found"}
+
+    def test_async_batch_matches_sync(self):
+        """Test that the async batch returns the same rows as the sync one."""
+        manager = _manager(self._watchlist_handler)
+        async_service = _service(AsyncHKEXAPIService, manager)
+
+        async def run():
+            result = await async_service.search_announcements_batch(["00001", "99999"], "20250101", "20251008", concurrency=1)
+            await manager.aclose()
+            return result
+
+        sync_service = _service(manager=_manager(self._watchlist_handler))
+        assert asyncio.run(run()) == sync_service.search_announcements_batch(["00001", "99999"], "20250101", "20251008")
+
+    def test_compact_table(self):
+        """Test that tool output keeps only compact fields and per-stock errors."""
+        table = _compact_batch(
+            [
+                {"stock_code": "00001", "stock_id": 1, "announcements": SEARCH_RESULT * 3, "error": None},
+                {"stock_code": "99999", "stock_id": None, "announcements": [], "error": "Stock not found"},
+            ],
+            max_per_stock=2,
+        )
+        assert table["stocks"] == 2
+        assert table["errors"] == 1
+        assert table["results"][0]["count"] == 3
+        assert len(table["results"][0]["announcements"]) == 2
+        assert set(table["results"][0]["announcements"][0]) == {"NEWS_ID", "DATE_TIME", "TITLE", "FILE_LINK"}
+        assert table["results"][1]["error"] == "Stock not found"
+
+
+class TestCategoryCache:
+    """Test memoized category tables and their lookups."""
+
+    TABLES = {
+        "tierone_c.json": [{"code": "10000", "name": "公告及通告"}, {"code": "40000", "name": "財務報表"}],
+        "tiertwo_c.json": [{"code": "13300", "name": "供股", "t1code": "10000"}, {"code": "13400", "name": "配售"}],
+        "tiertwogrp_c.json": [{"code": "7", "name": "集資", "t2code": "13300,13400"}],
+    }
+
+    def _category_handler(self, calls):
+        def handler(request):
+            name = request.url.path.rsplit("/", 1)[-1]
+            calls.append(name)
+            if name in self.TABLES:
+                return httpx.Response(200, json=self.TABLES[name])
+            if name == "lcisehk1relsdc_1.json":
+                return httpx.Response(
+                    200,
+                    json={
+                        "newsInfoLst": [
+                            {"newsId": 1, "market": "SEHK", "stock": [], "t1Code": "10000", "t2Code": "13300"},
+                            {"newsId": 2, "market": "SEHK", "stock": [], "t1Code": "40000", "t2Code": "40100"},
+                        ]
+                    },
+                )
+            return _handler(request)
+
+        return handler
+
+    def test_tables_are_fetched_once(self):
+        """Test that repeated category requests are served from the cache."""
+        calls = []
+        service = _service(manager=_manager(self._category_handler(calls)))
+        assert service.get_categories("tierone") == self.TABLES["tierone_c.json"]
+        assert service.get_categories("tierone") == self.TABLES["tierone_c.json"]
+        assert calls == ["tierone_c.json"]
+
+    def test_persisted_tables_survive_restart(self, tmp_path):
+        """Test that a new cache instance reads tables from disk."""
+        CategoryCache(tmp_path / "categories.sqlite3").put("tierone", self.TABLES["tierone_c.json"])
+        assert CategoryCache(tmp_path / "categories.sqlite3").get("tierone") == self.TABLES["tierone_c.json"]
+
+    def test_stale_table_is_served_when_refresh_fails(self):
+        """Test the fallback to an expired table on network errors."""
+        cache = CategoryCache(":memory:", refresh_seconds=-1)
+        cache.put("tiertwo", self.TABLES["tiertwo_c.json"])
+        service = HKEXAPIService(client_manager=_manager(lambda request: httpx.Response(503)), category_cache=cache)
+        assert service.get_categories("tiertwo") == self.TABLES["tiertwo_c.json"]
+
+    def test_failed_fetch_is_not_retried_at_once(self):
+        """Test that a failing categories endpoint is skipped until the failure expires."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        service = _service(manager=_manager(handler))
+        assert service.get_categories("tierone")[0]["error_type"] == "http_status"
+        attempts = len(calls)
+        assert service.get_categories("tierone")[0]["error_type"] == "http_status"
+        assert len(calls) == attempts
+
+        service.category_cache.failure_seconds = -1
+        service.get_categories("tierone")
+        assert len(calls) > attempts
+
+    def test_latest_tool_fetches_categories_only_for_names(self, monkeypatch):
+        """Test that the latest-feed tool skips the category tables unless a name must be resolved."""
+        calls = []
+        service = _service(manager=_manager(self._category_handler(calls)))
+        monkeypatch.setattr(hkex_tools, "_hkex_service", service)
+        result = hkex_tools.get_latest_hkex_announcements.invoke({"t1_code": "10000"})
+        assert [item["newsId"] for item in result["announcements"]] == [1]
+        assert "t1Name" not in result["announcements"][0]
+        assert calls == ["lcisehk1relsdc_1.json"]
+
+        result = hkex_tools.get_latest_hkex_announcements.invoke({"t1_code": "財務報表"})
+        assert [item["newsId"] for item in result["announcements"]] == [2]
+        assert result["announcements"][0]["t1Name"] == "財務報表"
+        assert set(calls) == {"lcisehk1relsdc_1.json", "tierone_c.json", "tiertwo_c.json", "tiertwogrp_c.json"}
+
+    def test_index_lookups(self):
+        """Test code/name maps and tier 2 group membership."""
+        index = CategoryIndex({key.removesuffix("_c.json"): value for key, value in self.TABLES.items()})
+        assert index.t1_names["10000"] == "公告及通告"
+        assert index.resolve_code("財務報表") == "40000"
+        assert index.resolve_code("供股", tier=2) == "13300"
+        assert index.t2_parents == {"13300": "10000"}
+        assert index.group_members == {"7": {"13300", "13400"}}
+        assert index.group_of("13400") == ["7"]
+        assert index.enrich_latest({"t1Code": "10000", "t2Code": "NaN"}) == {"t1Code": "10000", "t2Code": "NaN", "t1Name": "公告及通告"}
+
+    def test_latest_feed_group_filter(self):
+        """Test filtering the latest feed by a tier 2 group resolved locally."""
+        service = _service(manager=_manager(self._category_handler([])))
+        assert [item["newsId"] for item in service.get_latest_announcements(t2g_code="7")] == [1]
+
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight requests."""
+
+    @staticmethod
+    def _slow_handler(calls):
+        def handler(request):
+            calls.append(request.url.path)
+            time.sleep(0.05)
+            return _handler(request)
+
+        return handler
+
+    def test_concurrent_threads_share_one_request(self):
+        """Test that identical lookups from several threads hit the network once."""
+        calls = []
+        service = _service(manager=_manager(self._slow_handler(calls)))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get_stock_id("00673"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert [stock_id for stock_id, _ in results] == [7609] * 5
+
+    def test_concurrent_coroutines_share_one_request(self):
+        """Test that identical lookups from several coroutines hit the network once."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.05)
+            return _handler(request)
+
+        manager = _manager(handler)
+        service = _service(AsyncHKEXAPIService, manager)
+
+        async def run():
+            results = await asyncio.gather(*(service.get_stock_id("00673") for _ in range(5)))
+            await manager.aclose()
+            return results
+
+        assert [stock_id for stock_id, _ in asyncio.run(run())] == [7609] * 5
+        assert len(calls) == 1
+
+    def test_errors_are_shared(self):
+        """Test that waiting callers receive the leader's exception."""
+        flight = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                flight.do("key", fail)
+            except ValueError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        follower = threading.Thread(target=call)
+        follower.start()
+        leader.join()
+        follower.join()
+
+        assert errors == ["boom", "boom"]
+        assert flight.stats() == {"calls": 1, "shared": 1, "in_flight": 0}
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test that a follower of a cancelled leader runs the call itself."""
+        flight = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return len(runs)
+
+        async def run():
+            leader = asyncio.create_task(flight.ado("key", work))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.ado("key", work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            result = await follower
+            assert leader.cancelled()
+            return result
+
+        assert asyncio.run(run()) == 2
+        assert flight.stats()["in_flight"] == 0
+
+    def test_concurrent_pdf_downloads_share_one_request(self, tmp_path):
+        """Test that the same PDF requested concurrently is downloaded once."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            time.sleep(0.05)
+            return httpx.Response(200, content=b"%PDF-1.4")
+
+        parser = PDFParserService(client_manager=_manager(handler), single_flight=SingleFlight())
+        paths = []
+        threads = [
+            threading.Thread(
+                target=lambda: paths.append(parser.download_pdf("/a.pdf", "00673", "2025-10-08", "Results", str(tmp_path)))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(set(paths)) == 1
+
+
+class TestLatestFeedPolling:
+    """Test conditional, incremental polling of the latest feed."""
+
+    def _feed_handler(self, feed, requests):
+        def handler(request):
+            requests.append(request)
+            etag = f'"{len(feed)}"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            return httpx.Response(200, json={"newsInfoLst": list(feed)}, headers={"ETag": etag})
+
+        return handler
+
+    def test_unchanged_feed_returns_nothing_new(self):
+        """Test that a 304 poll returns no items and keeps the snapshot."""
+        feed = [{"newsId": 1, "market": "SEHK", "stock": [{"sc": "00673"}]}]
+        requests = []
+        service = _service(manager=_manager(self._feed_handler(feed, requests)))
+
+        first = service.poll_latest_announcements()
+        second = service.poll_latest_announcements(since=first["cursor"])
+
+        assert [item["newsId"] for item in first["announcements"]] == [1]
+        assert second == {"announcements": [], "cursor": first["cursor"], "modified": False}
+        assert requests[1].headers["If-None-Match"] == '"1"'
+        assert service.get_latest_announcements(stock_code="00673") == feed
+
+    def test_only_new_items_after_cursor(self):
+        """Test that newly published items are diffed by newsId."""
+        feed = [{"newsId": 1, "market": "SEHK", "stock": []}]
+        service = _service(manager=_manager(self._feed_handler(feed, [])))
+
+        cursor = service.poll_latest_announcements()["cursor"]
+        feed.insert(0, {"newsId": 2, "market": "GEM", "stock": []})
+        feed.insert(0, {"newsId": 3, "market": "SEHK", "stock": []})
+        result = service.poll_latest_announcements(since=cursor, market="SEHK")
+
+        assert [item["newsId"] for item in result["announcements"]] == [3]
+        assert result["modified"] is True
+
+    def test_unknown_cursor_returns_whole_feed(self):
+        """Test that a stale cursor falls back to the full snapshot."""
+        feed = [{"newsId": 1, "market": "SEHK", "stock": []}]
+        service = _service(manager=_manager(self._feed_handler(feed, [])))
+        result = service.poll_latest_announcements(since="stale:99")
+        assert len(result["announcements"]) == 1
+
+
+class TestAnnouncementIndex:
+    """Test the local FTS5 announcement index."""
+
+    RECORDS = [
+        {
+            "NEWS_ID": "11",
+            "TITLE": "建議供股",
+            "DATE_TIME": "02/09/2025 18:00",
+            "STOCK_CODE": "00673",
+            "LONG_TEXT": "公告及通告 - [供股]",
+        },
+        {"NEWS_ID": "12", "TITLE": "配售新股份", "DATE_TIME": "15/09/2025 07:00", "STOCK_CODE": "08001"},
+        {"NEWS_ID": "13", "TITLE": "董事會會議召開日期", "DATE_TIME": "20/09/2025 16:30", "STOCK_CODE": "00001"},
+    ]
+
+    def test_match_query_supports_or_and(self):
+        """Test translation of "|" and whitespace into FTS5 operators."""
+        assert build_match_query("供股|配售 公告") == '("供股") OR ("配售" AND "公告")'
+        assert build_match_query("  ") is None
+
+    def test_keyword_scan_across_issuers(self):
+        """Test OR queries, simplified input and filters."""
+        index = AnnouncementIndex(":memory:")
+        assert index.upsert(self.RECORDS) == 3
+
+        assert [r["NEWS_ID"] for r in index.search("供股|配售")] == ["12", "11"]
+        assert [r["NEWS_ID"] for r in index.search("董事会")] == ["13"]
+        assert [r["NEWS_ID"] for r in index.search("供股", title_only=True, stock_code="673")] == ["11"]
+        assert index.search("配售", to_iso="2025-09-10") == []
+
+    def test_upsert_replaces_existing_record(self):
+        """Test that re-indexing a record does not duplicate it."""
+        index = AnnouncementIndex(":memory:")
+        index.upsert(self.RECORDS)
+        index.upsert([{**self.RECORDS[0], "TITLE": "終止供股"}])
+        assert [r["TITLE"] for r in index.search("供股")] == ["終止供股"]
+        assert index.stats()["announcements"] == 3
+
+    def test_latest_feed_items_are_indexed(self):
+        """Test that latest-feed items are converted to search records."""
+        record = latest_item_to_record(
+            {"newsId": 5, "title": "盈利警告", "relTime": "08/10/2025 12:00", "stock": [{"sc": "00673"}], "t1Code": "10000"}
+        )
+        assert record["NEWS_ID"] == "5"
+        assert record["T1_CODE"] == "10000"
+
+        index = AnnouncementIndex(":memory:")
+        index.upsert([record])
+        assert index.search("盈利", t1_code="10000")[0]["STOCK_CODE"] == "00673"
+
+    def test_titled_search_is_answered_from_index(self, monkeypatch):
+        """Test that a titled search over a fully fetched range needs no request."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2026, 1, 5))
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return _handler(request)
+
+        service = _service(manager=_manager(handler))
+        service.search_announcements("7609", "20251001", "20251031")
+        calls.clear()
+        _, announcements = service.search_announcements("7609", "20251001", "20251031", title="dividend")
+
+        assert calls == []
+        assert [a["NEWS_ID"] for a in announcements] == ["1"]
+
+    def test_index_answers_match_remote_semantics(self, monkeypatch):
+        """Test that index-answered titled searches use literal substring matching."""
+        monkeypatch.setattr("src.services.search_cache.hk_today", lambda: date(2026, 1, 5))
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return _handler(request)
+
+        service = _service(manager=_manager(handler))
+        service.search_announcements("7609", "20251001", "20251031")
+        calls.clear()
+        for title in ("dividend|bonus", "results dividend", "dividend results"):
+            _, announcements = service.search_announcements("7609", "20251001", "20251031", title=title)
+            assert announcements == []
+        _, announcements = service.search_announcements("7609", "20251001", "20251031", title="RESULTS & DIV")
+        assert [a["NEWS_ID"] for a in announcements] == ["1"]
+        assert calls == []
+
+
+class TestAsyncTools:
+    """Test that HKEX tools expose real coroutines."""
+
+    def test_search_tool_has_coroutine(self):
+        """Test that the search tool can be awaited."""
+        assert search_hkex_announcements.coroutine is not None
@@ -0,0 +1,170 @@
+"""Unit tests for the resumable announcement backfill."""
+
+import json
+import sqlite3
+
+import httpx
+import pytest
+
+from src.services.announcement_index import AnnouncementIndex
+from src.services.backfill import METADATA_FILENAME, Backfill, BackfillCheckpoint, StockResult
+from src.services.category_cache import CategoryCache
+from src.services.hkex_api import HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.latest_feed import LatestFeedState
+from src.services.pdf_parser import PDFParserService
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.search_cache import SearchWindowCache
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+from src.testing.hkex_standin import HKEXStandin
+
+
+@pytest.fixture
+def app():
+    return HKEXStandin()
+
+
+@pytest.fixture
+def backfill_factory(app, tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        app.requests[app.endpoint(request.url.path)] += 1
+        status, response_headers, body = app.handle(request.url.path, dict(request.url.params), headers)
+        return httpx.Response(status, headers=response_headers, content=body)
+
+    manager = HTTPClientManager(HTTPClientConfig(transport=httpx.MockTransport(handler)))
+    limiter = RateLimiter(RateLimitConfig(rate=1000, max_rate=1000))
+    hkex_service = HKEXAPIService(
+        client_manager=manager,
+        stock_id_cache=StockIdCache(":memory:"),
+        search_cache=SearchWindowCache(":memory:"),
+        latest_feed=LatestFeedState(),
+        announcement_index=AnnouncementIndex(":memory:"),
+        category_cache=CategoryCache(":memory:"),
+        rate_limiter=limiter,
+        single_flight=SingleFlight(),
+        resilience=Resilience(RetryPolicy(max_attempts=1)),
+        base_url="http://hkex.test",
+    )
+    pdf_service = PDFParserService(client_manager=manager, rate_limiter=limiter, base_url="http://hkex.test")
+    checkpoint = BackfillCheckpoint(tmp_path / "checkpoint.sqlite3")
+
+    def make(stock_codes, **kwargs):
+        kwargs.setdefault("concurrency", 1)
+        return Backfill(
+            stock_codes,
+            "20250101",
+            "20251008",
+            tmp_path / "pdf_cache",
+            hkex_service=hkex_service,
+            pdf_service=pdf_service,
+            checkpoint=checkpoint,
+            **kwargs,
+        )
+
+    return make
+
+
+class TestBackfill:
+    """Test crawling, output layout and throughput totals."""
+
+    def test_metadata_and_pdfs(self, app, backfill_factory, tmp_path):
+        """Test that metadata and PDFs land in the PDF cache layout."""
+        stats = backfill_factory(["00673", "700"]).run()
+        assert (stats.done_stocks, stats.failed_stocks) == (2, 0)
+        assert stats.announcements == 7
+        assert stats.pdfs == app.requests["pdf"] == 7
+        assert stats.bytes > 0 and stats.mb_per_second > 0
+        assert stats.to_dict()["announcements_per_second"] > 0
+
+        stock_dir = tmp_path / "pdf_cache" / "00700"
+        metadata = json.loads((stock_dir / METADATA_FILENAME).read_text(encoding="utf-8"))
+        assert len(metadata) == 2
+        assert len(list(stock_dir.glob("*.pdf"))) == 2
+
+    def test_metadata_only(self, app, backfill_factory):
+        """Test that PDFs are skipped when not requested."""
+        stats = backfill_factory(["00673"], download_pdfs=False).run()
+        assert stats.announcements == 5
+        assert stats.pdfs == app.requests["pdf"] == 0
+
+    def test_cached_pdfs_skipped(self, app, backfill_factory):
+        """Test that PDFs already on disk are not downloaded again."""
+        backfill_factory(["00700"]).run()
+        stats = backfill_factory(["00700"]).run(restart=True)
+        assert (stats.pdfs, stats.cached_pdfs, stats.bytes) == (0, 2, 0)
+        assert app.requests["pdf"] == 2
+
+    def test_failed_pdf_does_not_fail_stock(self, app, backfill_factory, monkeypatch):
+        """Test that one failed download is counted and the stock's other PDFs still download."""
+        real_download = PDFParserService.download_pdf
+        calls = []
+
+        def flaky_download(self, url, *args, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                raise RuntimeError("connection reset")
+            return real_download(self, url, *args, **kwargs)
+
+        monkeypatch.setattr(PDFParserService, "download_pdf", flaky_download)
+        stats = backfill_factory(["00673"]).run()
+        assert (stats.done_stocks, stats.failed_stocks) == (1, 0)
+        assert (stats.pdfs, stats.failed_pdfs) == (4, 1)
+        assert stats.to_dict()["failed_pdfs"] == 1
+
+        stats = backfill_factory(["00673"]).run(restart=True)
+        assert (stats.pdfs, stats.cached_pdfs, stats.failed_pdfs) == (1, 4, 0)
+
+
+class TestResume:
+    """Test checkpointing and resuming."""
+
+    def test_finished_stocks_skipped(self, app, backfill_factory):
+        """Test that a rerun of the same job does no work."""
+        backfill_factory(["00673", "00700"]).run()
+        searches = app.requests["search"]
+        stats = backfill_factory(["00673", "00700"]).run()
+        assert (stats.skipped_stocks, stats.done_stocks) == (2, 0)
+        assert app.requests["search"] == searches
+
+    def test_interrupted_run_resumes(self, backfill_factory):
+        """Test that an interrupted run continues with the remaining stocks."""
+
+        def interrupt(result, stats):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            backfill_factory(["00673", "00700"]).run(on_progress=interrupt)
+        stats = backfill_factory(["00673", "00700"]).run()
+        assert (stats.skipped_stocks, stats.done_stocks) == (1, 1)
+
+    def test_failed_stocks_retried(self, backfill_factory):
+        """Test that failures are recorded but retried on the next run."""
+        stats = backfill_factory(["99999", "00700"]).run()
+        assert (stats.done_stocks, stats.failed_stocks) == (1, 1)
+        stats = backfill_factory(["99999", "00700"]).run()
+        assert (stats.skipped_stocks, stats.failed_stocks) == (1, 1)
+
+    def test_old_checkpoint_upgraded(self, tmp_path):
+        """Test that a checkpoint written before failed PDFs were counted still works."""
+        path = tmp_path / "old.sqlite3"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE progress (job TEXT NOT NULL, stock_code TEXT NOT NULL, announcements INTEGER NOT NULL,"
+            " pdfs INTEGER NOT NULL, bytes INTEGER NOT NULL, error TEXT, finished_at REAL NOT NULL,"
+            " PRIMARY KEY (job, stock_code))"
+        )
+        conn.execute("INSERT INTO progress VALUES ('job', '00001', 1, 1, 1, NULL, 0)")
+        conn.commit()
+        conn.close()
+
+        checkpoint = BackfillCheckpoint(path)
+        checkpoint.record("job", StockResult("00700", failed_pdfs=2))
+        assert checkpoint.done("job") == {"00001", "00700"}
+
+    def test_job_key(self, backfill_factory):
+        """Test that a metadata-only run does not count as a PDF run."""
+        backfill_factory(["00700"], download_pdfs=False).run()
+        assert backfill_factory(["00700"]).run().skipped_stocks == 0
@@ -0,0 +1,115 @@
+"""Unit tests for the Arrow/Parquet form of announcement metadata."""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.services import columnar
+from src.services.announcement_index import AnnouncementIndex
+from src.services.category_cache import CategoryCache
+from src.services.hkex_api import AsyncHKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.latest_feed import LatestFeedState
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.records import pack
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.search_cache import SearchWindowCache
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+from src.testing.hkex_standin import HKEXStandin
+
+pa = pytest.importorskip("pyarrow")
+pc = pytest.importorskip("pyarrow.compute")
+
+ROWS = HKEXStandin().announcements
+
+
+class TestConversion:
+    """Test rows ↔ Arrow conversion."""
+
+    def test_schema_types(self):
+        """Test typed dates and categorical codes."""
+        table = columnar.to_arrow(ROWS)
+        assert table.num_rows == len(ROWS)
+        assert table.schema.field("published_at").type == pa.timestamp("ms")
+        assert pa.types.is_dictionary(table.schema.field("stock_code").type)
+        assert pa.types.is_dictionary(table.schema.field("t2_code").type)
+        assert table.column("published_at")[0].as_py() == datetime(2025, 10, 8, 17, 2)
+        assert table.column("t1_code").to_pylist()[:2] == ["50000", "40000"]
+
+    def test_roundtrip(self):
+        """Test that rows come back in the title-search shape."""
+        rows = columnar.from_arrow(columnar.to_arrow(pack(ROWS)))
+        original = ROWS[1]
+        assert {key: rows[1][key] for key in original if key.isupper()} == {
+            key: value for key, value in original.items() if key.isupper()
+        }
+        assert (rows[1]["T1_CODE"], rows[1]["T2_CODE"]) == (original["t1Code"], original["t2Code"])
+
+    def test_errors_and_blanks(self):
+        """Test that error entries are dropped and blanks become nulls."""
+        table = columnar.to_arrow([{"error": "x"}, {"NEWS_ID": "1", "DATE_TIME": "bad", "T1_CODE": "NaN"}])
+        assert table.num_rows == 1
+        assert table.column("published_at")[0].as_py() is None
+        assert table.column("t1_code")[0].as_py() is None
+
+    def test_parquet_roundtrip(self, tmp_path):
+        """Test Parquet writes, reads, projection and filters."""
+        path = tmp_path / "announcements.parquet"
+        table = columnar.to_arrow(ROWS)
+        assert columnar.write_parquet(table, path) == len(ROWS)
+        assert columnar.read_parquet(path).equals(table)
+        placements = columnar.read_parquet(path, columns=["stock_code"], filters=[("t2_code", "=", "51600")])
+        assert placements.column_names == ["stock_code"]
+        assert placements.num_rows == 2
+
+    def test_vectorized_aggregate(self):
+        """Test a per-issuer, per-quarter count over the table."""
+        table = columnar.to_arrow(ROWS)
+        table = table.append_column("quarter", pc.quarter(table.column("published_at")))
+        counts = table.group_by(["stock_code", "quarter"]).aggregate([("news_id", "count")])
+        by_key = {(row["stock_code"], row["quarter"]): row["news_id_count"] for row in counts.to_pylist()}
+        assert by_key[("00673", 3)] == 4
+
+    def test_missing_pyarrow(self, monkeypatch):
+        """Test the install hint without pyarrow."""
+        monkeypatch.setattr(columnar, "pa", None)
+        with pytest.raises(ImportError, match="arrow"):
+            columnar.to_arrow(ROWS)
+
+
+class TestStores:
+    """Test exports from the local index and the service."""
+
+    def test_index_export_import(self, tmp_path):
+        """Test that an index export loads into another index."""
+        index = AnnouncementIndex(":memory:")
+        index.upsert(ROWS)
+        path = tmp_path / "index.parquet"
+        assert index.export_parquet(path, stock_code="00673") == 5
+        copy = AnnouncementIndex(":memory:")
+        assert copy.import_parquet(path) == 5
+        assert [row["NEWS_ID"] for row in copy.search(limit=10)] == [row["NEWS_ID"] for row in index.search(stock_code="00673")]
+
+    def test_service_export(self, tmp_path):
+        """Test a multi-stock export against the stand-in."""
+        service = AsyncHKEXAPIService(
+            client_manager=HTTPClientManager(HTTPClientConfig(async_transport=httpx.ASGITransport(app=HKEXStandin()))),
+            stock_id_cache=StockIdCache(":memory:"),
+            search_cache=SearchWindowCache(":memory:"),
+            latest_feed=LatestFeedState(),
+            announcement_index=AnnouncementIndex(":memory:"),
+            category_cache=CategoryCache(":memory:"),
+            rate_limiter=RateLimiter(RateLimitConfig(rate=1000, max_rate=1000)),
+            single_flight=SingleFlight(),
+            resilience=Resilience(RetryPolicy(max_attempts=1)),
+            base_url="http://hkex.test",
+        )
+        path = tmp_path / "export.parquet"
+        table = asyncio.run(service.export_announcements(["00673", "00700", "99999"], "20250101", "20251008", path=str(path)))
+        assert table.num_rows == 7
+        assert set(table.column("market").to_pylist()) == {"SEHK"}
+        assert table.schema.metadata[b"failed_stock_codes"] == b"99999"
+        assert columnar.read_parquet(path).num_rows == 7
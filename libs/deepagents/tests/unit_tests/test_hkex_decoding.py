@@ -0,0 +1,93 @@
+"""Unit tests for fast servlet result decoding."""
+
+import json
+
+import httpx
+
+from src.services import decoding
+from src.services.decoding import clean_text, decode_rows
+from src.services.hkex_api import HKEXAPIService
+
+ROWS = [
+    {
+        "NEWS_ID": "1",
+        "TITLE": "Results &amp; Dividend &lt;Interim&gt;",
+        "SHORT_TEXT": "Notices \\u2013 Other",
+        "LONG_TEXT": "A\\u003cB\\u003e C\\u0026D \\\\x",
+        "FILE_INFO": 120,
+    },
+    {"NEWS_ID": "2", "TITLE": "翌日披露報表", "SHORT_TEXT": ""},
+]
+
+
+class TestCleanText:
+    """Test the single-pass entity and escape rewrite."""
+
+    def test_rewrites(self):
+        """Test every rewrite the previous multi-pass cleaner applied."""
+        assert clean_text("A &lt;b&gt; &amp; c") == "A <b> & c"
+        assert clean_text("\\u003cp\\u003e \\u2013 \\u0026") == "<p> - -"
+        assert clean_text("a\\\\b") == "ab"
+        assert clean_text("\\\\u003c") == "\\<"
+        assert clean_text("\\\\\\u003c") == "<"
+
+    def test_no_rescan(self):
+        """Test that rewritten text is not rewritten again."""
+        assert clean_text("&amp;lt;") == "&lt;"
+
+    def test_passthrough(self):
+        """Test that clean and empty strings come back unchanged."""
+        assert clean_text("") == ""
+        assert clean_text("翌日披露報表") == "翌日披露報表"
+
+
+class TestDecodeRows:
+    """Test decoding of the nested result string."""
+
+    def test_nested_string(self):
+        """Test that JSON strings, quoted JSON strings and lists decode alike."""
+        encoded = json.dumps(ROWS)
+        expected = decode_rows(ROWS)
+        assert decode_rows(encoded) == expected
+        assert decode_rows(f'"{encoded}"') == expected
+        assert expected[0]["TITLE"] == "Results & Dividend <Interim>"
+        assert expected[0]["LONG_TEXT"] == "A<B> C-D x"
+        assert expected[0]["FILE_INFO"] == 120
+
+    def test_input_not_mutated(self):
+        """Test that cleaning works on copies."""
+        rows = json.loads(json.dumps(ROWS))
+        decode_rows(rows)
+        assert rows == ROWS
+
+    def test_projection(self):
+        """Test that only requested fields are kept."""
+        assert decode_rows(ROWS, fields=("NEWS_ID", "TITLE", "MISSING")) == [
+            {"NEWS_ID": "1", "TITLE": "Results & Dividend <Interim>"},
+            {"NEWS_ID": "2", "TITLE": "翌日披露報表"},
+        ]
+
+    def test_malformed(self):
+        """Test that missing or malformed data decodes to no rows."""
+        assert decode_rows(None) == []
+        assert decode_rows("null") == []
+        assert decode_rows("[{broken") == []
+        assert decode_rows("[not json]") == []
+        assert decode_rows([1, "x", {"NEWS_ID": "3"}]) == [{"NEWS_ID": "3"}]
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Test decoding without orjson."""
+        monkeypatch.setattr(decoding, "orjson", None)
+        assert decode_rows(json.dumps(ROWS)) == decode_rows(ROWS)
+
+
+class TestServiceParsing:
+    """Test the service parse path."""
+
+    def test_parse_search_projection(self):
+        """Test that the servlet body is decoded with optional projection."""
+        response = httpx.Response(200, json={"result": json.dumps(ROWS)})
+        service = HKEXAPIService()
+        assert service._parse_search(response) == decode_rows(ROWS)
+        assert service._parse_search(response, fields=["NEWS_ID"]) == [{"NEWS_ID": "1"}, {"NEWS_ID": "2"}]
+        assert service._clean_html_entities("&amp;") == "&"
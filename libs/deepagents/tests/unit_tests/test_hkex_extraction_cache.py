@@ -0,0 +1,158 @@
+"""Unit tests for the content-addressed PDF extraction cache."""
+
+import shutil
+
+import pdfplumber
+import pytest
+
+from src.services import pdf_parser
+from src.services.extraction_cache import ExtractionCache, file_digest
+from src.services.pdf_parser import PDFParserService
+from src.testing.pdf_fixtures import report_pdf
+from src.tools import pdf_tools
+
+
+@pytest.fixture
+def opens(monkeypatch):
+    """Count pdfplumber.open calls."""
+    calls = []
+    real_open = pdfplumber.open
+
+    def counting_open(path, *args, **kwargs):
+        calls.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(pdf_parser.pdfplumber, "open", counting_open)
+    return calls
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(report_pdf(9))
+    return str(path)
+
+
+class TestExtractionCache:
+    """Test the SQLite store."""
+
+    def test_roundtrip(self):
+        """Test that artifacts come back as stored, per artifact."""
+        cache = ExtractionCache(":memory:")
+        key = ExtractionCache.make_key("abc", "v1")
+        cache.put(key, {"text": "全文", "tables": [{"page": 1, "table": [["a", None]]}]})
+        assert cache.get(key, {"text", "tables", "structure"}) == {
+            "text": "全文",
+            "tables": [{"page": 1, "table": [["a", None]]}],
+        }
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["documents"] == 1
+
+    def test_key_covers_version_and_options(self):
+        """Test that content, extractor version and options all change the key."""
+        key = ExtractionCache.make_key("abc", "v1", {"heading_font_size": 12})
+        assert key == ExtractionCache.make_key("abc", "v1", {"heading_font_size": 12})
+        assert key != ExtractionCache.make_key("abd", "v1", {"heading_font_size": 12})
+        assert key != ExtractionCache.make_key("abc", "v2", {"heading_font_size": 12})
+        assert key != ExtractionCache.make_key("abc", "v1", {"heading_font_size": 14})
+
+    def test_lru_eviction(self):
+        """Test that least recently used artifacts go first."""
+        cache = ExtractionCache(":memory:", max_bytes=4000)
+        payload = "x".join(str(i) for i in range(1000))
+        for key in ("a", "b"):
+            cache.put(key, {"text": payload})
+        cache.get("a", {"text"})
+        cache.put("c", {"text": payload})
+        assert set(cache.get("a", {"text"})) == {"text"}
+        assert cache.get("b", {"text"}) == {}
+        assert cache.stats()["bytes"] <= 4000
+
+    def test_persistent_and_env(self, tmp_path, monkeypatch):
+        """Test persistence across instances and disabling by environment."""
+        ExtractionCache(tmp_path / "x.sqlite3").put("k", {"text": "t"})
+        assert ExtractionCache(tmp_path / "x.sqlite3").get("k", {"text"}) == {"text": "t"}
+        monkeypatch.setenv("HKEX_EXTRACTION_CACHE", "false")
+        assert ExtractionCache.from_env() is None
+
+    def test_file_digest(self, report, tmp_path):
+        """Test that the digest depends on bytes only."""
+        copy = tmp_path / "copy.pdf"
+        shutil.copy(report, copy)
+        assert file_digest(report) == file_digest(copy)
+        assert len(file_digest(report)) == 64
+
+
+class TestServiceCache:
+    """Test the cache under PDFParserService and the tools."""
+
+    def test_second_service_skips_parsing(self, report, opens):
+        """Test that a fresh service (no memo) is served from the cache."""
+        cache = ExtractionCache(":memory:")
+        first = PDFParserService(extraction_cache=cache).extract_all(report)
+        second = PDFParserService(extraction_cache=cache).extract_all(report)
+        assert second == first
+        assert len(opens) == 1
+
+    def test_content_addressed(self, report, tmp_path, opens):
+        """Test that a copy hits and changed bytes miss."""
+        cache = ExtractionCache(":memory:")
+        PDFParserService(extraction_cache=cache).extract_text(report)
+        copy = tmp_path / "renamed.pdf"
+        shutil.copy(report, copy)
+        PDFParserService(extraction_cache=cache).extract_text(str(copy))
+        assert len(opens) == 1
+
+        copy.write_bytes(report_pdf(3))
+        assert "Page 3 line 0" in PDFParserService(extraction_cache=cache).extract_text(str(copy))
+        assert len(opens) == 2
+
+    def test_extractor_change_invalidates(self, report, opens, monkeypatch):
+        """Test that a new extractor version reparses."""
+        cache = ExtractionCache(":memory:")
+        PDFParserService(extraction_cache=cache).extract_all(report)
+        monkeypatch.setattr(pdf_parser, "extractor_version", lambda: "next")
+        PDFParserService(extraction_cache=cache).extract_all(report)
+        assert len(opens) == 2
+
+    def test_only_missing_artifacts_parsed(self, report, opens):
+        """Test that a partial hit parses just the missing artifacts."""
+        cache = ExtractionCache(":memory:")
+        PDFParserService(extraction_cache=cache).analyze_structure(report)
+        content = PDFParserService(extraction_cache=cache).extract_all(report, {"text", "structure"})
+        assert content["structure"]["num_pages"] == 9
+        assert cache.stats()["hits"] == 1
+        assert len(opens) == 2
+        PDFParserService(extraction_cache=cache).extract_all(report, {"text", "structure"})
+        assert len(opens) == 2
+
+    def test_none_disables_and_default_is_lazy(self, report, opens, monkeypatch):
+        """Test that extraction_cache=None never caches and the default opens on first use."""
+        opened = []
+        monkeypatch.setattr(pdf_parser, "get_extraction_cache", lambda: opened.append(1) or ExtractionCache(":memory:"))
+        service = PDFParserService()
+        assert opened == []
+        service.analyze_structure(report)
+        assert opened == [1]
+
+        PDFParserService(extraction_cache=None).analyze_structure(report)
+        PDFParserService(extraction_cache=None).analyze_structure(report)
+        assert len(opens) == 3
+        assert opened == [1]
+
+    def test_extractor_version_stable(self):
+        """Test that the version is a short stable identifier."""
+        assert pdf_parser.extractor_version() == pdf_parser.extractor_version()
+        assert len(pdf_parser.extractor_version()) == 16
+
+    def test_tool_second_call(self, report, opens, monkeypatch):
+        """Test that a repeated extract_pdf_content does not reparse."""
+        cache = ExtractionCache(":memory:")
+        monkeypatch.setattr(pdf_tools, "_pdf_service", PDFParserService(extraction_cache=cache))
+        first = pdf_tools.extract_pdf_content.invoke({"pdf_path": report})
+        monkeypatch.setattr(pdf_tools, "_pdf_service", PDFParserService(extraction_cache=cache))
+        second = pdf_tools.extract_pdf_content.invoke({"pdf_path": report})
+        assert first == second
+        assert first["num_tables"] == 3
+        assert len(opens) == 1
@@ -0,0 +1,205 @@
+"""Unit tests for the RFC 9111 HTTP disk cache transport."""
+
+import asyncio
+from email.utils import formatdate
+
+import httpx
+
+from src.services.category_cache import CategoryCache
+from src.services.hkex_api import HKEXAPIService
+from src.services.http_cache import AsyncCachingTransport, CachingTransport, HTTPCache
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.latest_feed import LatestFeedState
+from src.services.pdf_parser import PDFParserService
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+from src.testing.hkex_standin import HKEXStandin
+
+URL = "http://hkex.test/ncms/script/eds/tierone_c.json"
+
+
+class Origin:
+    """Mock origin with configurable response headers and ETag support."""
+
+    def __init__(self, headers: dict[str, str] | None = None, body: bytes = b'{"ok": 1}'):
+        self.headers = {"ETag": '"v1"', **(headers or {})}
+        self.body = body
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"Date": formatdate(usegmt=True), **self.headers}
+        if request.headers.get("If-None-Match") == self.headers.get("ETag"):
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, content=self.body)
+
+
+def _client(tmp_path, origin: Origin, **cache_kwargs) -> tuple[httpx.Client, HTTPCache]:
+    cache = HTTPCache(tmp_path / "http", **cache_kwargs)
+    return httpx.Client(transport=CachingTransport(httpx.MockTransport(origin), cache)), cache
+
+
+class TestFreshness:
+    """Test freshness and revalidation decisions."""
+
+    def test_max_age_hit(self, tmp_path):
+        """Test that a fresh response is served without a request."""
+        origin = Origin({"Cache-Control": "max-age=300"})
+        client, cache = _client(tmp_path, origin)
+        first = client.get(URL)
+        second = client.get(URL)
+        assert first.extensions["cache_status"] == "MISS"
+        assert second.extensions["cache_status"] == "HIT"
+        assert second.json() == {"ok": 1}
+        assert len(origin.requests) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_stale_revalidates(self, tmp_path):
+        """Test that a stale response is revalidated with its ETag."""
+        origin = Origin({"Cache-Control": "no-cache"})
+        client, cache = _client(tmp_path, origin)
+        client.get(URL)
+        response = client.get(URL)
+        assert response.status_code == 200
+        assert response.extensions["cache_status"] == "REVALIDATED"
+        assert response.content == b'{"ok": 1}'
+        assert origin.requests[1].headers["If-None-Match"] == '"v1"'
+        assert cache.stats()["revalidated"] == 1
+
+    def test_changed_resource_replaced(self, tmp_path):
+        """Test that a changed resource replaces the stored body."""
+        origin = Origin({"Cache-Control": "max-age=0"})
+        client, _ = _client(tmp_path, origin)
+        client.get(URL)
+        origin.headers["ETag"], origin.body = '"v2"', b'{"ok": 2}'
+        assert client.get(URL).json() == {"ok": 2}
+        assert client.get(URL).extensions["cache_status"] == "REVALIDATED"
+
+    def test_heuristic_freshness(self, tmp_path):
+        """Test 10% of the Last-Modified age, and no heuristic for query URLs."""
+        origin = Origin({"Last-Modified": formatdate(0, usegmt=True)})
+        client, _ = _client(tmp_path, origin, heuristic_max_seconds=60)
+        client.get(URL)
+        assert client.get(URL).extensions["cache_status"] == "HIT"
+        client.get(URL + "?a=1")
+        assert client.get(URL + "?a=1").extensions["cache_status"] == "REVALIDATED"
+
+    def test_request_directives(self, tmp_path):
+        """Test request no-cache, caller validators and no-store."""
+        origin = Origin({"Cache-Control": "max-age=300"})
+        client, cache = _client(tmp_path, origin)
+        client.get(URL)
+        assert client.get(URL, headers={"Cache-Control": "no-cache"}).extensions["cache_status"] == "REVALIDATED"
+        assert client.get(URL, headers={"If-None-Match": '"v1"'}).status_code == 304
+        origin.headers["Cache-Control"] = "no-store"
+        client.get(URL + "?x")
+        assert cache.stats()["entries"] == 1
+
+    def test_vary(self, tmp_path):
+        """Test that Vary headers must match."""
+        origin = Origin({"Cache-Control": "max-age=300", "Vary": "Accept-Language"})
+        client, _ = _client(tmp_path, origin)
+        client.get(URL, headers={"Accept-Language": "zh"})
+        assert client.get(URL, headers={"Accept-Language": "zh"}).extensions["cache_status"] == "HIT"
+        assert client.get(URL, headers={"Accept-Language": "en"}).extensions["cache_status"] == "MISS"
+
+
+class TestStorage:
+    """Test persistence and the size bound."""
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least recently used entries go first."""
+        origin = Origin({"Cache-Control": "max-age=300"}, body=b"x" * 400)
+        client, cache = _client(tmp_path, origin, max_bytes=1000)
+        client.get(URL + "?1")
+        client.get(URL + "?2")
+        client.get(URL + "?1")  # touch
+        client.get(URL + "?3")
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] == 800
+        assert client.get(URL + "?1").extensions["cache_status"] == "HIT"
+        assert client.get(URL + "?2").extensions["cache_status"] == "MISS"
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that a new cache over the same directory serves stored entries."""
+        origin = Origin({"Cache-Control": "max-age=300"})
+        client, _ = _client(tmp_path, origin)
+        client.get(URL)
+        client, cache = _client(tmp_path, origin)
+        assert client.get(URL).extensions["cache_status"] == "HIT"
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+    def test_opened_on_first_request(self, tmp_path, monkeypatch):
+        """Test that the configured disk cache is only created by the first request."""
+        monkeypatch.setenv("HKEX_CACHE_DIR", str(tmp_path))
+        config = HTTPClientConfig.from_env()
+        config.transport = httpx.MockTransport(Origin({"Cache-Control": "max-age=300"}))
+        manager = HTTPClientManager(config)
+        assert not (tmp_path / "http").exists()
+        manager.get_client().get(URL)
+        assert (tmp_path / "http" / "http_cache.sqlite3").exists()
+        assert manager.cache_stats()["misses"] == 1
+
+        monkeypatch.setenv("HKEX_HTTP_CACHE", "false")
+        assert HTTPClientConfig.from_env().cache_dir is None
+
+    def test_content_encoding_kept(self, tmp_path):
+        """Test that compressed bodies are stored raw and decoded once."""
+        import gzip
+
+        origin = Origin({"Cache-Control": "max-age=300", "Content-Encoding": "gzip"}, body=gzip.compress(b"hello"))
+        client, _ = _client(tmp_path, origin)
+        assert client.get(URL).text == "hello"
+        assert client.get(URL).text == "hello"
+
+
+class TestServices:
+    """Test the cache under the HKEX services."""
+
+    def test_async_transport(self, tmp_path):
+        """Test the async transport."""
+        origin = Origin({"Cache-Control": "max-age=300"})
+        cache = HTTPCache(tmp_path / "http")
+
+        async def run():
+            async with httpx.AsyncClient(transport=AsyncCachingTransport(httpx.MockTransport(origin), cache)) as client:
+                await client.get(URL)
+                return await client.get(URL)
+
+        assert asyncio.run(run()).extensions["cache_status"] == "HIT"
+
+    def test_categories_and_pdf(self, tmp_path):
+        """Test that category JSON and PDFs are revalidated instead of re-downloaded."""
+        app = HKEXStandin()
+        cache = HTTPCache(tmp_path / "http")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            headers = {key.lower(): value for key, value in request.headers.items()}
+            status, response_headers, body = app.handle(request.url.path, dict(request.url.params), headers)
+            return httpx.Response(status, headers=response_headers, content=body)
+
+        manager = HTTPClientManager(HTTPClientConfig(transport=httpx.MockTransport(handler), cache=cache))
+        limiter = RateLimiter(RateLimitConfig(rate=1000, max_rate=1000))
+        service = HKEXAPIService(
+            client_manager=manager,
+            stock_id_cache=StockIdCache(":memory:"),
+            latest_feed=LatestFeedState(),
+            category_cache=CategoryCache(":memory:", refresh_seconds=0),
+            rate_limiter=limiter,
+            single_flight=SingleFlight(),
+            resilience=Resilience(RetryPolicy(base_delay=0)),
+            base_url="http://hkex.test",
+        )
+        assert service.get_categories("tierone") == service.get_categories("tierone")
+        stats = manager.cache_stats()
+        assert stats["hits"] + stats["revalidated"] == 1
+
+        pdf_service = PDFParserService(client_manager=manager, rate_limiter=limiter, base_url="http://hkex.test")
+        link = app.announcements[0]["FILE_LINK"]
+        first = pdf_service.download_pdf(link, "00700", "2025-10-08", "a", str(tmp_path / "pdf"))
+        second = pdf_service.download_pdf(link, "00700", "2025-10-08", "b", str(tmp_path / "pdf"))
+        assert open(first, "rb").read() == open(second, "rb").read()
+        assert manager.cache_stats()["entries"] >= 2
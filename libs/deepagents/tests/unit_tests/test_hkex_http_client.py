@@ -0,0 +1,55 @@
+"""Unit tests for the shared HKEX HTTP client pool."""
+
+from src.services.hkex_api import HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.pdf_parser import PDFParserService
+
+
+class TestHTTPClientManager:
+    """Test pooled client lifecycle."""
+
+    def test_client_is_reused(self):
+        """Test that repeated calls return the same pooled client."""
+        manager = HTTPClientManager(HTTPClientConfig())
+        assert manager.get_client() is manager.get_client()
+        manager.close()
+
+    def test_close_recreates_client(self):
+        """Test that a closed client is replaced on next use."""
+        manager = HTTPClientManager(HTTPClientConfig())
+        first = manager.get_client()
+        manager.close()
+        assert first.is_closed
+        assert manager.get_client() is not first
+        manager.close()
+
+    def test_lifecycle_hooks(self):
+        """Test that open/close hooks receive the client."""
+        manager = HTTPClientManager(HTTPClientConfig())
+        opened, closed = [], []
+        manager.on_open(opened.append)
+        manager.on_close(closed.append)
+
+        client = manager.get_client()
+        manager.close()
+
+        assert opened == [client]
+        assert closed == [client]
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        """Test that HTTP/2 is disabled when h2 is missing."""
+        monkeypatch.setattr("src.services.http_client._http2_available", lambda: False)
+        manager = HTTPClientManager(HTTPClientConfig(http2=True))
+        assert manager._use_http2() is False
+
+    def test_config_from_env(self, monkeypatch):
+        """Test pool limits are read from the environment."""
+        monkeypatch.setenv("HKEX_HTTP_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("HKEX_HTTP2", "true")
+        config = HTTPClientConfig.from_env()
+        assert config.max_connections == 7
+        assert config.http2 is True
+
+    def test_services_share_default_pool(self):
+        """Test that both HKEX services use the process-wide manager."""
+        assert HKEXAPIService().client_manager is PDFParserService().client_manager
@@ -0,0 +1,347 @@
+"""Unit tests for single-pass PDF extraction."""
+
+import pdfplumber
+import pytest
+
+from src.services import pdf_parser
+from src.services.extraction_cache import ExtractionCache
+from src.services.pdf_parser import PDFParserService
+from src.testing.pdf_fixtures import report_pdf
+from src.tools import pdf_tools
+
+
+def _service(**kwargs) -> PDFParserService:
+    """PDF service with a private extraction cache."""
+    kwargs.setdefault("extraction_cache", ExtractionCache(":memory:"))
+    return PDFParserService(**kwargs)
+
+
+@pytest.fixture
+def opens(monkeypatch):
+    """Count pdfplumber.open calls."""
+    calls = []
+    real_open = pdfplumber.open
+
+    def counting_open(path, *args, **kwargs):
+        calls.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(pdf_parser.pdfplumber, "open", counting_open)
+    return calls
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(report_pdf(12))
+    return str(path)
+
+
+class TestExtractAll:
+    """Test the one-pass extraction engine."""
+
+    def test_one_open_for_all_artifacts(self, report, opens):
+        """Test that text, tables and structure come from one open."""
+        content = _service().extract_all(report)
+        assert len(opens) == 1
+        assert content["text"].startswith("SECTION 1\nPage 1 line 0")
+        assert [table["page"] for table in content["tables"]] == [3, 6, 9, 12]
+        assert content["tables"][0]["table"][1] == ["Revenue", "30", "27"]
+        assert content["structure"]["num_pages"] == 12
+        assert content["structure"]["has_tables"] is True
+        assert [section["page"] for section in content["structure"]["estimated_sections"]] == [1, 6, 11]
+
+    def test_matches_per_page_pdfplumber(self, report):
+        """Test that the text equals a plain per-page pdfplumber pass."""
+        with pdfplumber.open(report) as pdf:
+            expected = "\n\n".join(filter(None, (page.extract_text() for page in pdf.pages)))
+        assert _service().extract_text(report) == expected
+
+    def test_only_wanted_artifacts(self, report):
+        """Test that only the requested keys are returned."""
+        assert set(_service().extract_all(report, {"structure"})) == {"structure"}
+        with pytest.raises(ValueError, match="Unknown"):
+            _service().extract_all(report, {"images"})
+
+    def test_memoized_per_file_version(self, report, opens):
+        """Test that later calls reuse the result until the file changes."""
+        service = _service()
+        service.extract_all(report)
+        assert service.analyze_structure(report)["num_pages"] == 12
+        assert service.extract_tables(report)
+        assert len(opens) == 1
+
+        with open(report, "wb") as f:
+            f.write(report_pdf(4))
+        assert service.analyze_structure(report)["num_pages"] == 4
+        assert len(opens) == 2
+
+    def test_missing_artifacts_added(self, report, opens):
+        """Test that a wider request parses only once more."""
+        service = _service()
+        service.extract_text(report)
+        service.extract_all(report, {"text", "tables"})
+        service.extract_all(report, {"text", "tables"})
+        assert len(opens) == 2
+
+    def test_errors(self, tmp_path):
+        """Test that unreadable files raise RuntimeError."""
+        with pytest.raises(RuntimeError):
+            _service().extract_all(str(tmp_path / "missing.pdf"))
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        with pytest.raises(RuntimeError):
+            _service().extract_text(str(broken))
+
+
+class TestTools:
+    """Test that the PDF tools share one extraction."""
+
+    def test_content_then_structure(self, report, opens, monkeypatch):
+        """Test that analyze_pdf_structure reuses extract_pdf_content's pass."""
+        monkeypatch.setattr(pdf_tools, "_pdf_service", _service())
+        content = pdf_tools.extract_pdf_content.invoke({"pdf_path": report})
+        structure = pdf_tools.analyze_pdf_structure.invoke({"pdf_path": report})
+        assert content["success"] and structure["success"]
+        assert content["num_tables"] == 4
+        assert structure["has_tables"] is True
+        assert len(opens) == 1
+
+
+class TestParallel:
+    """Test page-sharded extraction on the process pool."""
+
+    def test_shard_ranges(self):
+        """Test sharding and the serial fallback for short PDFs."""
+        service = _service(extract_workers=2, parallel_min_pages=40)
+        assert service._shard_ranges(39) == [(0, 39)]
+        assert service._shard_ranges(100) == [(0, 25), (25, 50), (50, 75), (75, 100)]
+        assert _service(extract_workers=1)._shard_ranges(500) == [(0, 500)]
+
+    def test_matches_serial(self, tmp_path):
+        """Test that merged shards equal a serial extraction."""
+        path = tmp_path / "long.pdf"
+        path.write_bytes(report_pdf(24, lines_per_page=10))
+        serial = _service(extract_workers=1).extract_all(str(path))
+        service = _service(extract_workers=2, parallel_min_pages=16)
+        try:
+            assert len(service._shard_ranges(24)) == 3
+            assert service.extract_all(str(path)) == serial
+        finally:
+            service.close()
+
+    def test_small_pdf_no_pool(self, report):
+        """Test that short PDFs never start the pool."""
+        service = _service(extract_workers=4)
+        service.extract_all(report)
+        assert service._pool is None
+
+    def test_pool_unavailable(self, tmp_path, monkeypatch):
+        """Test the serial fallback when processes cannot be started."""
+
+        def unavailable(*args, **kwargs):
+            raise OSError("no semaphores")
+
+        monkeypatch.setattr(pdf_parser, "ProcessPoolExecutor", unavailable)
+        path = tmp_path / "long.pdf"
+        path.write_bytes(report_pdf(16, lines_per_page=5))
+        content = _service(extract_workers=2, parallel_min_pages=8).extract_all(str(path), {"structure"})
+        assert content["structure"]["num_pages"] == 16
+
+    def test_workers_from_env(self, monkeypatch):
+        """Test the environment defaults."""
+        monkeypatch.setenv("HKEX_PDF_WORKERS", "3")
+        monkeypatch.setenv("HKEX_PDF_PARALLEL_MIN_PAGES", "100")
+        service = _service()
+        assert (service.extract_workers, service.parallel_min_pages) == (3, 100)
+
+
+class TestStreaming:
+    """Test lazy page iteration and preview extraction."""
+
+    @pytest.fixture
+    def parsed_pages(self, monkeypatch):
+        """Record the pages that were actually parsed."""
+        pages = []
+        real_extract_page = pdf_parser._extract_page
+
+        def counting_extract_page(page, page_num, *args, **kwargs):
+            pages.append(page_num)
+            return real_extract_page(page, page_num, *args, **kwargs)
+
+        monkeypatch.setattr(pdf_parser, "_extract_page", counting_extract_page)
+        return pages
+
+    @pytest.fixture
+    def long_report(self, tmp_path):
+        path = tmp_path / "long.pdf"
+        path.write_bytes(report_pdf(30))
+        return str(path)
+
+    def test_iter_pages_lazy(self, report, parsed_pages):
+        """Test that only requested pages are parsed."""
+        pages = _service().iter_pages(report)
+        first = next(pages)
+        second = next(pages)
+        pages.close()
+        assert (first["page"], first["num_pages"]) == (1, 12)
+        assert "Page 2 line 0" in second["text"]
+        assert parsed_pages == [1, 2]
+
+    def test_iter_pages_matches_extract_all(self, report):
+        """Test that page texts and tables add up to the full extraction."""
+        pages = list(_service().iter_pages(report))
+        content = _service().extract_all(report, {"text", "tables"})
+        assert "\n\n".join(page["text"] for page in pages if page["text"]) == content["text"]
+        assert [table for page in pages for table in page["tables"]] == content["tables"]
+
+    def test_preview_small_pdf_complete(self, report, opens):
+        """Test that a document within budget is extracted once and remembered."""
+        service = _service()
+        content = service.extract_preview(report, max_chars=100_000)
+        assert content.pop("complete") is True
+        assert content == service.extract_all(report)
+        assert len(opens) == 1
+
+    def test_preview_stops_at_budget(self, long_report, parsed_pages):
+        """Test that parsing stops at the budget and finishes in the background."""
+        service = _service(extract_workers=1)
+        content = service.extract_preview(long_report, {"text", "tables"}, max_chars=4000)
+        assert content["complete"] is False
+        assert (content["pages_parsed"], content["num_pages"]) == (3, 30)
+        assert parsed_pages[:3] == [1, 2, 3]
+
+        service.wait_background()
+        full = service.extract_all(long_report, {"text", "tables"})
+        assert full["text"].startswith(content["text"])
+        assert "Page 30 line 0" in full["text"]
+        text_path, _ = service.extracted_content_paths(long_report)
+        assert open(text_path, encoding="utf-8").read() == full["text"]
+        assert service.extract_preview(long_report, {"text", "tables"}, max_chars=4000)["complete"] is True
+        service.close()
+
+    def test_background_deduplicated(self, long_report):
+        """Test that one file is not queued twice."""
+        service = _service(extract_workers=1)
+        first = service.extract_in_background(long_report)
+        assert service.extract_in_background(long_report) is first or first.done()
+        service.close()
+        assert first.result()["structure"]["num_pages"] == 30
+
+    def test_tool_preview(self, long_report, monkeypatch):
+        """Test the partial tool result and the complete one after the background run."""
+        service = _service(extract_workers=1)
+        monkeypatch.setattr(pdf_tools, "_pdf_service", service)
+        args = {"pdf_path": long_report, "max_inline_chars": 4000}
+        partial = pdf_tools.extract_pdf_content.invoke(args)
+        assert partial["success"] and partial["truncated"]
+        assert partial["complete"] is False
+        assert partial["pages_parsed"] == 3
+        assert "后台" in partial["text"]
+
+        service.wait_background()
+        full = pdf_tools.extract_pdf_content.invoke(args)
+        assert "complete" not in full
+        assert full["text_path"] == partial["text_path"]
+        assert full["text_length"] > partial["text_length"]
+        assert pdf_tools.extract_pdf_content.invoke({**args, "preview": False}) == full
+        service.close()
+
+
+class TestPageTargeted:
+    """Test page-range extraction and the per-page text index."""
+
+    @pytest.fixture
+    def parsed_pages(self, monkeypatch):
+        """Record the pages that were actually parsed."""
+        pages = []
+        real_extract_page = pdf_parser._extract_page
+
+        def counting_extract_page(page, page_num, *args, **kwargs):
+            pages.append(page_num)
+            return real_extract_page(page, page_num, *args, **kwargs)
+
+        monkeypatch.setattr(pdf_parser, "_extract_page", counting_extract_page)
+        return pages
+
+    def test_parse_page_spec(self):
+        """Test page selections, clipping and errors."""
+        assert pdf_parser.parse_page_spec("12-18", 20) == [12, 13, 14, 15, 16, 17, 18]
+        assert pdf_parser.parse_page_spec("1, 4-5,4", 20) == [1, 4, 5]
+        assert pdf_parser.parse_page_spec("18-", 20) == [18, 19, 20]
+        assert pdf_parser.parse_page_spec("18-30", 20) == [18, 19, 20]
+        assert pdf_parser.parse_page_spec([3, 1, 99], 20) == [1, 3]
+        for bad in ("", "a-b", "0", "5-3", "30"):
+            with pytest.raises(ValueError):
+                pdf_parser.parse_page_spec(bad, 20)
+
+    def test_extract_pages_parses_only_selected(self, report, parsed_pages):
+        """Test that only the selected pages are parsed."""
+        content = _service().extract_pages(report, "5-6")
+        assert parsed_pages == [5, 6]
+        assert content["num_pages"] == 12
+        assert [page["page"] for page in content["pages"]] == [5, 6]
+        assert content["pages"][0]["text"].startswith("Page 5 line 0")
+        assert [table["page"] for table in content["pages"][1]["tables"]] == [6]
+
+    def test_extract_pages_from_index(self, report, opens):
+        """Test that pages of an extracted file are served without reopening it."""
+        service = _service()
+        full = service.extract_all(report)
+        pages = service.extract_pages(report, "3,11-")
+        assert len(opens) == 1
+        assert [page["page"] for page in pages["pages"]] == [3, 11, 12]
+        assert [table for page in pages["pages"] for table in page["tables"]] == [
+            table for table in full["tables"] if table["page"] in (3, 11, 12)
+        ]
+        assert pages == _service().extract_pages(report, "3,11-")
+
+    def test_page_index_matches_text(self, report, opens):
+        """Test that the index joins to the full text and is built once."""
+        cache = ExtractionCache(":memory:")
+        page_texts = PDFParserService(extraction_cache=cache).page_index(report)
+        assert len(page_texts) == 12
+        text = PDFParserService(extraction_cache=cache).extract_text(report)
+        assert text == "\n\n".join(page_texts)
+        assert len(opens) == 1
+
+    def test_find_in_pdf(self, report, opens, monkeypatch):
+        """Test that searches return pages and reuse the index."""
+        monkeypatch.setattr(pdf_tools, "_pdf_service", _service())
+        result = pdf_tools.find_in_pdf.invoke({"pdf_path": report, "pattern": "section"})
+        assert result["success"]
+        assert result["pages"] == [1, 6, 11]
+        assert result["matches"][0]["page"] == 1
+        assert result["matches"][0]["snippet"].startswith("SECTION 1 Page 1 line 0: segment revenue")
+
+        regex = pdf_tools.find_in_pdf.invoke({"pdf_path": report, "pattern": r"Page (7|9) line 0:"})
+        assert regex["pages"] == [7, 9]
+        limited = pdf_tools.find_in_pdf.invoke({"pdf_path": report, "pattern": r"HK\$ 4,00", "max_matches": 2})
+        assert limited["pages"] == [4]
+        assert (limited["num_matches"], len(limited["matches"])) == (10, 2)
+        invalid = pdf_tools.find_in_pdf.invoke({"pdf_path": report, "pattern": "revenue ("})
+        assert invalid["success"] and invalid["pages"] == []
+        assert pdf_tools.find_in_pdf.invoke({"pdf_path": report, "pattern": "SECTION", "ignore_case": False})["pages"]
+        assert len(opens) == 1
+
+    def test_extract_pdf_pages_tool(self, report, monkeypatch):
+        """Test the tool result and the inline budget."""
+        monkeypatch.setattr(pdf_tools, "_pdf_service", _service())
+        result = pdf_tools.extract_pdf_pages.invoke({"pdf_path": report, "pages": "2-3"})
+        assert result["success"] and not result["truncated"]
+        assert [page["page"] for page in result["pages"]] == [2, 3]
+
+        cut = pdf_tools.extract_pdf_pages.invoke({"pdf_path": report, "pages": "1-12", "max_inline_chars": 3000})
+        assert cut["truncated"]
+        assert sum(len(page["text"]) for page in cut["pages"]) == 3000
+        assert cut["pages"][-1]["page"] < 12
+        assert "缩小页码范围" in cut["note"]
+
+        for budget in (0, -5, len(cut["pages"][0]["text"])):
+            tiny = pdf_tools.extract_pdf_pages.invoke({"pdf_path": report, "pages": "1-2", "max_inline_chars": budget})
+            assert tiny["success"] and tiny["truncated"]
+            assert [page["page"] for page in tiny["pages"]] == [1]
+            assert "第 1 页" in tiny["note"]
+
+        error = pdf_tools.extract_pdf_pages.invoke({"pdf_path": report, "pages": "40-50"})
+        assert not error["success"] and "12 pages" in error["error"]
@@ -0,0 +1,135 @@
+"""Unit tests for the adaptive HKEX rate limiter."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+from src.services.hkex_api import HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.pdf_parser import PDFParserService
+from src.services.rate_limit import EndpointLimiter, RateLimitConfig, RateLimiter, retry_after_seconds
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.search_cache import SearchWindowCache
+from src.services.stock_id_cache import StockIdCache
+
+
+def _response(status: int, **headers: str) -> httpx.Response:
+    return httpx.Response(status, headers=headers)
+
+
+class TestEndpointLimiter:
+    """Test token bucket and AIMD behaviour."""
+
+    def test_overload_halves_limits(self):
+        """Test multiplicative decrease on 503 and timeouts."""
+        limiter = EndpointLimiter("search", RateLimitConfig(rate=20, max_rate=20, concurrency=8))
+        limiter.release(limiter.acquire(), response=_response(503))
+        assert limiter.concurrency == 4
+        assert limiter.rate == 10
+        limiter.release(limiter.acquire(), error=httpx.ReadTimeout("slow"))
+        assert limiter.concurrency == 2
+        assert limiter.stats()["overloads"] == 2
+
+    def test_success_ramps_up(self):
+        """Test additive increase after a window of successes."""
+        limiter = EndpointLimiter("search", RateLimitConfig(rate=100, max_rate=100, concurrency=2, max_concurrency=3))
+        for _ in range(10):
+            limiter.release(limiter.acquire(), response=_response(200))
+        assert limiter.concurrency == 3
+        stats = limiter.stats()
+        assert stats["requests"] == 10
+        assert set(stats["latency_ms"]) == {"mean", "p50", "p95"}
+
+    def test_client_errors_do_not_back_off(self):
+        """Test that 404s neither back off nor count as successes."""
+        limiter = EndpointLimiter("search", RateLimitConfig(concurrency=4))
+        limiter.release(limiter.acquire(), response=_response(404))
+        assert limiter.concurrency == 4
+        assert limiter.stats()["overloads"] == 0
+
+    def test_concurrency_limit_blocks_threads(self):
+        """Test that no more than the concurrency limit runs at once."""
+        limiter = EndpointLimiter("search", RateLimitConfig(rate=1000, max_rate=1000, concurrency=2, max_concurrency=2))
+        peak, running, lock = [0], [0], threading.Lock()
+
+        def work():
+            started = limiter.acquire()
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            limiter.release(started, response=_response(200))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert peak[0] == 2
+
+    def test_async_waiters_are_woken(self):
+        """Test that coroutines wait for a free slot without blocking the loop."""
+        limiter = EndpointLimiter("search", RateLimitConfig(rate=1000, max_rate=1000, concurrency=1, max_concurrency=1))
+        order = []
+
+        async def work(n):
+            started = await limiter.acquire_async()
+            order.append(n)
+            await asyncio.sleep(0.005)
+            limiter.release(started, response=_response(200))
+
+        async def run():
+            await asyncio.gather(*(work(n) for n in range(4)))
+
+        asyncio.run(run())
+        assert sorted(order) == [0, 1, 2, 3]
+
+    def test_token_bucket_paces_requests(self):
+        """Test that requests beyond the burst wait for tokens."""
+        limiter = EndpointLimiter("search", RateLimitConfig(rate=50, max_rate=50, concurrency=16))
+        start = time.monotonic()
+        for _ in range(60):
+            limiter.release(limiter.acquire())
+        assert time.monotonic() - start >= 0.15
+
+    def test_retry_after(self):
+        """Test Retry-After parsing."""
+        assert retry_after_seconds("3") == 3.0
+        assert retry_after_seconds(None) is None
+        assert retry_after_seconds("soon") is None
+
+
+class TestServiceIntegration:
+    """Test that services route requests through the limiter."""
+
+    def test_stats_per_endpoint(self):
+        """Test that limits and latencies are reported per endpoint."""
+
+        def handler(request):
+            if request.url.path.endswith("prefix.do"):
+                return httpx.Response(200, text='callback({"stockInfo":[{"stockId":1}]});')
+            return httpx.Response(503)
+
+        transport = httpx.MockTransport(handler)
+        service = HKEXAPIService(
+            client_manager=HTTPClientManager(HTTPClientConfig(transport=transport)),
+            stock_id_cache=StockIdCache(":memory:"),
+            search_cache=SearchWindowCache(":memory:"),
+            rate_limiter=RateLimiter(RateLimitConfig(rate=1000, max_rate=1000)),
+            resilience=Resilience(RetryPolicy(max_attempts=1)),
+        )
+        service.get_stock_id("00001")
+        service.search_announcements("1", "20250101", "20250102")
+
+        stats = service.rate_limit_stats()
+        assert stats["prefix"]["requests"] == 1
+        assert stats["search"]["overloads"] == 1
+        assert stats["search"]["concurrency"] == 2
+
+    def test_services_share_default_limiter(self):
+        """Test that the HKEX API and PDF downloads share one limiter."""
+        assert HKEXAPIService().rate_limiter is PDFParserService().rate_limiter
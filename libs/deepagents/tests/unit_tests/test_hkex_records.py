@@ -0,0 +1,87 @@
+"""Unit tests for compact announcement records."""
+
+import json
+
+import pytest
+
+from src.services.announcement_index import latest_item_to_record
+from src.services.records import Announcement, pack, unpack
+from src.services.result_pages import ResultPages
+
+ROW = {
+    "NEWS_ID": "11843201",
+    "STOCK_CODE": "00673",
+    "STOCK_NAME": "中國衛生集團",
+    "TITLE": "中期業績公告",
+    "FILE_TYPE": "PDF",
+    "FILE_INFO": "356KB",
+    "FILE_LINK": "/listedco/listconews/sehk/2025/1008/2025100800561_c.pdf",
+    "DATE_TIME": "08/10/2025 16:30",
+    "SHORT_TEXT": "公告及通告 - [其他]",
+    "LONG_TEXT": "公告及通告 - [其他]",
+    "t1Code": "40000",
+    "t2Code": "40200",
+}
+
+
+class TestAnnouncement:
+    """Test the record type."""
+
+    def test_roundtrip(self):
+        """Test that to_dict returns the same keys, values and key order."""
+        record = Announcement.from_dict(ROW)
+        assert list(record.to_dict().items()) == list(ROW.items())
+        assert record == ROW
+        assert (record.stock_code, record.t2_code) == ("00673", "40200")
+
+    def test_unknown_and_missing_keys(self):
+        """Test that extra keys survive and absent keys stay absent."""
+        row = {"NEWS_ID": "1", "TITLE": "x", "score": 1.5, "T1_CODE": "1", "t1Code": "2"}
+        record = Announcement.from_dict(row)
+        assert record.to_dict() == row
+        assert list(record) == list(row)
+        assert record["score"] == 1.5 and record["t1Code"] == "2"
+        assert "STOCK_CODE" not in record
+        assert record.get("STOCK_CODE", "-") == "-"
+        with pytest.raises(KeyError):
+            record["STOCK_CODE"]
+
+    def test_interning(self):
+        """Test that repeated codes and names share one string object."""
+        first, second = (Announcement.from_dict(json.loads(json.dumps(ROW))) for _ in range(2))
+        assert first.stock_name is second.stock_name
+        assert first.t1_code is second.t1_code
+        assert first._layout is second._layout
+
+    def test_projection(self):
+        """Test to_dict with fields."""
+        record = Announcement.from_dict(ROW)
+        assert record.to_dict(["TITLE", "NEWS_ID", "MISSING"]) == {"TITLE": "中期業績公告", "NEWS_ID": "11843201"}
+
+    def test_local_index_shape(self):
+        """Test rows converted from the latest feed."""
+        row = latest_item_to_record({"newsId": 5, "title": "t", "stock": [{"sc": "00700", "sn": "騰訊控股"}]})
+        assert Announcement.from_dict(row).to_dict() == row
+
+
+class TestPacking:
+    """Test list conversion and result-set storage."""
+
+    def test_pack_unpack(self):
+        """Test that only announcement rows are packed."""
+        items = [ROW, {"newsId": 1}]
+        packed = pack(items)
+        assert isinstance(packed[0], Announcement)
+        assert packed[1] is items[1]
+        assert unpack(packed) == items
+        assert unpack(packed, ["NEWS_ID"]) == [{"NEWS_ID": "11843201"}, {}]
+
+    def test_result_pages_store_records(self):
+        """Test that stored result sets hold records and pages hold dicts."""
+        rows = [dict(ROW, NEWS_ID=str(i)) for i in range(5)]
+        pages = ResultPages()
+        page = pages.first_page(rows, 2)
+        assert all(isinstance(item, Announcement) for item in next(iter(pages._sets.values())).items)
+        page = pages.next_page(page["next_page_cursor"], 2)
+        assert page["announcements"] == rows[2:4]
+        assert all(type(item) is dict for item in page["announcements"])
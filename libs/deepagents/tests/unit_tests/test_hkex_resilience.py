@@ -0,0 +1,199 @@
+"""Unit tests for HKEX retries, circuit breaking and typed errors."""
+
+import asyncio
+import json
+
+import httpx
+
+from src.services.hkex_api import AsyncHKEXAPIService, HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.resilience import (
+    BreakerConfig,
+    CircuitBreaker,
+    HKEXCircuitOpenError,
+    HKEXHTTPStatusError,
+    HKEXParseError,
+    HKEXTimeoutError,
+    Resilience,
+    RetryPolicy,
+    classify_error,
+)
+from src.services.search_cache import SearchWindowCache
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+
+
+def _service(handler, cls=HKEXAPIService, threshold=5):
+    transport = httpx.MockTransport(handler)
+    return cls(
+        client_manager=HTTPClientManager(HTTPClientConfig(transport=transport, async_transport=transport)),
+        stock_id_cache=StockIdCache(":memory:"),
+        search_cache=SearchWindowCache(":memory:"),
+        rate_limiter=RateLimiter(RateLimitConfig(rate=1000, max_rate=1000)),
+        single_flight=SingleFlight(),
+        resilience=Resilience(RetryPolicy(base_delay=0), BreakerConfig(failure_threshold=threshold)),
+    )
+
+
+def _flaky(failures: list[httpx.Response | Exception]):
+    """Return a handler that fails with the given outcomes, then succeeds."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= len(failures):
+            outcome = failures[len(calls) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return httpx.Response(200, text='callback({"stockInfo":[{"stockId":7609}]});')
+
+    return handler, calls
+
+
+class TestErrors:
+    """Test error classification."""
+
+    def test_classify(self):
+        """Test that raw exceptions map onto typed errors."""
+        assert isinstance(classify_error(httpx.ReadTimeout("slow")), HKEXTimeoutError)
+        assert isinstance(classify_error(json.JSONDecodeError("bad", "", 0)), HKEXParseError)
+        assert classify_error(httpx.ConnectError("reset")).kind == "connection"
+
+    def test_to_dict(self):
+        """Test the compact error entry."""
+        error = HKEXHTTPStatusError(503, "HTTP 503 from hkexnews", "search", attempts=3)
+        assert error.retryable
+        assert error.to_dict() == {
+            "error": "HTTP 503 from hkexnews",
+            "error_type": "http_status",
+            "endpoint": "search",
+            "attempts": 3,
+            "status_code": 503,
+        }
+        assert not HKEXHTTPStatusError(404, "not found").retryable
+
+
+class TestRetryPolicy:
+    """Test jittered exponential backoff."""
+
+    def test_backoff_bounds(self):
+        """Test that delays stay within the exponential cap and honour Retry-After."""
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        assert all(0 <= policy.backoff(1) <= 1 for _ in range(50))
+        assert all(0 <= policy.backoff(5) <= 4 for _ in range(50))
+        assert policy.backoff(1, retry_after=3) >= 3
+        assert policy.backoff(1, retry_after=60) == 4
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_open_half_open_close(self):
+        """Test that the breaker opens, lets one trial through, then closes."""
+        breaker = CircuitBreaker("search", BreakerConfig(failure_threshold=2, reset_seconds=0))
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        breaker.allow()
+        assert breaker.state == "half_open"
+        try:
+            breaker.allow()
+            raise AssertionError("second trial should be rejected")
+        except HKEXCircuitOpenError:
+            pass
+        breaker.record_success()
+        assert breaker.stats() == {"state": "closed", "consecutive_failures": 0, "times_opened": 1, "retries": 0}
+
+    def test_open_rejects(self):
+        """Test that an open breaker fails fast before the reset interval."""
+        breaker = CircuitBreaker("search", BreakerConfig(failure_threshold=1, reset_seconds=60))
+        breaker.record_failure()
+        try:
+            breaker.allow()
+            raise AssertionError("open breaker should reject")
+        except HKEXCircuitOpenError as e:
+            assert e.to_dict()["error_type"] == "circuit_open"
+
+
+class TestServiceRetries:
+    """Test retries and breaking in the services."""
+
+    def test_transient_failures_are_retried(self):
+        """Test that a timeout and a 503 are retried until success."""
+        handler, calls = _flaky([httpx.ReadTimeout("slow"), httpx.Response(503)])
+        service = _service(handler)
+        stock_id, _ = service.get_stock_id("00673")
+        assert stock_id == 7609
+        assert len(calls) == 3
+        assert service.resilience_stats()["prefix"]["retries"] == 2
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 404 fails at once with a typed error."""
+        handler, calls = _flaky([httpx.Response(404)] * 3)
+        stock_id, info = _service(handler).get_stock_id("00673")
+        assert stock_id is None
+        assert len(calls) == 1
+        assert info[0]["error_type"] == "http_status"
+        assert info[0]["status_code"] == 404
+
+    def test_parse_errors_are_typed(self):
+        """Test that malformed responses are reported as parse errors."""
+        service = _service(lambda request: httpx.Response(200, text="<html>maintenance</html>"))
+        result = service.search_announcements("7609", "20250101", "20250102")
+        assert result[1][0]["error_type"] == "parse"
+
+    def test_breaker_fails_fast(self):
+        """Test that an open breaker stops requests from being sent."""
+        handler, calls = _flaky([httpx.ConnectError("down")] * 100)
+        service = _service(handler, threshold=3)
+        service.get_stock_id("00673")
+        _, info = service.get_stock_id("00001")
+        assert len(calls) == 3
+        assert info[0]["error_type"] == "circuit_open"
+        assert service.resilience_stats()["prefix"]["state"] == "open"
+
+    def test_async_retries(self):
+        """Test that the async service retries the same way."""
+        handler, calls = _flaky([httpx.Response(502)])
+        service = _service(handler, cls=AsyncHKEXAPIService)
+        stock_id, _ = asyncio.run(service.get_stock_id("00673"))
+        assert stock_id == 7609
+        assert len(calls) == 2
+
+    def test_cancelled_trial_releases_breaker(self):
+        """Test that a half-open trial cancelled mid-request lets the next trial through."""
+        handler, calls = _flaky([httpx.ConnectError("down")])
+        service = _service(handler, cls=AsyncHKEXAPIService, threshold=1)
+        asyncio.run(service.get_stock_id("00673"))
+        assert service.resilience_stats()["prefix"]["state"] == "open"
+        service.resilience.breaker("prefix").config.reset_seconds = 0
+
+        async def cancel_trial():
+            started = asyncio.Event()
+            real_send_once = service._send_once
+
+            async def hanging_send_once(*args):
+                started.set()
+                await asyncio.sleep(60)
+                return await real_send_once(*args)
+
+            service._send_once = hanging_send_once
+            task = asyncio.create_task(service.get_stock_id("00673"))
+            await started.wait()
+            task.cancel()
+            try:
+                await task
+                raise AssertionError("trial should have been cancelled")
+            except asyncio.CancelledError:
+                pass
+            del service._send_once
+
+        asyncio.run(cancel_trial())
+        assert service.resilience_stats()["prefix"]["state"] == "half_open"
+        stock_id, _ = asyncio.run(service.get_stock_id("00673"))
+        assert stock_id == 7609
+        assert service.resilience_stats()["prefix"]["state"] == "closed"
@@ -0,0 +1,87 @@
+"""Unit tests for paged tool results."""
+
+import time
+
+from src.services.category_cache import CategoryIndex
+from src.services.result_pages import ResultPages, project
+from src.tools import hkex_tools
+
+ITEMS = [{"NEWS_ID": str(i), "TITLE": f"t{i}", "LONG_TEXT": "x" * 100} for i in range(7)]
+
+
+class TestResultPages:
+    """Test the server-side result store."""
+
+    def test_paging(self):
+        """Test that cursors walk the full result set in order."""
+        pages = ResultPages()
+        page = pages.first_page(ITEMS, 3, meta={"stock_code": "00673"})
+        seen = [item["NEWS_ID"] for item in page["announcements"]]
+        assert page["stock_code"] == "00673"
+        assert (page["count"], page["total"]) == (3, 7)
+        while page["next_page_cursor"]:
+            page = pages.next_page(page["next_page_cursor"], 3)
+            seen += [item["NEWS_ID"] for item in page["announcements"]]
+        assert seen == [item["NEWS_ID"] for item in ITEMS]
+        assert page["stock_code"] == "00673"
+
+    def test_small_results_are_not_stored(self):
+        """Test that a single-page result needs no cursor or storage."""
+        pages = ResultPages()
+        page = pages.first_page(ITEMS, 50)
+        assert page["next_page_cursor"] is None
+        assert pages.stats() == {"result_sets": 0, "items": 0}
+
+    def test_fields_carry_over(self):
+        """Test that later pages keep the first page's projection unless overridden."""
+        pages = ResultPages()
+        page = pages.first_page(ITEMS, 2, fields=["NEWS_ID"])
+        assert page["announcements"] == [{"NEWS_ID": "0"}, {"NEWS_ID": "1"}]
+        assert pages.next_page(page["next_page_cursor"], 2)["announcements"] == [{"NEWS_ID": "2"}, {"NEWS_ID": "3"}]
+        assert set(pages.next_page(page["next_page_cursor"], 1, ["TITLE"])["announcements"][0]) == {"TITLE"}
+
+    def test_expiry_and_eviction(self):
+        """Test that expired, evicted and malformed cursors are rejected."""
+        pages = ResultPages(max_result_sets=1, ttl_seconds=0.05)
+        first = pages.first_page(ITEMS, 1)["next_page_cursor"]
+        second = pages.first_page(ITEMS, 1)["next_page_cursor"]
+        assert pages.next_page(first, 1) is None
+        assert pages.next_page("garbage", 1) is None
+        time.sleep(0.06)
+        assert pages.next_page(second, 1) is None
+
+    def test_project(self):
+        """Test projection to present fields only."""
+        assert project(ITEMS[:1], ["TITLE", "MISSING"]) == [{"TITLE": "t0"}]
+        assert project(ITEMS, None) is ITEMS
+
+
+class TestPagedTools:
+    """Test paging in the tool results."""
+
+    def test_search_result_pages(self):
+        """Test that search results are paged and cursors continue them."""
+        page = hkex_tools._search_result("00673", 7609, ITEMS, ["NEWS_ID", "TITLE"], 4)
+        assert page["stock_id"] == 7609
+        assert page["total"] == 7
+        assert "LONG_TEXT" not in page["announcements"][0]
+        rest = hkex_tools.search_hkex_announcements.invoke(
+            {"stock_code": "00673", "from_date": "", "to_date": "", "page_cursor": page["next_page_cursor"]}
+        )
+        assert [item["NEWS_ID"] for item in rest["announcements"]] == ["4", "5", "6"]
+        assert rest["next_page_cursor"] is None
+
+    def test_unknown_cursor(self):
+        """Test the error returned for an expired cursor."""
+        result = hkex_tools.get_latest_hkex_announcements.invoke({"page_cursor": "nope:10"})
+        assert result["error_type"] == "cursor"
+        assert result["announcements"] == []
+
+    def test_latest_result_keeps_poll_cursor(self):
+        """Test that latest-feed pages keep the since-cursor and category names."""
+        index = CategoryIndex({"tierone": [{"code": "10000", "name": "公告及通告"}]})
+        feed = {"announcements": [{"newsId": i, "t1Code": "10000"} for i in range(3)], "cursor": "abc:3"}
+        page = hkex_tools._latest_result(feed, index, None, 2)
+        assert page["cursor"] == "abc:3"
+        assert page["announcements"][0]["t1Name"] == "公告及通告"
+        assert (page["count"], page["total"]) == (2, 3)
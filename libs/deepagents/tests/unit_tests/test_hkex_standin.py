@@ -0,0 +1,115 @@
+"""Unit tests for the offline hkexnews stand-in."""
+
+import asyncio
+import time
+
+import httpx
+
+from src.services.announcement_index import AnnouncementIndex
+from src.services.category_cache import CategoryCache
+from src.services.hkex_api import AsyncHKEXAPIService, HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.latest_feed import LatestFeedState
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.search_cache import SearchWindowCache
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+from src.testing.hkex_standin import HKEXStandin, StandinConfig
+
+BASE_URL = "http://hkex.test"
+
+
+def _service(app: HKEXStandin, max_attempts: int = 3) -> AsyncHKEXAPIService:
+    transport = httpx.ASGITransport(app=app)
+    return AsyncHKEXAPIService(
+        client_manager=HTTPClientManager(HTTPClientConfig(async_transport=transport)),
+        stock_id_cache=StockIdCache(":memory:"),
+        search_cache=SearchWindowCache(":memory:"),
+        latest_feed=LatestFeedState(),
+        announcement_index=AnnouncementIndex(":memory:"),
+        category_cache=CategoryCache(":memory:"),
+        rate_limiter=RateLimiter(RateLimitConfig(rate=1000, max_rate=1000)),
+        single_flight=SingleFlight(),
+        resilience=Resilience(RetryPolicy(max_attempts=max_attempts, base_delay=0)),
+        base_url=BASE_URL,
+    )
+
+
+class TestStandin:
+    """Test the stand-in through the async service."""
+
+    def test_toolchain_endpoints(self):
+        """Test stock lookup, search, latest feed and categories against fixtures."""
+        service = _service(HKEXStandin())
+
+        async def run():
+            stock_id, _ = await service.get_stock_id("00673")
+            _, announcements = await service.search_announcements(stock_id, "20250701", "20251008")
+            latest = await service.get_latest_announcements(stock_code="00673")
+            categories = await service.get_categories("tiertwo")
+            return stock_id, announcements, latest, categories
+
+        stock_id, announcements, latest, categories = asyncio.run(run())
+        assert stock_id == 7609
+        assert len(announcements) == 5
+        assert "&amp;" not in announcements[0]["TITLE"]
+        assert "t1Code" not in announcements[0]
+        assert latest and all(item["stock"][0]["sc"] == "00673" for item in latest)
+        assert any(item["code"] == "13300" for item in categories)
+
+    def test_latest_feed_not_modified(self):
+        """Test that conditional feed requests get 304 Not Modified."""
+        service = _service(HKEXStandin())
+
+        async def run():
+            await service.poll_latest_announcements()
+            return await service.poll_latest_announcements()
+
+        assert asyncio.run(run())["modified"] is False
+        assert service.latest_feed.not_modified == 1
+
+    def test_synthetic_results_are_capped(self):
+        """Test that generated data exercises the 500-row cap."""
+        app = HKEXStandin(StandinConfig(synthetic_per_stock=600))
+        status, _, body = app.handle(
+            "/search/titleSearchServlet.do",
+            {"stockId": "1", "fromDate": "20000101", "toDate": "20991231", "rowRange": "1000"},
+            {},
+        )
+        assert status == 200
+        assert httpx.Response(200, content=body).json()["loadedRecord"] == 500
+
+    def test_error_injection_and_latency(self):
+        """Test injected errors on selected endpoints and added latency."""
+        app = HKEXStandin(StandinConfig(latency=0.05, error_rate=1.0, error_endpoints=frozenset({"search"})))
+        service = _service(app, max_attempts=2)
+
+        async def run():
+            stock_id, _ = await service.get_stock_id("00673")
+            return await service.search_announcements(stock_id, "20250701", "20250731")
+
+        started = time.perf_counter()
+        _, announcements = asyncio.run(run())
+        assert time.perf_counter() - started >= 0.15
+        assert announcements[0]["error_type"] == "http_status"
+        assert app.stats()["errors"] == {"search": 2}
+
+    def test_pdf_and_unknown_paths(self):
+        """Test that PDF links serve the sample PDF and unknown paths 404."""
+        app = HKEXStandin()
+        status, headers, body = app.handle("/listedco/listconews/sehk/2025/1008/x.pdf", {}, {})
+        assert status == 200
+        assert headers["content-type"] == "application/pdf"
+        assert body.startswith(b"%PDF")
+        assert app.handle("/nothing", {}, {})[0] == 404
+
+
+class TestBaseURL:
+    """Test that the hkexnews origin is configurable."""
+
+    def test_env_override(self, monkeypatch):
+        """Test HKEX_BASE_URL and the explicit base_url argument."""
+        monkeypatch.setenv("HKEX_BASE_URL", "http://127.0.0.1:8765/")
+        assert HKEXAPIService()._search_url() == "http://127.0.0.1:8765/search/titleSearchServlet.do"
+        assert HKEXAPIService(base_url=BASE_URL)._latest_url().startswith(BASE_URL)
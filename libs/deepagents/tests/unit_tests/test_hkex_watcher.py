@@ -0,0 +1,126 @@
+"""Unit tests for the watchlist cache warmer."""
+
+import os
+
+import httpx
+
+from src.services.announcement_index import AnnouncementIndex
+from src.services.category_cache import CategoryCache
+from src.services.extraction_cache import ExtractionCache
+from src.services.hkex_api import HKEXAPIService
+from src.services.http_client import HTTPClientConfig, HTTPClientManager
+from src.services.latest_feed import LatestFeedState
+from src.services.pdf_parser import PDFParserService
+from src.services.rate_limit import RateLimitConfig, RateLimiter
+from src.services.resilience import Resilience, RetryPolicy
+from src.services.search_cache import SearchWindowCache
+from src.services.single_flight import SingleFlight
+from src.services.stock_id_cache import StockIdCache
+from src.services.watcher import AnnouncementWatcher, Watchlist
+from src.testing.hkex_standin import HKEXStandin
+
+BASE_URL = "http://hkex.test"
+
+
+def _watcher(tmp_path, watchlist: Watchlist) -> tuple[AnnouncementWatcher, HKEXStandin]:
+    app = HKEXStandin()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = dict(request.url.params)
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        status, response_headers, body = app.handle(request.url.path, query, headers)
+        return httpx.Response(status, headers=response_headers, content=body)
+
+    client_manager = HTTPClientManager(HTTPClientConfig(transport=httpx.MockTransport(handler)))
+    limiter = RateLimiter(RateLimitConfig(rate=1000, max_rate=1000))
+    hkex_service = HKEXAPIService(
+        client_manager=client_manager,
+        stock_id_cache=StockIdCache(":memory:"),
+        search_cache=SearchWindowCache(":memory:"),
+        latest_feed=LatestFeedState(),
+        announcement_index=AnnouncementIndex(":memory:"),
+        category_cache=CategoryCache(":memory:"),
+        rate_limiter=limiter,
+        single_flight=SingleFlight(),
+        resilience=Resilience(RetryPolicy(base_delay=0)),
+        base_url=BASE_URL,
+    )
+    pdf_service = PDFParserService(
+        client_manager=client_manager,
+        rate_limiter=limiter,
+        single_flight=SingleFlight(),
+        base_url=BASE_URL,
+        extraction_cache=ExtractionCache(":memory:"),
+    )
+    return AnnouncementWatcher(watchlist, tmp_path, hkex_service, pdf_service, concurrency=2), app
+
+
+class TestWatchlist:
+    """Test watchlist parsing and matching."""
+
+    def test_parse(self):
+        """Test codes, categories, comments and comma-separated entries."""
+        watchlist = Watchlist.parse("673  # China Health\n00700, 5\nt1:40000\nT2:51600\n\n# all\n")
+        assert watchlist.stock_codes == {"00673", "00700", "00005"}
+        assert watchlist.t1_codes == {"40000"}
+        assert watchlist.t2_codes == {"51600"}
+        assert not Watchlist.parse("# nothing\n")
+
+    def test_matches(self):
+        """Test stock and category matches."""
+        watchlist = Watchlist.parse("00673\nt2:51600")
+        item = {"t1Code": "50000", "t2Code": "51600", "stock": [{"sc": "00700"}, {"sc": "00005"}]}
+        assert watchlist.matches(item) == ["00700", "00005"]
+        assert watchlist.matches({"t2Code": "13300", "stock": [{"sc": "00700"}, {"sc": "00673"}]}) == ["00673"]
+        assert watchlist.matches({"t2Code": "13300", "stock": [{"sc": "00001"}]}) == []
+
+
+class TestAnnouncementWatcher:
+    """Test polling against the offline stand-in."""
+
+    def test_poll_warms_cache(self, tmp_path):
+        """Test that watched announcements are downloaded and extracted once."""
+        watcher, app = _watcher(tmp_path, Watchlist.parse("00673\nt2:51600"))
+        outcomes = watcher.poll_once()
+
+        assert sorted(outcome["stock_code"] for outcome in outcomes) == ["00005"] + ["00673"] * 5 + ["00700"]
+        assert all("error" not in outcome and outcome["downloaded"] and outcome["extracted"] for outcome in outcomes)
+        for outcome in outcomes:
+            text, tables = watcher.pdf_service.load_extracted_content(outcome["path"])
+            assert "ANNOUNCEMENT" in text
+            assert isinstance(tables, list)
+        assert watcher.stats["downloaded"] == 7
+        pdf_requests = app.requests["pdf"]
+
+        assert watcher.poll_once() == []
+        assert app.requests["pdf"] == pdf_requests
+        assert watcher.stats["polls"] == 2
+
+    def test_restart_reuses_cache(self, tmp_path):
+        """Test that a fresh watcher finds earlier downloads and extractions."""
+        watchlist = Watchlist.parse("00700")
+        first, _ = _watcher(tmp_path, watchlist)
+        first.poll_once()
+        second, app = _watcher(tmp_path, watchlist)
+        outcomes = second.poll_once()
+        assert len(outcomes) == 2
+        assert not any(outcome["downloaded"] or outcome["extracted"] for outcome in outcomes)
+        assert app.requests["pdf"] == 0
+
+
+class TestLoadExtractedContent:
+    """Test reading a saved extraction back."""
+
+    def test_roundtrip_and_staleness(self, tmp_path):
+        """Test that saved content loads until the PDF is newer than it."""
+        service = PDFParserService()
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        assert service.load_extracted_content(str(pdf)) is None
+
+        service.save_extracted_content(str(pdf), "text", [{"page": 1, "table": [["a"]]}])
+        assert service.load_extracted_content(str(pdf)) == ("text", [{"page": 1, "table": [["a"]]}])
+
+        mtime = os.stat(pdf).st_mtime + 10
+        os.utime(pdf, (mtime, mtime))
+        assert service.load_extracted_content(str(pdf)) is None
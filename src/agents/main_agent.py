@@ -19,11 +19,15 @@ from src.tools.hkex_tools import (
     get_latest_hkex_announcements,
     get_stock_info,
     search_hkex_announcements,
+    search_hkex_announcements_batch,
+    search_local_announcements,
 )
 from src.tools.pdf_tools import (
     analyze_pdf_structure,
     download_announcement_pdf,
     extract_pdf_content,
+    extract_pdf_pages,
+    find_in_pdf,
     get_cached_pdf_path,
 )
 from src.tools.summary_tools import generate_summary_markdown
@@ -133,6 +137,8 @@ async def create_hkex_agent(
     # Get all HKEX tools
     hkex_tools = [
         search_hkex_announcements,
+        search_hkex_announcements_batch,
+        search_local_announcements,
         get_latest_hkex_announcements,
         get_stock_info,
         get_announcement_categories,
@@ -140,6 +146,8 @@ async def create_hkex_agent(
         download_announcement_pdf,
         extract_pdf_content,
         analyze_pdf_structure,
+        find_in_pdf,
+        extract_pdf_pages,
         generate_summary_markdown,
     ]
 
@@ -12,10 +12,14 @@ from src.tools.hkex_tools import (
     get_latest_hkex_announcements,
     get_stock_info,
     search_hkex_announcements,
+    search_hkex_announcements_batch,
+    search_local_announcements,
 )
 from src.tools.pdf_tools import (
     analyze_pdf_structure,
     extract_pdf_content,
+    extract_pdf_pages,
+    find_in_pdf,
     get_cached_pdf_path,
 )
 
@@ -24,17 +28,23 @@ PDF_ANALYZER_TOOLS = [
     get_cached_pdf_path,
     extract_pdf_content,
     analyze_pdf_structure,
+    find_in_pdf,
+    extract_pdf_pages,
 ]
 
 # Report generator subagent tools (has access to all tools)
 REPORT_GENERATOR_TOOLS = [
     search_hkex_announcements,
+    search_hkex_announcements_batch,
+    search_local_announcements,
     get_latest_hkex_announcements,
     get_stock_info,
     get_announcement_categories,
     get_cached_pdf_path,
     extract_pdf_content,
     analyze_pdf_structure,
+    find_in_pdf,
+    extract_pdf_pages,
 ]
 
 
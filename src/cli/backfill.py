@@ -0,0 +1,75 @@
+"""`hkex-agent backfill`: build a local corpus for a stock universe and date range."""
+
+from pathlib import Path
+
+from src.services.backfill import Backfill
+from src.services.watcher import Watchlist
+
+from .config import COLORS, console
+
+
+def run_backfill(
+    from_date: str,
+    to_date: str,
+    stocks: str | None = None,
+    universe: str | None = None,
+    market: str = "SEHK",
+    cache_dir: str | None = None,
+    download_pdfs: bool = True,
+    concurrency: int = 4,
+    restart: bool = False,
+) -> None:
+    """Run a backfill, printing per-stock progress and throughput.
+
+    Interrupting with Ctrl+C is safe; running the same command again resumes.
+    """
+    codes = Watchlist.parse(stocks or "").stock_codes
+    if universe:
+        codes |= Watchlist.load(universe).stock_codes
+    if not codes:
+        console.print("[bold red]Error:[/bold red] No stock codes given (use --stocks or --universe)")
+        return
+
+    cache_path = Path(cache_dir) if cache_dir else Path.cwd() / "pdf_cache"
+    backfill = Backfill(
+        sorted(codes),
+        from_date,
+        to_date,
+        cache_path,
+        market=market,
+        download_pdfs=download_pdfs,
+        concurrency=concurrency,
+    )
+
+    console.print(
+        f"Backfilling {len(codes)} stocks, {from_date}–{to_date} "
+        f"({'metadata + PDFs' if download_pdfs else 'metadata only'}) → {cache_path}",
+        style=COLORS["primary"],
+    )
+
+    def report(result, stats):
+        finished = stats.skipped_stocks + stats.done_stocks + stats.failed_stocks
+        rate = f"{stats.announcements_per_second:.1f} ann/s, {stats.mb_per_second:.2f} MB/s"
+        prefix = f"  [{finished}/{stats.total_stocks}] {result.stock_code}"
+        if result.error:
+            console.print(f"{prefix} [red]✗[/red] {result.error} [dim]({rate})[/dim]")
+        else:
+            console.print(
+                f"{prefix} [green]✓[/green] {result.announcements} announcements, "
+                f"{result.pdfs} PDFs downloaded, {result.cached_pdfs} cached"
+                + (f", [yellow]{result.failed_pdfs} failed[/yellow]" if result.failed_pdfs else "")
+                + f" [dim]({rate})[/dim]"
+            )
+
+    try:
+        stats = backfill.run(restart=restart, on_progress=report)
+    except KeyboardInterrupt:
+        console.print("[yellow]Interrupted; run the same command again to resume.[/yellow]")
+        return
+    if stats.skipped_stocks:
+        console.print(f"[dim]Skipped {stats.skipped_stocks} stocks finished by an earlier run[/dim]")
+    if stats.failed_pdfs:
+        console.print(
+            f"[yellow]{stats.failed_pdfs} PDFs failed to download; rerun with --restart to retry them.[/yellow]"
+        )
+    console.print(f"[dim]{stats.to_dict()}[/dim]")
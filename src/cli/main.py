@@ -21,6 +21,8 @@ from .tools import (
     get_latest_hkex_announcements,
     get_stock_info,
     search_hkex_announcements,
+    search_hkex_announcements_batch,
+    search_local_announcements,
 )
 from .ui import TokenTracker, show_help
 
@@ -72,6 +74,62 @@ def parse_args():
         "--target", dest="source_agent", help="Copy prompt from another agent"
     )
 
+    # Watch command
+    watch_parser = subparsers.add_parser(
+        "watch", help="Pre-download and pre-extract new announcements for a watchlist"
+    )
+    watch_parser.add_argument(
+        "--watchlist",
+        required=True,
+        help="File with one stock code per line (t1:<code> / t2:<code> for categories)",
+    )
+    watch_parser.add_argument(
+        "--interval", type=float, default=60, help="Seconds between polls (default: 60)"
+    )
+    watch_parser.add_argument(
+        "--cache-dir", help="PDF cache directory (default: ./pdf_cache)"
+    )
+    watch_parser.add_argument(
+        "--concurrency", type=int, default=4, help="Announcements processed in parallel (default: 4)"
+    )
+    watch_parser.add_argument(
+        "--no-extract", action="store_true", help="Only download PDFs, skip text/table extraction"
+    )
+    watch_parser.add_argument(
+        "--once", action="store_true", help="Poll once and exit"
+    )
+
+    backfill_parser = subparsers.add_parser(
+        "backfill", help="Crawl announcement metadata and PDFs for a stock universe (resumable)"
+    )
+    backfill_parser.add_argument(
+        "--stocks", help="Comma-separated stock codes"
+    )
+    backfill_parser.add_argument(
+        "--universe", help="File with one stock code per line (watchlist format)"
+    )
+    backfill_parser.add_argument(
+        "--from", dest="from_date", required=True, help="Start date, YYYYMMDD"
+    )
+    backfill_parser.add_argument(
+        "--to", dest="to_date", required=True, help="End date, YYYYMMDD"
+    )
+    backfill_parser.add_argument(
+        "--market", default="SEHK", help="Market code (default: SEHK)"
+    )
+    backfill_parser.add_argument(
+        "--cache-dir", help="PDF cache directory (default: ./pdf_cache)"
+    )
+    backfill_parser.add_argument(
+        "--concurrency", type=int, default=4, help="Stocks processed in parallel (default: 4)"
+    )
+    backfill_parser.add_argument(
+        "--no-pdfs", action="store_true", help="Only crawl metadata, skip PDF downloads"
+    )
+    backfill_parser.add_argument(
+        "--restart", action="store_true", help="Ignore the checkpoint and start over"
+    )
+
     # Default interactive mode
     parser.add_argument(
         "--agent",
@@ -197,6 +255,8 @@ async def main(assistant_id: str, session_state):
     # Create agent with HKEX tools
     tools = [
         search_hkex_announcements,
+        search_hkex_announcements_batch,
+        search_local_announcements,
         get_latest_hkex_announcements,
         get_stock_info,
         get_announcement_categories,
@@ -239,6 +299,31 @@ def cli_main():
             list_agents()
         elif args.command == "reset":
             reset_agent(args.agent, args.source_agent)
+        elif args.command == "watch":
+            from .watch import run_watch
+
+            run_watch(
+                args.watchlist,
+                args.interval,
+                cache_dir=args.cache_dir,
+                extract=not args.no_extract,
+                once=args.once,
+                concurrency=args.concurrency,
+            )
+        elif args.command == "backfill":
+            from .backfill import run_backfill
+
+            run_backfill(
+                args.from_date,
+                args.to_date,
+                stocks=args.stocks,
+                universe=args.universe,
+                market=args.market,
+                cache_dir=args.cache_dir,
+                download_pdfs=not args.no_pdfs,
+                concurrency=args.concurrency,
+                restart=args.restart,
+            )
         else:
             # Create session state from args
             session_state = SessionState(
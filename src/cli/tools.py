@@ -5,6 +5,8 @@ from src.tools.hkex_tools import (
     get_latest_hkex_announcements,
     get_stock_info,
     search_hkex_announcements,
+    search_hkex_announcements_batch,
+    search_local_announcements,
 )
 from src.tools.pdf_tools import (
     analyze_pdf_structure,
@@ -17,6 +19,8 @@ from src.tools.summary_tools import generate_summary_markdown
 # Export all HKEX tools
 __all__ = [
     "search_hkex_announcements",
+    "search_hkex_announcements_batch",
+    "search_local_announcements",
     "get_latest_hkex_announcements",
     "get_stock_info",
     "get_announcement_categories",
@@ -0,0 +1,54 @@
+"""`hkex-agent watch`: keep the PDF cache warm for a watchlist."""
+
+import threading
+from pathlib import Path
+
+from src.services.watcher import AnnouncementWatcher, Watchlist
+
+from .config import COLORS, console
+
+
+def run_watch(
+    watchlist_path: str,
+    interval: float,
+    cache_dir: str | None = None,
+    extract: bool = True,
+    once: bool = False,
+    concurrency: int = 4,
+) -> None:
+    """Run the announcement watcher until interrupted (or for one poll with ``once``)."""
+    watchlist = Watchlist.load(watchlist_path)
+    if not watchlist:
+        console.print(f"[bold red]Error:[/bold red] Watchlist '{watchlist_path}' is empty")
+        return
+
+    cache_path = Path(cache_dir) if cache_dir else Path.cwd() / "pdf_cache"
+    cache_path.mkdir(parents=True, exist_ok=True)
+    watcher = AnnouncementWatcher(watchlist, cache_path, extract=extract, concurrency=concurrency)
+
+    console.print(
+        f"Watching {len(watchlist.stock_codes)} stocks, "
+        f"{len(watchlist.t1_codes) + len(watchlist.t2_codes)} categories → {cache_path}",
+        style=COLORS["primary"],
+    )
+
+    def report(outcomes):
+        for outcome in outcomes:
+            label = f"{outcome['stock_code']} {outcome['title']}"
+            if "error" in outcome:
+                console.print(f"  [red]✗[/red] {label}: {outcome['error']}")
+            else:
+                action = "downloaded" if outcome["downloaded"] else "cached"
+                if outcome["extracted"]:
+                    action += ", extracted"
+                console.print(f"  [green]✓[/green] {label} [dim]({action})[/dim]")
+
+    if once:
+        report(watcher.poll_once())
+    else:
+        stop = threading.Event()
+        try:
+            watcher.run(interval=interval, stop=stop, on_poll=report)
+        except KeyboardInterrupt:
+            stop.set()
+    console.print(f"[dim]{watcher.stats}[/dim]")
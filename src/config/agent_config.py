@@ -2,6 +2,7 @@
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 # Load environment variables early
@@ -259,6 +260,19 @@ def get_agent_dir_name() -> str:
     return os.getenv("HKEX_AGENT_DIR", AGENT_DIR_NAME)
 
 
+def get_service_cache_dir() -> Path:
+    """获取HKEX数据服务的本地缓存目录.
+
+    优先从环境变量 HKEX_CACHE_DIR 读取，默认为 ~/<agent目录>/cache
+
+    Returns:
+        缓存目录路径（不保证已创建）
+    """
+    if cache_dir := os.getenv("HKEX_CACHE_DIR"):
+        return Path(cache_dir).expanduser()
+    return Path.home() / get_agent_dir_name() / "cache"
+
+
 # 全局配置实例
 agent_model_config = SubAgentModelConfig()
 
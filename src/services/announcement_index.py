@@ -0,0 +1,432 @@
+"""Local SQLite FTS5 index of announcement metadata.
+
+Every announcement the HKEX service fetches (title searches and the latest
+feed) is upserted into a local SQLite database with an FTS5 index over
+TITLE / SHORT_TEXT / LONG_TEXT. Chinese text is indexed as character bigrams
+(normalized to Traditional Chinese) so keyword scans such as ``供股|配售``
+across every indexed issuer run locally in milliseconds.
+
+The index also records which (stockId, window) ranges were fetched completely,
+so title searches over those ranges can be answered without the network.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_service_cache_dir
+from src.services import columnar
+
+logger = logging.getLogger(__name__)
+
+# Simplified → Traditional mapping for characters common in announcement titles.
+# OpenCC is used instead when installed (``pip install deepagents[opencc]``).
+_S2T_TABLE = str.maketrans(
+    "业绩东会议报发关连联须权认购证变动书员财务资产价额约协决复买卖营运订条则规监处罚诉讼担贷债并转让划拨币亿万团宝实际开间"
+    "时长为与这个们从对将进现经济银险组织结构况态临选举辞职终暂红优赎审计师综损润净负询问内续声补亏获过总办点称简体奖励单"
+    "纪录邮递档汇兑号码网页缴税费质销库货换级场区国电车药医疗储风宁",
+    "業績東會議報發關連聯須權認購證變動書員財務資產價額約協決復買賣營運訂條則規監處罰訴訟擔貸債併轉讓劃撥幣億萬團寶實際開間"
+    "時長為與這個們從對將進現經濟銀險組織結構況態臨選舉辭職終暫紅優贖審計師綜損潤淨負詢問內續聲補虧獲過總辦點稱簡體獎勵單"
+    "紀錄郵遞檔匯兌號碼網頁繳稅費質銷庫貨換級場區國電車藥醫療儲風寧",
+)
+
+try:
+    import opencc
+
+    _opencc_converter = opencc.OpenCC("s2t")
+except Exception:  # ImportError, or a broken OpenCC installation
+    _opencc_converter = None
+
+_CJK_RUN = re.compile(r"[㐀-䶿一-鿿豈-﫿]+|[0-9a-z]+")
+_STOCK_CODE = re.compile(r"\d{4,5}")
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def _normalize(text: str) -> str:
+    """Fold width/case and convert Simplified to Traditional Chinese."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    if _opencc_converter is not None:
+        return _opencc_converter.convert(text)
+    return text.translate(_S2T_TABLE)
+
+
+def _term_tokens(text: str) -> list[str]:
+    """Split text into index tokens.
+
+    CJK runs become overlapping character bigrams plus the run's last
+    character (so every character starts some token); Latin/digit runs are
+    kept as whole words.
+    """
+    tokens = []
+    for run in _CJK_RUN.findall(_normalize(text)):
+        if run.isascii():
+            tokens.append(run)
+            continue
+        tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        tokens.append(run[-1])
+    return tokens
+
+
+def tokenize(text: str | None) -> str:
+    """Convert text into the space-separated token string stored in FTS5."""
+    return " ".join(_term_tokens(text or ""))
+
+
+def build_match_query(query: str, column: str | None = None) -> str | None:
+    """Translate a keyword query into an FTS5 MATCH expression.
+
+    "|" separates alternatives and whitespace separates terms that must all
+    match, e.g. "供股|配售 公告" → (供股) OR (配售 AND 公告). Each term is
+    matched as a substring via a bigram phrase.
+
+    Args:
+        query: Keyword query.
+        column: Restrict matching to one column (e.g. "title").
+
+    Returns:
+        MATCH expression, or None if the query has no searchable terms.
+    """
+    alternatives = []
+    for alternative in query.split("|"):
+        phrases = []
+        for term in alternative.split():
+            tokens = [token for token in _term_tokens(term) if len(token) > 1 or token.isascii()]
+            if tokens:
+                phrases.append('"' + " ".join(tokens) + '"')
+            elif single := _term_tokens(term):
+                # A lone CJK character: match any token starting with it
+                phrases.append(f'"{single[0]}" *')
+        if phrases:
+            alternatives.append("(" + " AND ".join(phrases) + ")")
+    if not alternatives:
+        return None
+    expression = " OR ".join(alternatives)
+    return f"{column} : ({expression})" if column else expression
+
+
+def _iso_date_time(date_time: str | None) -> str:
+    """Convert "dd/mm/yyyy HH:MM" into a sortable "yyyy-mm-dd HH:MM"."""
+    if not date_time:
+        return ""
+    date_part, _, time_part = date_time.partition(" ")
+    pieces = date_part.split("/")
+    if len(pieces) != 3:
+        return ""
+    day, month, year = pieces
+    return f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_part}".strip()
+
+
+def latest_item_to_record(item: dict[str, Any]) -> dict[str, Any]:
+    """Convert a latest-feed item into the title-search record shape."""
+    stocks = item.get("stock") or []
+    return {
+        "NEWS_ID": str(item.get("newsId", "")),
+        "TITLE": item.get("title", ""),
+        "DATE_TIME": item.get("relTime", ""),
+        "FILE_LINK": item.get("webPath", ""),
+        "FILE_TYPE": item.get("ext", ""),
+        "FILE_INFO": item.get("size", ""),
+        "SHORT_TEXT": item.get("sTxt", ""),
+        "LONG_TEXT": item.get("lTxt", ""),
+        "STOCK_CODE": "<br/>".join(s.get("sc", "") for s in stocks),
+        "STOCK_NAME": "<br/>".join(s.get("sn", "") for s in stocks),
+        "MARKET": item.get("market", ""),
+        "T1_CODE": item.get("t1Code", ""),
+        "T2_CODE": item.get("t2Code", ""),
+    }
+
+
+class AnnouncementIndex:
+    """SQLite store and FTS5 index of announcement records."""
+
+    def __init__(self, db_path: str | Path | None = None):
+        """Open (and create if needed) the index.
+
+        Args:
+            db_path: SQLite file path (default: <cache dir>/announcements.sqlite3).
+                Use ":memory:" for a process-local index.
+        """
+        if db_path is None:
+            db_path = get_service_cache_dir() / "announcements.sqlite3"
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS announcements (
+                news_id TEXT PRIMARY KEY,
+                published_at TEXT NOT NULL,
+                title TEXT NOT NULL,
+                file_link TEXT,
+                market TEXT,
+                t1_code TEXT,
+                t2_code TEXT,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_announcements_published ON announcements(published_at);
+            CREATE TABLE IF NOT EXISTS announcement_stocks (
+                news_id TEXT NOT NULL,
+                stock_code TEXT NOT NULL,
+                PRIMARY KEY (news_id, stock_code)
+            );
+            CREATE INDEX IF NOT EXISTS idx_stocks_code ON announcement_stocks(stock_code);
+            CREATE TABLE IF NOT EXISTS announcement_stock_ids (
+                news_id TEXT NOT NULL,
+                stock_id TEXT NOT NULL,
+                PRIMARY KEY (news_id, stock_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_stock_ids_id ON announcement_stock_ids(stock_id);
+            CREATE TABLE IF NOT EXISTS coverage (
+                stock_id TEXT NOT NULL,
+                market TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                from_date TEXT NOT NULL,
+                to_date TEXT NOT NULL,
+                PRIMARY KEY (stock_id, market, lang, from_date, to_date)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS announcements_fts USING fts5(
+                title, short_text, long_text, tokenize = 'unicode61'
+            );
+            """
+        )
+        self._conn.commit()
+
+    def upsert(self, records: list[dict[str, Any]], stock_id: Any = None) -> int:
+        """Insert or update announcement records.
+
+        Args:
+            records: Records in the title-search shape (NEWS_ID, TITLE, DATE_TIME, ...).
+            stock_id: Internal stock ID the records were searched for (optional).
+
+        Returns:
+            Number of records written.
+        """
+        written = 0
+        with self._lock:
+            for record in records:
+                news_id = str(record.get("NEWS_ID") or "")
+                if not news_id or "error" in record:
+                    continue
+                title = record.get("TITLE") or ""
+                row = self._conn.execute(
+                    "INSERT INTO announcements VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(news_id) DO UPDATE SET published_at = excluded.published_at,"
+                    " title = excluded.title, file_link = excluded.file_link,"
+                    " market = COALESCE(excluded.market, market),"
+                    " t1_code = COALESCE(excluded.t1_code, t1_code),"
+                    " t2_code = COALESCE(excluded.t2_code, t2_code), record = excluded.record "
+                    "RETURNING rowid",
+                    (
+                        news_id,
+                        _iso_date_time(record.get("DATE_TIME")),
+                        title,
+                        record.get("FILE_LINK"),
+                        record.get("MARKET") or None,
+                        record.get("T1_CODE") or None,
+                        record.get("T2_CODE") or None,
+                        json.dumps(record, ensure_ascii=False),
+                    ),
+                ).fetchone()
+                rowid = row[0]
+                self._conn.execute("DELETE FROM announcements_fts WHERE rowid = ?", (rowid,))
+                self._conn.execute(
+                    "INSERT INTO announcements_fts(rowid, title, short_text, long_text) VALUES (?, ?, ?, ?)",
+                    (
+                        rowid,
+                        tokenize(title),
+                        tokenize(_HTML_TAG.sub(" ", record.get("SHORT_TEXT") or "")),
+                        tokenize(_HTML_TAG.sub(" ", record.get("LONG_TEXT") or "")),
+                    ),
+                )
+                for stock_code in _STOCK_CODE.findall(record.get("STOCK_CODE") or ""):
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO announcement_stocks VALUES (?, ?)", (news_id, stock_code.zfill(5))
+                    )
+                if stock_id is not None:
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO announcement_stock_ids VALUES (?, ?)", (news_id, str(stock_id))
+                    )
+                written += 1
+            self._conn.commit()
+        return written
+
+    def upsert_latest(self, items: list[dict[str, Any]]) -> int:
+        """Insert or update latest-feed items (newsId, title, relTime, ...)."""
+        return self.upsert([latest_item_to_record(item) for item in items])
+
+    def mark_covered(self, stock_id: Any, market: str, lang: str, from_iso: str, to_iso: str) -> None:
+        """Record that every announcement of a stock in [from, to] is indexed.
+
+        Args:
+            stock_id: Internal stock ID.
+            market: Market code.
+            lang: Language code.
+            from_iso: First covered date (YYYY-MM-DD).
+            to_iso: Last covered date (YYYY-MM-DD).
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO coverage VALUES (?, ?, ?, ?, ?)",
+                (str(stock_id), market, lang, from_iso, to_iso),
+            )
+            self._conn.commit()
+
+    def covers(self, stock_id: Any, market: str, lang: str, from_iso: str, to_iso: str) -> bool:
+        """Check whether a completely fetched range contains [from, to]."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM coverage WHERE stock_id = ? AND market = ? AND lang = ?"
+                " AND from_date <= ? AND to_date >= ? LIMIT 1",
+                (str(stock_id), market, lang, from_iso, to_iso),
+            ).fetchone()
+        return row is not None
+
+    def search(
+        self,
+        query: str | None = None,
+        from_iso: str | None = None,
+        to_iso: str | None = None,
+        stock_code: str | None = None,
+        stock_id: Any = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+        title_only: bool = False,
+        limit: int | None = 100,
+    ) -> list[dict[str, Any]]:
+        """Search indexed announcements, newest first.
+
+        Args:
+            query: Keyword query ("|" for OR, spaces for AND); None matches everything.
+            from_iso: First publication date (YYYY-MM-DD, inclusive).
+            to_iso: Last publication date (YYYY-MM-DD, inclusive).
+            stock_code: Restrict to a 5-digit stock code.
+            stock_id: Restrict to records searched for this internal stock ID.
+            t1_code: Restrict to a tier 1 category code.
+            t2_code: Restrict to a tier 2 category code.
+            title_only: Match the keyword query against titles only.
+            limit: Maximum number of records (None for all).
+
+        Returns:
+            Records in the title-search shape.
+        """
+        clauses, params = [], []
+        if query:
+            match = build_match_query(query, "title" if title_only else None)
+            if match is None:
+                return []
+            clauses.append("a.rowid IN (SELECT rowid FROM announcements_fts WHERE announcements_fts MATCH ?)")
+            params.append(match)
+        if from_iso:
+            clauses.append("a.published_at >= ?")
+            params.append(from_iso)
+        if to_iso:
+            # published_at carries a time suffix, so compare against the end of the day
+            clauses.append("a.published_at <= ?")
+            params.append(f"{to_iso} 99:99")
+        if stock_code:
+            clauses.append("a.news_id IN (SELECT news_id FROM announcement_stocks WHERE stock_code = ?)")
+            params.append(stock_code.zfill(5))
+        if stock_id is not None:
+            clauses.append("a.news_id IN (SELECT news_id FROM announcement_stock_ids WHERE stock_id = ?)")
+            params.append(str(stock_id))
+        if t1_code:
+            clauses.append("a.t1_code = ?")
+            params.append(t1_code)
+        if t2_code:
+            clauses.append("a.t2_code = ?")
+            params.append(t2_code)
+
+        sql = "SELECT a.record FROM announcements a"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY a.published_at DESC, a.news_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def to_arrow(
+        self,
+        from_iso: str | None = None,
+        to_iso: str | None = None,
+        stock_code: str | None = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+    ) -> "columnar.pa.Table":
+        """Export indexed announcement metadata as an Arrow table (requires pyarrow).
+
+        Args:
+            from_iso: First publication date (YYYY-MM-DD, inclusive).
+            to_iso: Last publication date (YYYY-MM-DD, inclusive).
+            stock_code: Restrict to a 5-digit stock code.
+            t1_code: Restrict to a tier 1 category code.
+            t2_code: Restrict to a tier 2 category code.
+
+        Returns:
+            Table with ``columnar.announcement_schema()``, newest first.
+        """
+        columnar.require_pyarrow()
+        records = self.search(
+            from_iso=from_iso, to_iso=to_iso, stock_code=stock_code, t1_code=t1_code, t2_code=t2_code, limit=-1
+        )
+        return columnar.to_arrow(records)
+
+    def export_parquet(self, path: str | Path, **filters: Any) -> int:
+        """Write indexed announcement metadata to a Parquet file.
+
+        Args:
+            path: Output file.
+            **filters: Filters accepted by ``to_arrow``.
+
+        Returns:
+            Number of announcements written.
+        """
+        return columnar.write_parquet(self.to_arrow(**filters), path)
+
+    def import_parquet(self, path: str | Path) -> int:
+        """Load announcement metadata from a Parquet export into the index.
+
+        Returns:
+            Number of announcements written.
+        """
+        return self.upsert(columnar.from_arrow(columnar.read_parquet(path)))
+
+    def stats(self) -> dict[str, Any]:
+        """Return index statistics.
+
+        Returns:
+            Dictionary with the number of indexed announcements, stocks and covered ranges.
+        """
+        with self._lock:
+            return {
+                "announcements": self._conn.execute("SELECT COUNT(*) FROM announcements").fetchone()[0],
+                "stocks": self._conn.execute(
+                    "SELECT COUNT(DISTINCT stock_code) FROM announcement_stocks"
+                ).fetchone()[0],
+                "covered_ranges": self._conn.execute("SELECT COUNT(*) FROM coverage").fetchone()[0],
+            }
+
+
+_default_index: AnnouncementIndex | None = None
+_default_index_lock = threading.Lock()
+
+
+def get_announcement_index() -> AnnouncementIndex:
+    """Return the process-wide ``AnnouncementIndex``."""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = AnnouncementIndex()
+    return _default_index
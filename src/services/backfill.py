@@ -0,0 +1,299 @@
+"""Resumable historical backfill of announcement metadata and PDFs.
+
+Building a research corpus used to mean driving the agent by hand, stock by
+stock. ``Backfill`` crawls a stock universe over a date range with bounded
+concurrency: it runs the (window-cached) title search for each stock, writes
+the metadata to ``<cache_dir>/<stock_code>/announcements.json`` and
+optionally downloads every PDF into the layout ``PDFParserService`` uses
+(``<cache_dir>/<stock_code>/<date>-<title>.pdf``), so the PDF tools find them
+as already cached.
+
+Finished stocks are checkpointed in SQLite next to the output; an interrupted
+run resumes with the stocks that are not done yet, and within a stock PDFs
+already on disk are skipped. A PDF that fails to download is counted and
+skipped rather than failing its stock; rerun with ``restart`` to retry it.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.services.hkex_api import EXPORT_ROW_RANGE, HKEXAPIService
+from src.services.pdf_parser import PDFParserService, format_date_for_filename
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_CONCURRENCY = 4
+
+CHECKPOINT_FILENAME = ".backfill.sqlite3"
+METADATA_FILENAME = "announcements.json"
+
+
+class BackfillCheckpoint:
+    """SQLite record of the stocks a backfill job has finished."""
+
+    def __init__(self, db_path: str | Path):
+        """Open (and create if needed) the checkpoint.
+
+        Args:
+            db_path: SQLite file path, or ":memory:".
+        """
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS progress ("
+            " job TEXT NOT NULL,"
+            " stock_code TEXT NOT NULL,"
+            " announcements INTEGER NOT NULL,"
+            " pdfs INTEGER NOT NULL,"
+            " bytes INTEGER NOT NULL,"
+            " error TEXT,"
+            " finished_at REAL NOT NULL,"
+            " failed_pdfs INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (job, stock_code))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(progress)")}
+        if "failed_pdfs" not in columns:
+            # Checkpoints written before failed PDFs were counted
+            self._conn.execute("ALTER TABLE progress ADD COLUMN failed_pdfs INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def done(self, job: str) -> set[str]:
+        """Return the stock codes a job finished without error."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stock_code FROM progress WHERE job = ? AND error IS NULL", (job,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record(self, job: str, result: "StockResult") -> None:
+        """Record the outcome of one stock."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO progress"
+                " (job, stock_code, announcements, pdfs, bytes, error, finished_at, failed_pdfs)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job,
+                    result.stock_code,
+                    result.announcements,
+                    result.pdfs,
+                    result.bytes,
+                    result.error,
+                    time.time(),
+                    result.failed_pdfs,
+                ),
+            )
+            self._conn.commit()
+
+    def reset(self, job: str) -> None:
+        """Forget a job's progress."""
+        with self._lock:
+            self._conn.execute("DELETE FROM progress WHERE job = ?", (job,))
+            self._conn.commit()
+
+
+@dataclass
+class StockResult:
+    """Outcome of backfilling one stock."""
+
+    stock_code: str
+    announcements: int = 0
+    pdfs: int = 0
+    cached_pdfs: int = 0
+    failed_pdfs: int = 0
+    bytes: int = 0
+    error: str | None = None
+
+
+@dataclass
+class BackfillStats:
+    """Running totals of a backfill run."""
+
+    total_stocks: int = 0
+    skipped_stocks: int = 0
+    done_stocks: int = 0
+    failed_stocks: int = 0
+    announcements: int = 0
+    pdfs: int = 0
+    cached_pdfs: int = 0
+    failed_pdfs: int = 0
+    bytes: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started_at, 1e-9)
+
+    @property
+    def announcements_per_second(self) -> float:
+        return self.announcements / self.elapsed
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.elapsed
+
+    def add(self, result: StockResult) -> None:
+        if result.error:
+            self.failed_stocks += 1
+        else:
+            self.done_stocks += 1
+        self.announcements += result.announcements
+        self.pdfs += result.pdfs
+        self.cached_pdfs += result.cached_pdfs
+        self.failed_pdfs += result.failed_pdfs
+        self.bytes += result.bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_stocks": self.total_stocks,
+            "skipped_stocks": self.skipped_stocks,
+            "done_stocks": self.done_stocks,
+            "failed_stocks": self.failed_stocks,
+            "announcements": self.announcements,
+            "pdfs": self.pdfs,
+            "cached_pdfs": self.cached_pdfs,
+            "failed_pdfs": self.failed_pdfs,
+            "bytes": self.bytes,
+            "elapsed": round(self.elapsed, 3),
+            "announcements_per_second": round(self.announcements_per_second, 1),
+            "mb_per_second": round(self.mb_per_second, 3),
+        }
+
+
+class Backfill:
+    """Crawls metadata (and optionally PDFs) for a stock universe over a date range."""
+
+    def __init__(
+        self,
+        stock_codes: list[str],
+        from_date: str,
+        to_date: str,
+        cache_dir: str | Path,
+        market: str = "SEHK",
+        hkex_service: HKEXAPIService | None = None,
+        pdf_service: PDFParserService | None = None,
+        download_pdfs: bool = True,
+        concurrency: int = DEFAULT_BACKFILL_CONCURRENCY,
+        checkpoint: BackfillCheckpoint | None = None,
+    ):
+        """Initialize the backfill.
+
+        Args:
+            stock_codes: 5-digit stock codes; blanks and repeats are dropped.
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            cache_dir: PDF cache directory (the one the PDF tools resolve "/pdf_cache/" to).
+            market: Market code passed to the title search (default: "SEHK").
+            hkex_service: HKEX API service (default: new service on the shared pool).
+            pdf_service: PDF service (default: new service on the shared pool).
+            download_pdfs: Also download every PDF announcement.
+            concurrency: Stocks processed in parallel.
+            checkpoint: Progress store (default: <cache_dir>/.backfill.sqlite3).
+        """
+        self.stock_codes = list(dict.fromkeys(code.strip().zfill(5) for code in stock_codes if code.strip()))
+        self.from_date = from_date
+        self.to_date = to_date
+        self.cache_dir = Path(cache_dir)
+        self.market = market
+        self.hkex_service = hkex_service or HKEXAPIService()
+        self.pdf_service = pdf_service or PDFParserService()
+        self.download_pdfs = download_pdfs
+        self.concurrency = max(1, concurrency)
+        self.checkpoint = checkpoint or BackfillCheckpoint(self.cache_dir / CHECKPOINT_FILENAME)
+
+    @property
+    def job(self) -> str:
+        """Checkpoint key of this run (market, date range and whether PDFs are included)."""
+        return f"{self.market}:{self.from_date}-{self.to_date}{'+pdf' if self.download_pdfs else ''}"
+
+    def _download(self, item: dict[str, Any], stock_code: str, result: StockResult) -> None:
+        """Download one announcement's PDF unless it is already cached; a failure is counted, not raised."""
+        date = format_date_for_filename(item.get("DATE_TIME", ""))
+        title = item.get("TITLE", "")
+        if self.pdf_service.get_cached_pdf_path(stock_code, date, title, str(self.cache_dir)):
+            result.cached_pdfs += 1
+            return
+        try:
+            path = self.pdf_service.download_pdf(item["FILE_LINK"], stock_code, date, title, str(self.cache_dir))
+        except Exception as e:
+            logger.warning("Failed to download %s for %s: %s", item["FILE_LINK"], stock_code, e)
+            result.failed_pdfs += 1
+            return
+        result.pdfs += 1
+        result.bytes += Path(path).stat().st_size
+
+    def backfill_stock(self, stock_code: str) -> StockResult:
+        """Crawl one stock: metadata file, then PDFs."""
+        result = StockResult(stock_code)
+        try:
+            stock_id, stock_info = self.hkex_service.get_stock_id(stock_code)
+            if stock_id is None:
+                result.error = stock_info[0].get("error", "Stock not found") if stock_info else "Stock not found"
+                return result
+            _, announcements = self.hkex_service.search_announcements(
+                stock_id, self.from_date, self.to_date, market=self.market, row_range=EXPORT_ROW_RANGE
+            )
+            if len(announcements) == 1 and "error" in announcements[0]:
+                result.error = announcements[0]["error"]
+                return result
+
+            stock_dir = self.cache_dir / stock_code
+            stock_dir.mkdir(parents=True, exist_ok=True)
+            tmp = stock_dir / f".{METADATA_FILENAME}.tmp"
+            tmp.write_text(json.dumps(announcements, ensure_ascii=False, indent=1), encoding="utf-8")
+            tmp.replace(stock_dir / METADATA_FILENAME)
+            result.announcements = len(announcements)
+
+            if self.download_pdfs:
+                for item in announcements:
+                    if str(item.get("FILE_LINK", "")).lower().endswith(".pdf"):
+                        self._download(item, stock_code, result)
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    def run(
+        self,
+        restart: bool = False,
+        on_progress: Callable[[StockResult, BackfillStats], None] | None = None,
+    ) -> BackfillStats:
+        """Backfill every stock not finished by an earlier run of the same job.
+
+        Args:
+            restart: Ignore (and clear) earlier progress.
+            on_progress: Optional callback after each stock with its result and the running totals.
+
+        Returns:
+            Totals of this run.
+        """
+        if restart:
+            self.checkpoint.reset(self.job)
+        done = self.checkpoint.done(self.job)
+        pending = [code for code in self.stock_codes if code not in done]
+        stats = BackfillStats(total_stocks=len(self.stock_codes), skipped_stocks=len(self.stock_codes) - len(pending))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.backfill_stock, code) for code in pending]
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    self.checkpoint.record(self.job, result)
+                    stats.add(result)
+                    if on_progress is not None:
+                        on_progress(result, stats)
+            except BaseException:
+                # Interrupted: drop queued stocks, let running ones finish
+                for future in futures:
+                    future.cancel()
+                raise
+        return stats
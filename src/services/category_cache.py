@@ -0,0 +1,281 @@
+"""Memoized HKEX announcement category tables.
+
+``get_categories`` used to download ``tierone_c.json``/``tiertwo_c.json`` on
+every call, and nothing mapped the ``t1Code``/``t2Code`` values carried by
+announcements back to names. The tables change a few times a year, so they are
+kept in memory once per process, persisted to SQLite under the agent cache
+directory and refreshed after a configurable interval. ``CategoryIndex``
+exposes them as plain dict lookups so feed items can be enriched and filtered
+by category without extra requests.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_service_cache_dir
+
+DEFAULT_REFRESH_SECONDS = 24 * 60 * 60  # 1 day
+
+# How long a failed table fetch is remembered before the endpoint is tried again
+DEFAULT_FAILURE_SECONDS = 60
+
+# Tables needed to build a CategoryIndex
+INDEXED_CATEGORY_TYPES = ("tierone", "tiertwo", "tiertwogrp")
+
+# Key spellings seen across the category JSON files
+_CODE_KEYS = ("code", "c", "id")
+_NAME_KEYS = ("name", "n", "nameZh")
+_NAME_EN_KEYS = ("nameEn", "nameEN", "ne")
+_T1_KEYS = ("t1code", "t1Code", "tierOneCode")
+_GROUP_KEYS = ("t2Gcode", "t2GCode", "grpCode", "groupCode")
+_MEMBER_KEYS = ("t2code", "t2Code", "tierTwoCodes", "children", "members")
+
+
+def _first(item: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    """Return the first present, non-empty value among ``keys``."""
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _as_codes(value: Any) -> list[str]:
+    """Normalize a member list given as a list, a comma-separated string or a single code."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(_first(v, _CODE_KEYS) if isinstance(v, dict) else v) for v in value]
+    return [code.strip() for code in str(value).split(",") if code.strip()]
+
+
+class CategoryIndex:
+    """In-memory lookups over the tier 1, tier 2 and tier 2 group tables.
+
+    Attributes:
+        t1_names: Tier 1 code -> name.
+        t1_codes: Tier 1 name -> code.
+        t2_names: Tier 2 code -> name.
+        t2_codes: Tier 2 name -> code.
+        t2_parents: Tier 2 code -> tier 1 code (when the table carries it).
+        group_names: Tier 2 group code -> name.
+        group_members: Tier 2 group code -> set of tier 2 codes.
+    """
+
+    def __init__(self, tables: dict[str, list[dict[str, Any]]]):
+        """Build the lookups.
+
+        Args:
+            tables: Category lists keyed by category type ("tierone", "tiertwo", "tiertwogrp").
+        """
+        self.t1_names: dict[str, str] = {}
+        self.t1_codes: dict[str, str] = {}
+        self.t2_names: dict[str, str] = {}
+        self.t2_codes: dict[str, str] = {}
+        self.t2_parents: dict[str, str] = {}
+        self.group_names: dict[str, str] = {}
+        self.group_members: dict[str, set[str]] = {}
+
+        for item in tables.get("tierone", []):
+            self._add(item, self.t1_names, self.t1_codes)
+
+        for item in tables.get("tiertwo", []):
+            code = self._add(item, self.t2_names, self.t2_codes)
+            if code is None:
+                continue
+            if (parent := _first(item, _T1_KEYS)) is not None:
+                self.t2_parents[code] = str(parent)
+            if (group := _first(item, _GROUP_KEYS)) is not None:
+                self.group_members.setdefault(str(group), set()).add(code)
+
+        for item in tables.get("tiertwogrp", []):
+            group = self._add(item, self.group_names, {})
+            if group is not None:
+                self.group_members.setdefault(group, set()).update(_as_codes(_first(item, _MEMBER_KEYS)))
+
+    @staticmethod
+    def _add(item: dict[str, Any], names: dict[str, str], codes: dict[str, str]) -> str | None:
+        """Register one table row; returns its code."""
+        if not isinstance(item, dict):
+            return None
+        code, name = _first(item, _CODE_KEYS), _first(item, _NAME_KEYS)
+        if code is None:
+            return None
+        code = str(code)
+        if name is not None:
+            names[code] = str(name)
+            codes.setdefault(str(name), code)
+        if (name_en := _first(item, _NAME_EN_KEYS)) is not None:
+            codes.setdefault(str(name_en), code)
+        return code
+
+    def resolve_code(self, value: str, tier: int = 1) -> str:
+        """Map a category name to its code; codes and unknown names pass through.
+
+        Args:
+            value: Category code or name.
+            tier: 1 for tier 1, 2 for tier 2.
+        """
+        codes = self.t1_codes if tier == 1 else self.t2_codes
+        return codes.get(value, value)
+
+    def group_of(self, t2_code: str) -> list[str]:
+        """Return the tier 2 group codes a tier 2 code belongs to."""
+        return sorted(group for group, members in self.group_members.items() if t2_code in members)
+
+    def enrich_latest(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of a latest-feed item with t1Name/t2Name added when known."""
+        enriched = dict(item)
+        if (name := self.t1_names.get(str(item.get("t1Code")))) is not None:
+            enriched["t1Name"] = name
+        if (name := self.t2_names.get(str(item.get("t2Code")))) is not None:
+            enriched["t2Name"] = name
+        return enriched
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of entries per lookup."""
+        return {"tierone": len(self.t1_names), "tiertwo": len(self.t2_names), "tiertwogrp": len(self.group_names)}
+
+
+class CategoryCache:
+    """SQLite-backed category tables with an in-memory front and a refresh interval.
+
+    环境变量:
+        HKEX_CATEGORY_REFRESH_HOURS: 分类表刷新间隔，小时（默认 24）
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        refresh_seconds: float | None = None,
+        failure_seconds: float = DEFAULT_FAILURE_SECONDS,
+    ):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite file path (default: <cache dir>/categories.sqlite3).
+                Use ":memory:" for a process-local cache.
+            refresh_seconds: Age after which a table is refetched
+                (default: HKEX_CATEGORY_REFRESH_HOURS or 1 day).
+            failure_seconds: How long a failed fetch is remembered, so callers
+                fall back at once instead of retrying a failing endpoint.
+        """
+        if refresh_seconds is None:
+            refresh_hours = os.getenv("HKEX_CATEGORY_REFRESH_HOURS")
+            refresh_seconds = float(refresh_hours) * 60 * 60 if refresh_hours else DEFAULT_REFRESH_SECONDS
+        self.refresh_seconds = refresh_seconds
+        self.failure_seconds = failure_seconds
+
+        if db_path is None:
+            db_path = get_service_cache_dir() / "categories.sqlite3"
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS categories ("
+            " category_type TEXT PRIMARY KEY,"
+            " categories TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        # In-memory front: category_type -> (categories, fetched_at)
+        self._memory: dict[str, tuple[list[dict[str, Any]], float]] = {}
+        self._loaded = False
+        self._index: CategoryIndex | None = None
+        # category_type -> (fetch error, failed_at)
+        self._failures: dict[str, tuple[Exception, float]] = {}
+
+    def _load(self) -> None:
+        """Load every table into memory on first use."""
+        for category_type, categories, fetched_at in self._conn.execute("SELECT * FROM categories").fetchall():
+            self._memory[category_type] = (json.loads(categories), fetched_at)
+        self._loaded = True
+
+    def get(self, category_type: str, allow_stale: bool = False) -> list[dict[str, Any]] | None:
+        """Return a cached table.
+
+        Args:
+            category_type: "doc", "tierone", "tiertwo" or "tiertwogrp".
+            allow_stale: Also return tables older than the refresh interval.
+
+        Returns:
+            The category list, or None if missing (or stale and not allowed).
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._memory.get(category_type)
+        if entry is None or (not allow_stale and time.time() - entry[1] > self.refresh_seconds):
+            return None
+        return entry[0]
+
+    def put(self, category_type: str, categories: list[dict[str, Any]]) -> None:
+        """Store a freshly fetched table."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO categories VALUES (?, ?, ?)",
+                (category_type, json.dumps(categories, ensure_ascii=False), now),
+            )
+            self._conn.commit()
+            if not self._loaded:
+                self._load()
+            self._memory[category_type] = (categories, now)
+            self._failures.pop(category_type, None)
+            self._index = None
+
+    def record_failure(self, category_type: str, error: Exception) -> None:
+        """Remember that fetching a table failed."""
+        with self._lock:
+            self._failures[category_type] = (error, time.time())
+
+    def recent_failure(self, category_type: str) -> Exception | None:
+        """Return the error of a fetch that failed within ``failure_seconds``, if any."""
+        with self._lock:
+            failure = self._failures.get(category_type)
+        if failure is None or time.time() - failure[1] > self.failure_seconds:
+            return None
+        return failure[0]
+
+    def index(self) -> CategoryIndex:
+        """Return the lookups over the cached tables (rebuilt only after a table changes)."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if self._index is None:
+                self._index = CategoryIndex(
+                    {category_type: entry[0] for category_type, entry in self._memory.items()}
+                )
+            return self._index
+
+    def clear(self) -> None:
+        """Remove every cached table."""
+        with self._lock:
+            self._conn.execute("DELETE FROM categories")
+            self._conn.commit()
+            self._memory.clear()
+            self._failures.clear()
+            self._index = None
+
+
+_default_cache: CategoryCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_category_cache() -> CategoryCache:
+    """Return the process-wide ``CategoryCache``."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = CategoryCache()
+    return _default_cache
@@ -0,0 +1,134 @@
+"""Apache Arrow / Parquet form of announcement metadata.
+
+Research workflows pull years of announcement metadata and then filter and
+aggregate it in pandas or DuckDB; re-parsing lists of dicts each time is slow
+and memory-hungry. This module converts title-search rows to an Arrow table
+with a fixed schema -- ``published_at`` as a timestamp, and stock codes,
+names, category codes and texts dictionary-encoded (categorical) -- and reads
+and writes it as Parquet.
+
+pyarrow is optional (``pip install deepagents[arrow]``); everything else in
+the service works without it.
+"""
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pc = pq = None  # type: ignore[assignment]
+
+# HKEX date-time format of DATE_TIME ("dd/mm/yyyy HH:MM", Hong Kong time)
+DATE_TIME_FORMAT = "%d/%m/%Y %H:%M"
+
+# (column, row key, categorical); published_at is derived from DATE_TIME
+_COLUMNS = (
+    ("news_id", "NEWS_ID", False),
+    ("stock_code", "STOCK_CODE", True),
+    ("stock_name", "STOCK_NAME", True),
+    ("title", "TITLE", False),
+    ("file_type", "FILE_TYPE", True),
+    ("file_info", "FILE_INFO", False),
+    ("file_link", "FILE_LINK", False),
+    ("short_text", "SHORT_TEXT", True),
+    ("long_text", "LONG_TEXT", True),
+    ("market", "MARKET", True),
+    ("t1_code", "T1_CODE", True),
+    ("t2_code", "T2_CODE", True),
+)
+
+# Alternative keys for the category codes (title-search fixtures, latest feed)
+_ALIASES = {"T1_CODE": "t1Code", "T2_CODE": "t2Code"}
+
+
+def require_pyarrow() -> None:
+    """Raise ImportError with an install hint when pyarrow is missing."""
+    if pa is None:
+        raise ImportError("Arrow/Parquet export requires pyarrow: pip install 'deepagents[arrow]'")
+
+
+def announcement_schema() -> "pa.Schema":
+    """Return the Arrow schema of announcement tables."""
+    require_pyarrow()
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    fields = [pa.field("published_at", pa.timestamp("ms"))]
+    fields += [pa.field(column, categorical if is_categorical else pa.string()) for column, _, is_categorical in _COLUMNS]
+    return pa.schema(fields, metadata={"published_at": "Hong Kong local time"})
+
+
+def _value(row: Any, key: str) -> Any:
+    value = row.get(key)
+    if value is None and key in _ALIASES:
+        value = row.get(_ALIASES[key])
+    if value in ("", "NaN"):
+        return None
+    return str(value) if value is not None else None
+
+
+def to_arrow(rows: Iterable[Any]) -> "pa.Table":
+    """Convert announcement rows to an Arrow table.
+
+    Args:
+        rows: Title-search dicts (or ``Announcement`` records); error entries are skipped.
+
+    Returns:
+        Table with ``announcement_schema()``.
+    """
+    require_pyarrow()
+    rows = [row for row in rows if "error" not in row]
+    schema = announcement_schema()
+    date_times = pa.array([_value(row, "DATE_TIME") for row in rows], pa.string())
+    arrays = [pc.strptime(date_times, format=DATE_TIME_FORMAT, unit="ms", error_is_null=True)]
+    for column, key, _ in _COLUMNS:
+        arrays.append(pa.array([_value(row, key) for row in rows], schema.field(column).type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def from_arrow(table: "pa.Table") -> list[dict[str, Any]]:
+    """Convert an announcement table back to title-search dicts.
+
+    Null values come back as empty strings, and category codes as
+    T1_CODE / T2_CODE.
+    """
+    require_pyarrow()
+    columns = {column: table.column(column).to_pylist() for column, _, _ in _COLUMNS if column in table.column_names}
+    date_times = None
+    if "published_at" in table.column_names:
+        date_times = pc.strftime(table.column("published_at"), format=DATE_TIME_FORMAT).to_pylist()
+    rows = []
+    for i in range(table.num_rows):
+        row = {key: columns[column][i] or "" for column, key, _ in _COLUMNS if column in columns}
+        if date_times is not None:
+            row["DATE_TIME"] = date_times[i] or ""
+        rows.append(row)
+    return rows
+
+
+def write_parquet(data: "pa.Table | Iterable[Any]", path: str | Path) -> int:
+    """Write an announcement table (or rows) to a Parquet file.
+
+    Returns:
+        Number of rows written.
+    """
+    table = data if pa is not None and isinstance(data, pa.Table) else to_arrow(data)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, str(path), compression="zstd")
+    return table.num_rows
+
+
+def read_parquet(
+    path: str | Path, columns: Sequence[str] | None = None, filters: list[tuple[str, str, Any]] | None = None
+) -> "pa.Table":
+    """Read an announcement table from Parquet.
+
+    Args:
+        path: Parquet file or directory of files.
+        columns: Columns to read (default: all).
+        filters: Row filters in pyarrow DNF form, e.g. [("t2_code", "=", "51600")].
+    """
+    require_pyarrow()
+    return pq.read_table(str(path), columns=list(columns) if columns else None, filters=filters)
@@ -0,0 +1,184 @@
+"""Content-addressed cache of PDF extraction results.
+
+Parsing a long annual report takes seconds to minutes, and the same file is
+often extracted again -- by another tool call, another session or the
+watcher. Results are stored in SQLite under the agent cache directory, keyed
+by the SHA-256 of the PDF bytes together with the extractor version and
+options. A re-downloaded or renamed copy of a file therefore hits, and any
+change to the extractor produces new keys; entries for old versions are
+never read again and age out of the LRU size bound.
+
+Artifacts ("text", "tables", "structure", "page_texts") are stored
+separately as zlib-compressed JSON, so a structure-only call does not load
+the text.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_service_cache_dir
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Read size when hashing PDFs
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """SQLite store of extraction artifacts keyed by PDF content and extractor version.
+
+    环境变量:
+        HKEX_EXTRACTION_CACHE: 启用 PDF 解析结果缓存（默认 true）
+        HKEX_EXTRACTION_CACHE_MAX_MB: 缓存大小上限，MB（默认 1024）
+    """
+
+    def __init__(self, db_path: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite file path (default: <cache dir>/extractions.sqlite3).
+                Use ":memory:" for a process-local cache.
+            max_bytes: Upper bound of stored (compressed) artifacts; least
+                recently used entries are evicted beyond it.
+        """
+        if db_path is None:
+            db_path = get_service_cache_dir() / "extractions.sqlite3"
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " cache_key TEXT NOT NULL,"
+            " artifact TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (cache_key, artifact))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions (accessed_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ExtractionCache | None":
+        """Build a cache from ``HKEX_EXTRACTION_CACHE*`` variables (None when disabled)."""
+        if os.getenv("HKEX_EXTRACTION_CACHE", "true").lower() not in ("true", "1", "yes"):
+            return None
+        max_mb = os.getenv("HKEX_EXTRACTION_CACHE_MAX_MB")
+        return cls(max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES)
+
+    @staticmethod
+    def make_key(digest: str, version: str, options: dict[str, Any] | None = None) -> str:
+        """Build the cache key of a PDF (by content digest) under an extractor version and options."""
+        material = json.dumps([digest, version, options or {}], sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str, artifacts: set[str]) -> dict[str, Any]:
+        """Return the stored artifacts among ``artifacts`` (possibly none)."""
+        if not artifacts:
+            return {}
+        names = sorted(artifacts)
+        placeholders = ", ".join("?" * len(names))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT artifact, value FROM extractions WHERE cache_key = ? AND artifact IN ({placeholders})",
+                (key, *names),
+            ).fetchall()
+            if rows:
+                self._conn.execute(
+                    f"UPDATE extractions SET accessed_at = ? WHERE cache_key = ? AND artifact IN ({placeholders})",
+                    (time.time(), key, *names),
+                )
+                self._conn.commit()
+            self.hits += len(rows)
+            self.misses += len(names) - len(rows)
+        return {artifact: json.loads(zlib.decompress(value)) for artifact, value in rows}
+
+    def put(self, key: str, artifacts: dict[str, Any]) -> None:
+        """Store artifacts for a key, evicting least recently used entries over the size bound."""
+        now = time.time()
+        rows = []
+        for artifact, value in artifacts.items():
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            rows.append((key, artifact, blob, len(blob), now))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store fits ``max_bytes`` (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        cursor = self._conn.execute("SELECT cache_key, artifact, size FROM extractions ORDER BY accessed_at")
+        stale = []
+        for cache_key, artifact, size in cursor.fetchall():
+            if total <= self.max_bytes:
+                break
+            stale.append((cache_key, artifact))
+            total -= size
+        self._conn.executemany("DELETE FROM extractions WHERE cache_key = ? AND artifact = ?", stale)
+
+    def clear(self) -> None:
+        """Remove every stored extraction and reset statistics."""
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics.
+
+        Returns:
+            Dictionary with hits and misses (per artifact), documents, bytes and max_bytes.
+        """
+        with self._lock:
+            documents, size = self._conn.execute(
+                "SELECT COUNT(DISTINCT cache_key), COALESCE(SUM(size), 0) FROM extractions"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "documents": documents,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache: ExtractionCache | None = None
+_default_cache_loaded = False
+_default_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache | None:
+    """Return the process-wide ``ExtractionCache`` (None when disabled by HKEX_EXTRACTION_CACHE)."""
+    global _default_cache, _default_cache_loaded
+    if not _default_cache_loaded:
+        with _default_cache_lock:
+            if not _default_cache_loaded:
+                _default_cache = ExtractionCache.from_env()
+                _default_cache_loaded = True
+    return _default_cache
@@ -1,16 +1,62 @@
 """HKEX API service for fetching announcement data."""
 
-import json
+import asyncio
+import logging
+import os
 import re
 import ssl
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
 import httpx
 
-
-class HKEXAPIService:
-    """Service for interacting with HKEX APIs."""
+from src.services import columnar
+from src.services.announcement_index import AnnouncementIndex, get_announcement_index
+from src.services.category_cache import INDEXED_CATEGORY_TYPES, CategoryCache, CategoryIndex, get_category_cache
+from src.services.decoding import clean_text, decode_rows, loads
+from src.services.http_client import HTTPClientManager, get_client_manager
+from src.services.latest_feed import LatestFeedState, get_latest_feed_state
+from src.services.rate_limit import RateLimiter, get_rate_limiter, retry_after_seconds
+from src.services.resilience import HKEXError, HKEXHTTPStatusError, Resilience, classify_error, get_resilience
+from src.services.single_flight import SingleFlight, get_single_flight
+from src.services.search_cache import (
+    DEFAULT_SEARCH_CONCURRENCY,
+    MAX_ROW_RANGE,
+    SearchPlan,
+    SearchWindow,
+    SearchWindowCache,
+    bucket_by_window,
+    contiguous_runs,
+    dedupe_by_news_id,
+    filter_by_range,
+    get_search_window_cache,
+    merge_window_results,
+    parse_search_date,
+    plan_search_windows,
+    split_window,
+)
+from src.services.stock_id_cache import StockIdCache, get_stock_id_cache
+
+logger = logging.getLogger(__name__)
+
+# Stocks searched in parallel by search_announcements_batch
+DEFAULT_BATCH_CONCURRENCY = 8
+
+# Per-stock row cap of export_announcements (effectively unbounded)
+EXPORT_ROW_RANGE = 100_000
+
+
+class _HKEXAPIBase:
+    """Request building and response parsing shared by the sync and async services.
+
+    环境变量:
+        HKEX_SEARCH_CONCURRENCY: 单次搜索并行子窗口请求数（默认 4）
+        HKEX_BATCH_CONCURRENCY: 批量搜索并行股票数（默认 8）
+        HKEX_BASE_URL: hkexnews 地址，可指向本地替身服务（默认 https://www1.hkexnews.hk）
+    """
 
     BASE_URL = "https://www1.hkexnews.hk"
     DEFAULT_HEADERS = {
@@ -18,20 +64,189 @@ class HKEXAPIService:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         ),
     }
+    CATEGORY_FILES = {
+        "doc": "doc_c.json",
+        "tierone": "tierone_c.json",
+        "tiertwo": "tiertwo_c.json",
+        "tiertwogrp": "tiertwogrp_c.json",
+    }
+    ACTIVE_STOCK_FILES = {
+        "SEHK": "activestock_sehk_c.json",
+        "GEM": "activestock_gem_c.json",
+    }
+    # Rate limiter endpoint names by URL file name
+    ENDPOINTS = {
+        "prefix.do": "prefix",
+        "titleSearchServlet.do": "search",
+        "lcisehk1relsdc_1.json": "latest",
+        **{filename: "categories" for filename in CATEGORY_FILES.values()},
+        **{filename: "active_stocks" for filename in ACTIVE_STOCK_FILES.values()},
+    }
 
-    def __init__(self, timeout: int = 30):
+    def __init__(
+        self,
+        timeout: int = 30,
+        client_manager: HTTPClientManager | None = None,
+        stock_id_cache: StockIdCache | None = None,
+        search_cache: SearchWindowCache | None = None,
+        latest_feed: LatestFeedState | None = None,
+        announcement_index: AnnouncementIndex | None = None,
+        category_cache: CategoryCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        single_flight: SingleFlight | None = None,
+        resilience: Resilience | None = None,
+        search_concurrency: int | None = None,
+        batch_concurrency: int | None = None,
+        base_url: str | None = None,
+    ):
         """Initialize HKEX API service.
 
         Args:
             timeout: Request timeout in seconds.
+            client_manager: Pooled HTTP client manager (default: process-wide shared pool).
+            stock_id_cache: Stock ID resolution cache (default: process-wide persistent cache).
+            search_cache: Immutable search window cache (default: process-wide persistent cache).
+            latest_feed: Latest-feed snapshot state (default: process-wide state).
+            announcement_index: Local FTS5 announcement index (default: process-wide persistent index).
+            category_cache: Category table cache (default: process-wide persistent cache).
+            rate_limiter: Per-endpoint adaptive rate limiter (default: process-wide limiter).
+            single_flight: Coalescer for identical in-flight requests (default: process-wide instance).
+            resilience: Retry policy and per-endpoint circuit breakers (default: process-wide instance).
+            search_concurrency: Maximum parallel sub-window requests per search
+                (default: HKEX_SEARCH_CONCURRENCY or 4).
+            batch_concurrency: Maximum stocks searched in parallel by ``search_announcements_batch``
+                (default: HKEX_BATCH_CONCURRENCY or 8).
+            base_url: hkexnews origin, e.g. a local stand-in
+                (default: HKEX_BASE_URL or https://www1.hkexnews.hk).
         """
+        self.BASE_URL = (base_url or os.getenv("HKEX_BASE_URL") or self.BASE_URL).rstrip("/")
         self.timeout = timeout
+        self.client_manager = client_manager or get_client_manager()
+        self._stock_id_cache = stock_id_cache
+        self._search_cache = search_cache
+        self.latest_feed = latest_feed or get_latest_feed_state()
+        self._announcement_index = announcement_index
+        self._category_cache = category_cache
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.single_flight = single_flight or get_single_flight()
+        self.resilience = resilience or get_resilience()
+        if search_concurrency is None:
+            search_concurrency = int(os.getenv("HKEX_SEARCH_CONCURRENCY", DEFAULT_SEARCH_CONCURRENCY))
+        self.search_concurrency = max(1, search_concurrency)
+        if batch_concurrency is None:
+            batch_concurrency = int(os.getenv("HKEX_BATCH_CONCURRENCY", DEFAULT_BATCH_CONCURRENCY))
+        self.batch_concurrency = max(1, batch_concurrency)
         # Create SSL context that doesn't verify certificates
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
         self.ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
 
+    @property
+    def stock_id_cache(self) -> StockIdCache:
+        """Stock ID resolution cache, opened on first use."""
+        if self._stock_id_cache is None:
+            self._stock_id_cache = get_stock_id_cache()
+        return self._stock_id_cache
+
+    @property
+    def search_cache(self) -> SearchWindowCache:
+        """Immutable search window cache, opened on first use."""
+        if self._search_cache is None:
+            self._search_cache = get_search_window_cache()
+        return self._search_cache
+
+    @property
+    def announcement_index(self) -> AnnouncementIndex:
+        """Local announcement index, opened on first use."""
+        if self._announcement_index is None:
+            self._announcement_index = get_announcement_index()
+        return self._announcement_index
+
+    @property
+    def category_cache(self) -> CategoryCache:
+        """Category table cache, opened on first use."""
+        if self._category_cache is None:
+            self._category_cache = get_category_cache()
+        return self._category_cache
+
+    def _index_records(self, records: list[dict[str, Any]], stock_id: Any = None, latest: bool = False) -> None:
+        """Upsert fetched records into the local index; indexing never fails a request."""
+        try:
+            if latest:
+                self.announcement_index.upsert_latest(records)
+            else:
+                self.announcement_index.upsert(records, stock_id=stock_id)
+        except Exception:
+            logger.warning("Failed to index announcements", exc_info=True)
+
+    def _endpoint(self, url: str) -> str:
+        """Return the rate limiter endpoint name for a request URL."""
+        return self.ENDPOINTS.get(url.split("?", 1)[0].rsplit("/", 1)[-1], "other")
+
+    @staticmethod
+    def _flight_key(
+        url: str, params: dict[str, str] | None, headers: dict[str, str] | None
+    ) -> tuple[str, tuple[tuple[str, str], ...], tuple[tuple[str, str], ...]]:
+        """Normalize a GET into a single-flight key.
+
+        Query parameters are sorted and the "_" cache-buster is dropped, so
+        identical lookups issued milliseconds apart share one request.
+        """
+        request_url = httpx.URL(url, params=params)
+        query = tuple(sorted((k, v) for k, v in request_url.params.multi_items() if k != "_"))
+        return str(request_url.copy_with(query=None)), query, tuple(sorted((headers or {}).items()))
+
+    def rate_limit_stats(self) -> dict[str, dict[str, Any]]:
+        """Return current per-endpoint limits and observed latencies.
+
+        Returns:
+            Dictionary keyed by endpoint name ("prefix", "search", "latest", ...)
+            with rate, concurrency, in_flight, requests, overloads and latency_ms.
+        """
+        return self.rate_limiter.stats()
+
+    def resilience_stats(self) -> dict[str, dict[str, Any]]:
+        """Return circuit breaker state and retry counts.
+
+        Returns:
+            Dictionary keyed by endpoint name with state ("closed", "open" or
+            "half_open"), consecutive_failures, times_opened and retries.
+        """
+        return self.resilience.stats()
+
+    @staticmethod
+    def _error_entry(error: Exception) -> dict[str, Any]:
+        """Convert a failure into a compact, typed error entry for results."""
+        return classify_error(error).to_dict()
+
+    @staticmethod
+    def _status_error(response: httpx.Response, endpoint: str, attempt: int) -> HKEXHTTPStatusError | None:
+        """Return a typed error for an error status (304 Not Modified is not one)."""
+        if response.status_code < 400:
+            return None
+        return HKEXHTTPStatusError(
+            response.status_code, f"HTTP {response.status_code} from hkexnews", endpoint, attempt
+        )
+
+    def _retry_delay(self, endpoint: str, error: HKEXError, attempt: int, retry_after: float | None) -> float:
+        """Record a failed attempt and return the backoff before the next one.
+
+        Raises:
+            HKEXError: When the failure is not retryable or no attempts are left.
+        """
+        breaker = self.resilience.breaker(endpoint)
+        if not error.retryable:
+            # The server answered (e.g. 404): it is up, so the breaker stays closed
+            breaker.record_success()
+            raise error
+        breaker.record_failure()
+        if attempt >= self.resilience.retry.max_attempts:
+            raise error
+        breaker.record_retry()
+        logger.debug("Retrying %s after attempt %d: %s", endpoint, attempt, error)
+        return self.resilience.retry.backoff(attempt, retry_after)
+
     def _clean_html_entities(self, text: str) -> str:
         """Clean HTML entities and Unicode escapes from text.
 
@@ -41,24 +256,7 @@ class HKEXAPIService:
         Returns:
             Cleaned text.
         """
-        if not text:
-            return text
-
-        # HTML entities
-        text = text.replace("&lt;", "<")
-        text = text.replace("&gt;", ">")
-        text = text.replace("&amp;", "&")
-
-        # Unicode literal escapes
-        text = re.sub(r"\\u003c", "<", text)
-        text = re.sub(r"\\u003e", ">", text)
-        text = re.sub(r"\\u2013", "-", text)
-        text = text.replace("\\u0026", "-")
-
-        # Remove backslash escapes
-        text = text.replace("\\\\", "")
-
-        return text
+        return clean_text(text)
 
     def _parse_jsonp(self, response_text: str) -> dict[str, Any]:
         """Parse JSONP response.
@@ -73,48 +271,467 @@ class HKEXAPIService:
         match = re.search(r"callback\((.*)\)", response_text, re.DOTALL)
         if match:
             json_str = match.group(1)
-            return json.loads(json_str)
+            return loads(json_str)
         return {}
 
-    def _clean_result_data(self, result_data: str | list) -> list[dict[str, Any]]:
+    def _clean_result_data(
+        self, result_data: str | list, fields: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
         """Clean and parse result data from API response.
 
         Args:
             result_data: Raw result data (may be JSON string or list).
+            fields: Keys to keep per announcement (default: all).
 
         Returns:
             Cleaned list of announcement dictionaries.
         """
-        if not result_data:
-            return []
+        return decode_rows(result_data, fields)
+
+    def _stock_id_url(self, stock_code: str) -> str:
+        """Build the prefix.do JSONP lookup URL for a stock code."""
+        return (
+            f"{self.BASE_URL}/search/prefix.do?"
+            f"callback=callback&lang=ZH&type=A&name={stock_code}"
+            f"&market=SEHK&_={int(datetime.now().timestamp() * 1000)}"
+        )
+
+    def _parse_stock_id(self, response: httpx.Response) -> tuple[str | None, list[dict[str, Any]]]:
+        """Parse a prefix.do response into (stock_id, stock_info_list)."""
+        data = self._parse_jsonp(response.text)
+
+        stock_info = data.get("stockInfo", [])
+        if stock_info and len(stock_info) > 0:
+            stock_id = stock_info[0].get("stockId")
+            return stock_id, stock_info
+
+        return None, []
+
+    def _active_stock_url(self, market: str) -> str:
+        """Build the active-stock list URL for a market ("SEHK" or "GEM")."""
+        return f"{self.BASE_URL}/ncms/script/eds/{self.ACTIVE_STOCK_FILES[market]}"
+
+    def _parse_active_stocks(self, response: httpx.Response) -> list[tuple[str, Any, list[dict[str, Any]]]]:
+        """Parse an active-stock list into (stock_code, stock_id, stock_info) entries.
+
+        Each item has the shape {"c": stock code, "i": stock ID, "n": stock name}.
+        """
+        entries = []
+        for item in response.json():
+            stock_code, stock_id = item.get("c"), item.get("i")
+            if stock_code and stock_id is not None:
+                stock_info = [{"stockId": stock_id, "code": stock_code, "name": item.get("n", "")}]
+                entries.append((stock_code, stock_id, stock_info))
+        return entries
+
+    def _search_url(self) -> str:
+        """Build the titleSearchServlet.do URL."""
+        return f"{self.BASE_URL}/search/titleSearchServlet.do"
+
+    def _search_params(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None,
+        market: str,
+        document_type: int,
+        row_range: int,
+        lang: str,
+    ) -> dict[str, str]:
+        """Build titleSearchServlet.do query parameters."""
+        params = {
+            "sortDir": "0",
+            "sortByOptions": "DateTime",
+            "category": "0",
+            "market": market,
+            "stockId": stock_id,
+            "documentType": str(document_type),
+            "fromDate": from_date,
+            "toDate": to_date,
+            "searchType": "0",
+            "t1code": "-2",
+            "t2Gcode": "-2",
+            "t2code": "-2",
+            "rowRange": str(row_range),
+            "lang": lang,
+        }
+
+        if title:
+            params["title"] = title
 
-        # If it's a string, try to parse it
-        if isinstance(result_data, str):
-            # Remove JSON string escaping
-            result_data = result_data.strip()
-            if result_data.startswith('"[') and result_data.endswith(']"'):
-                result_data = result_data[1:-1]  # Remove outer quotes
-            if result_data.startswith("[") and result_data.endswith("]"):
+        return params
+
+    def _parse_search(
+        self, response: httpx.Response, fields: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Parse a titleSearchServlet.do response into cleaned announcements.
+
+        Args:
+            response: Servlet response.
+            fields: Keys to keep per announcement (default: all).
+        """
+        result_data = loads(response.content)
+        result = result_data.get("result", [])
+
+        # Clean and parse result data
+        return self._clean_result_data(result, fields)
+
+    def _plan_search(self, from_date: str, to_date: str) -> SearchPlan | None:
+        """Plan cached/open windows for a search, or None if the dates are not cacheable."""
+        try:
+            start, end = parse_search_date(from_date), parse_search_date(to_date)
+        except ValueError:
+            return None
+        if end < start:
+            return None
+        return plan_search_windows(start, end)
+
+    def _cached_windows(
+        self, stock_id: str, plan: SearchPlan, query: dict[str, Any]
+    ) -> dict[SearchWindow, list[dict[str, Any]]]:
+        """Look up the closed windows of a plan in the search cache."""
+        found = {}
+        for window in plan.closed:
+            cached = self.search_cache.get(self.search_cache.make_key(stock_id, window=window, **query))
+            if cached is None and query["title"] and query["document_type"] == -1:
+                cached = self._search_index(stock_id, window, query)
+            if cached is not None:
+                found[window] = cached
+        return found
+
+    def _search_index(
+        self, stock_id: str, window: SearchWindow, query: dict[str, Any]
+    ) -> list[dict[str, Any]] | None:
+        """Answer a titled window search from the local index if the window is fully indexed.
+
+        The remote title search is a literal (case-insensitive) substring
+        match, while index queries treat "|" and whitespace as operators, match
+        whole Latin words and fold Simplified/Traditional characters. The
+        window's records are therefore filtered with the remote's semantics
+        instead, so cached and uncached windows agree.
+        """
+        from_iso, to_iso = window.start.isoformat(), window.end.isoformat()
+        try:
+            if not self.announcement_index.covers(stock_id, query["market"], query["lang"], from_iso, to_iso):
+                return None
+            records = self.announcement_index.search(None, from_iso, to_iso, stock_id=stock_id, limit=None)
+        except Exception:
+            logger.warning("Failed to search the announcement index", exc_info=True)
+            return None
+        needle = query["title"].casefold()
+        matches = [record for record in records if needle in (record.get("TITLE") or "").casefold()]
+        return matches[:MAX_ROW_RANGE]
+
+    def _store_windows(
+        self,
+        stock_id: str,
+        results: dict[SearchWindow, list[dict[str, Any]]],
+        query: dict[str, Any],
+        truncated: list[SearchWindow],
+    ) -> None:
+        """Persist freshly fetched closed windows.
+
+        Args:
+            stock_id: Internal stock ID.
+            results: Announcements per closed month window.
+            query: Search filters (title, market, document_type, lang).
+            truncated: Single-day windows that still hit the row cap.
+        """
+        complete_listing = not query["title"] and query["document_type"] == -1
+        for window, announcements in results.items():
+            saturated = any(window.contains(day.start) for day in truncated)
+            self.search_cache.put(
+                self.search_cache.make_key(stock_id, window=window, **query),
+                announcements,
+                saturated=saturated,
+            )
+            if complete_listing and not saturated:
+                # Every announcement of the stock in this window is now indexed
                 try:
-                    result_data = json.loads(result_data)
-                except json.JSONDecodeError:
-                    return []
+                    self.announcement_index.mark_covered(
+                        stock_id, query["market"], query["lang"], window.start.isoformat(), window.end.isoformat()
+                    )
+                except Exception:
+                    logger.warning("Failed to record index coverage", exc_info=True)
 
-        if not isinstance(result_data, list):
-            return []
+    def _merge_windows(
+        self,
+        from_date: str,
+        to_date: str,
+        plan: SearchPlan,
+        closed: dict[SearchWindow, list[dict[str, Any]]],
+        tail: list[dict[str, Any]],
+        row_range: int,
+    ) -> list[dict[str, Any]]:
+        """Merge window results newest first, clipped to the requested range and row count."""
+        merged = list(tail)
+        for window in reversed(plan.closed):
+            merged.extend(closed[window])
+        merged = dedupe_by_news_id(merged)
+        return filter_by_range(merged, parse_search_date(from_date), parse_search_date(to_date))[:row_range]
+
+    def _missing_windows(self, plan: SearchPlan, closed: dict[SearchWindow, list[dict[str, Any]]]) -> list[SearchWindow]:
+        """Return the windows to fetch: uncached closed runs (one window each) plus the open tail."""
+        missing = [window for window in plan.closed if window not in closed]
+        windows = [SearchWindow(run[0].start, run[-1].end) for run in contiguous_runs(missing)]
+        if plan.tail is not None:
+            windows.append(plan.tail)
+        return windows
+
+    def _split_saturated(
+        self,
+        fetched: Iterable[tuple[SearchWindow, list[dict[str, Any]]]],
+        collected: dict[SearchWindow, list[dict[str, Any]]],
+        truncated: list[SearchWindow],
+    ) -> list[SearchWindow]:
+        """Keep complete window results and return narrower windows for saturated ones.
 
-        cleaned_results = []
-        for item in result_data:
-            if isinstance(item, dict):
-                cleaned_item = {}
-                for key, value in item.items():
-                    if isinstance(value, str):
-                        cleaned_item[key] = self._clean_html_entities(value)
-                    else:
-                        cleaned_item[key] = value
-                cleaned_results.append(cleaned_item)
+        Args:
+            fetched: (window, announcements) pairs from one round of requests.
+            collected: Complete results per window, updated in place.
+            truncated: Single-day windows that hit the row cap, updated in place.
 
-        return cleaned_results
+        Returns:
+            Sub-windows to fetch in the next round.
+        """
+        pending = []
+        for window, announcements in fetched:
+            if len(announcements) >= MAX_ROW_RANGE:
+                pieces = split_window(window)
+                if pieces:
+                    pending.extend(pieces)
+                    continue
+                logger.warning("Search window %s still hits the %d-row cap", window.from_date, MAX_ROW_RANGE)
+                truncated.append(window)
+            collected[window] = announcements
+        return pending
+
+    def _assemble_search(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        plan: SearchPlan,
+        closed: dict[SearchWindow, list[dict[str, Any]]],
+        fetched: list[dict[str, Any]],
+        truncated: list[SearchWindow],
+        query: dict[str, Any],
+        row_range: int,
+    ) -> list[dict[str, Any]]:
+        """Cache newly fetched closed months and merge them with cached ones and the tail."""
+        missing = [window for window in plan.closed if window not in closed]
+        buckets = bucket_by_window(fetched, missing + ([plan.tail] if plan.tail else []))
+        tail = buckets.pop(plan.tail, []) if plan.tail else []
+        if buckets:
+            self._store_windows(stock_id, buckets, query, truncated)
+            closed.update(buckets)
+        return self._merge_windows(from_date, to_date, plan, closed, tail, row_range)
+
+    @staticmethod
+    def _unique_codes(stock_codes: list[str]) -> list[str]:
+        """Strip blanks and repeated codes from a watchlist, keeping its order."""
+        return list(dict.fromkeys(code.strip() for code in stock_codes if code and code.strip()))
+
+    @staticmethod
+    def _batch_entry(
+        stock_code: str, stock_id: Any, stock_info: list[dict[str, Any]], announcements: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Build one per-stock row of a batch search, moving failures into "error"."""
+        entry = {"stock_code": stock_code, "stock_id": stock_id, "announcements": [], "error": None}
+        if stock_id is None:
+            entry["error"] = stock_info[0].get("error", "Stock not found") if stock_info else "Stock not found"
+        elif len(announcements) == 1 and "error" in announcements[0]:
+            entry["error"] = announcements[0]["error"]
+            entry["error_type"] = announcements[0].get("error_type")
+        else:
+            entry["announcements"] = announcements
+        return entry
+
+    @staticmethod
+    def _export_table(entries: list[dict[str, Any]], market: str, path: str | None) -> "columnar.pa.Table":
+        """Build (and optionally write) the Arrow table of a batch search.
+
+        Stocks that failed are listed in the schema metadata under
+        "failed_stock_codes" rather than aborting the export.
+        """
+        rows = [
+            {**item, "MARKET": item.get("MARKET") or market}
+            for entry in entries
+            for item in entry["announcements"]
+        ]
+        table = columnar.to_arrow(rows)
+        failed = ",".join(entry["stock_code"] for entry in entries if entry["error"])
+        table = table.replace_schema_metadata({**table.schema.metadata, "failed_stock_codes": failed})
+        if path:
+            columnar.write_parquet(table, path)
+        return table
+
+    def _latest_url(self) -> str:
+        """Build the latest-announcements feed URL."""
+        return f"{self.BASE_URL}/ncms/json/eds/lcisehk1relsdc_1.json"
+
+    def _filter_latest(
+        self,
+        news_list: list[dict[str, Any]],
+        market: str | None,
+        stock_code: str | None,
+        t1_code: str | None,
+        t2_code: str | None,
+        t2_group: set[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Apply market, stock code and category filters to latest-feed items.
+
+        ``t2_group`` holds the tier 2 codes of a tier 2 group filter, if any.
+        """
+        filtered_news = []
+        for item in news_list:
+            # Market filter
+            if market and item.get("market") != market:
+                continue
+
+            # Stock code filter
+            if stock_code:
+                stock_items = item.get("stock", [])
+                stock_codes = [s.get("sc", "") for s in stock_items]
+                if stock_code not in stock_codes:
+                    continue
+
+            # Category filters
+            if t1_code and item.get("t1Code") != t1_code:
+                if item.get("t1Code") != "NaN":
+                    continue
+
+            if t2_code and item.get("t2Code") != t2_code:
+                if item.get("t2Code") != "NaN":
+                    continue
+
+            if t2_group is not None and str(item.get("t2Code")) not in t2_group:
+                if item.get("t2Code") != "NaN":
+                    continue
+
+            filtered_news.append(item)
+
+        return filtered_news
+
+    def _category_type(self, category_type: str) -> str:
+        """Normalize a category type; unknown types fall back to "tierone"."""
+        return category_type if category_type in self.CATEGORY_FILES else "tierone"
+
+    def _category_url(self, category_type: str) -> str:
+        """Build the category JSON URL for a category type."""
+        return f"{self.BASE_URL}/ncms/script/eds/{self.CATEGORY_FILES[self._category_type(category_type)]}"
+
+    def _stale_categories(self, category_type: str, error: Exception) -> list[dict[str, Any]]:
+        """Fall back to an expired cached table when a refresh fails."""
+        stale = self.category_cache.get(category_type, allow_stale=True)
+        return stale if stale is not None else [self._error_entry(error)]
+
+    def _group_filter(self, index: CategoryIndex | None, t2g_code: str | None) -> set[str] | None:
+        """Resolve a tier 2 group filter into its tier 2 codes."""
+        if not t2g_code or index is None:
+            return None
+        return index.group_members.get(t2g_code, set())
+
+    def _parse_categories(self, response: httpx.Response) -> list[dict[str, Any]]:
+        """Parse a category JSON response."""
+        categories = response.json()
+        return categories if isinstance(categories, list) else []
+
+    def parse_date_time(self, date_time_str: str) -> tuple[str, str]:
+        """Parse date time string from API response.
+
+        Args:
+            date_time_str: Date time string in format "dd/mm/yyyy HH:MM".
+
+        Returns:
+            Tuple of (date_str in YYYY-MM-DD format, time_str in HH:MM format).
+        """
+        try:
+            # Parse "dd/mm/yyyy HH:MM" format
+            dt = datetime.strptime(date_time_str.split()[0], "%d/%m/%Y")
+            date_str = dt.strftime("%Y-%m-%d")
+            time_str = date_time_str.split()[1] if " " in date_time_str else ""
+            return date_str, time_str
+        except Exception:
+            return "", ""
+
+
+class HKEXAPIService(_HKEXAPIBase):
+    """Service for interacting with HKEX APIs."""
+
+    def _get(
+        self, url: str, params: dict[str, str] | None = None, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        """Issue a GET, sharing the response with identical requests already in flight.
+
+        Args:
+            url: Absolute request URL.
+            params: Optional query parameters.
+            headers: Extra request headers (e.g. conditional request validators).
+
+        Returns:
+            Response with a successful status code or 304 Not Modified.
+        """
+        return self.single_flight.do(
+            self._flight_key(url, params, headers), lambda: self._send(url, params, headers)
+        )
+
+    def _send(
+        self, url: str, params: dict[str, str] | None = None, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        """Issue a GET, retrying transient failures behind the endpoint's circuit breaker.
+
+        Args:
+            url: Absolute request URL.
+            params: Optional query parameters.
+            headers: Extra request headers (e.g. conditional request validators).
+
+        Returns:
+            Response with a successful status code or 304 Not Modified.
+
+        Raises:
+            HKEXError: Typed timeout, connection, HTTP status or circuit-open error.
+        """
+        endpoint = self._endpoint(url)
+        breaker = self.resilience.breaker(endpoint)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.allow()
+            retry_after = None
+            try:
+                response = self._send_once(endpoint, url, params, headers)
+            except Exception as e:
+                error = classify_error(e, endpoint, attempt)
+            except BaseException:
+                # Cancelled or interrupted: no verdict on the endpoint, but free a half-open trial
+                breaker.release_trial()
+                raise
+            else:
+                error = self._status_error(response, endpoint, attempt)
+                if error is None:
+                    breaker.record_success()
+                    return response
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            time.sleep(self._retry_delay(endpoint, error, attempt, retry_after))
+
+    def _send_once(
+        self, endpoint: str, url: str, params: dict[str, str] | None, headers: dict[str, str] | None
+    ) -> httpx.Response:
+        """Issue one GET on the shared pooled client, paced by the endpoint's rate limiter."""
+        client = self.client_manager.get_client()
+        limiter = self.rate_limiter.endpoint(endpoint)
+        started = limiter.acquire()
+        try:
+            response = client.get(
+                url, params=params, headers={**self.DEFAULT_HEADERS, **(headers or {})}, timeout=self.timeout
+            )
+        except BaseException as e:
+            limiter.release(started, error=e)
+            raise
+        limiter.release(started, response=response)
+        return response
 
     def get_stock_id(self, stock_code: str) -> tuple[str | None, list[dict[str, Any]]]:
         """Get stock ID from stock code.
@@ -125,33 +742,41 @@ class HKEXAPIService:
         Returns:
             Tuple of (stock_id, stock_info_list). stock_id is None if not found.
         """
-        url = (
-            f"{self.BASE_URL}/search/prefix.do?"
-            f"callback=callback&lang=ZH&type=A&name={stock_code}"
-            f"&market=SEHK&_={int(datetime.now().timestamp() * 1000)}"
-        )
+        cached = self.stock_id_cache.get(stock_code)
+        if cached is not None:
+            return cached
 
         try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url)
-                response.raise_for_status()
+            response = self._get(self._stock_id_url(stock_code))
+            stock_id, stock_info = self._parse_stock_id(response)
+            if stock_id is not None:
+                self.stock_id_cache.put(stock_code, stock_id, stock_info)
+            return stock_id, stock_info
 
-                # Parse JSONP response
-                data = self._parse_jsonp(response.text)
+        except Exception as e:
+            return None, [self._error_entry(e)]
 
-                stock_info = data.get("stockInfo", [])
-                if stock_info and len(stock_info) > 0:
-                    stock_id = stock_info[0].get("stockId")
-                    return stock_id, stock_info
+    def preload_stock_ids(self, markets: tuple[str, ...] = ("SEHK", "GEM")) -> dict[str, Any]:
+        """Bulk-load every listed stock into the stock ID cache.
 
-                return None, []
+        After a preload, ``get_stock_id`` resolves whole watchlists locally
+        without any prefix.do round-trips.
 
-        except Exception as e:
-            return None, [{"error": str(e)}]
+        Args:
+            markets: Markets to load (default: SEHK and GEM).
+
+        Returns:
+            Dictionary with the number of loaded entries per market and any errors.
+        """
+        loaded: dict[str, int] = {}
+        errors: dict[str, str] = {}
+        for market in markets:
+            try:
+                response = self._get(self._active_stock_url(market))
+                loaded[market] = self.stock_id_cache.put_many(self._parse_active_stocks(response))
+            except Exception as e:
+                errors[market] = str(e)
+        return {"loaded": loaded, "errors": errors}
 
     def search_announcements(
         self,
@@ -166,6 +791,13 @@ class HKEXAPIService:
     ) -> tuple[str, list[dict[str, Any]]]:
         """Search announcements for a stock.
 
+        The range is split into calendar-month windows. Months that ended before
+        the current one (Hong Kong time) can no longer change and are served from the
+        search cache; only the open current-month tail is refetched. Missing
+        windows are fetched in parallel (``search_concurrency``), and any window
+        that hits the 500-row cap is narrowed and refetched, so results are
+        complete even for busy issuers over multi-year ranges.
+
         Args:
             stock_id: Internal stock ID from get_stock_id().
             from_date: Start date in YYYYMMDD format (e.g., "20250101").
@@ -173,53 +805,147 @@ class HKEXAPIService:
             title: Search keyword in title (optional).
             market: Market code (default: "SEHK").
             document_type: Document type code (default: -1 for all).
-            row_range: Number of results (1-500, default: 100).
+            row_range: Maximum number of results, newest first (default: 100; may exceed 500).
             lang: Language code (default: "zh").
 
         Returns:
             Tuple of (stock_id, list of announcement dictionaries).
         """
-        params = {
-            "sortDir": "0",
-            "sortByOptions": "DateTime",
-            "category": "0",
-            "market": market,
-            "stockId": stock_id,
-            "documentType": str(document_type),
-            "fromDate": from_date,
-            "toDate": to_date,
-            "searchType": "0",
-            "t1code": "-2",
-            "t2Gcode": "-2",
-            "t2code": "-2",
-            "rowRange": str(row_range),
-            "lang": lang,
-        }
+        query = {"title": title, "market": market, "document_type": document_type, "lang": lang}
 
-        if title:
-            params["title"] = title
+        try:
+            plan = self._plan_search(from_date, to_date)
+            if plan is None:
+                return stock_id, self._fetch_search(
+                    stock_id, from_date, to_date, row_range=min(row_range, MAX_ROW_RANGE), **query
+                )
+
+            closed = self._cached_windows(stock_id, plan, query)
+            fetched, truncated = self._fetch_windows(stock_id, self._missing_windows(plan, closed), query)
+            return stock_id, self._assemble_search(
+                stock_id, from_date, to_date, plan, closed, fetched, truncated, query, row_range
+            )
 
-        url = f"{self.BASE_URL}/search/titleSearchServlet.do"
+        except Exception as e:
+            return stock_id, [self._error_entry(e)]
 
-        try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url, params=params)
-                response.raise_for_status()
+    def search_announcements_batch(
+        self,
+        stock_codes: list[str],
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        row_range: int = 100,
+        concurrency: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Resolve and search many stocks concurrently.
+
+        Args:
+            stock_codes: 5-digit stock codes; blanks and repeats are dropped.
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            row_range: Maximum number of results per stock (default: 100).
+            concurrency: Stocks searched in parallel (default: ``batch_concurrency``).
 
-                result_data = response.json()
-                result = result_data.get("result", [])
+        Returns:
+            One dictionary per stock, in input order, with stock_code, stock_id,
+            announcements and error (None on success).
+        """
 
-                # Clean and parse result data
-                announcements = self._clean_result_data(result)
+        def search(stock_code: str) -> dict[str, Any]:
+            stock_id, stock_info = self.get_stock_id(stock_code)
+            announcements = []
+            if stock_id is not None:
+                _, announcements = self.search_announcements(
+                    stock_id, from_date, to_date, title=title, market=market, row_range=row_range
+                )
+            return self._batch_entry(stock_code, stock_id, stock_info, announcements)
+
+        stock_codes = self._unique_codes(stock_codes)
+        if not stock_codes:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, concurrency or self.batch_concurrency)) as pool:
+            return list(pool.map(search, stock_codes))
 
-                return stock_id, announcements
+    def export_announcements(
+        self,
+        stock_codes: list[str],
+        from_date: str,
+        to_date: str,
+        path: str | None = None,
+        title: str | None = None,
+        market: str = "SEHK",
+        row_range: int = EXPORT_ROW_RANGE,
+    ) -> "columnar.pa.Table":
+        """Search many stocks and return the results as an Arrow table (requires pyarrow).
 
-        except Exception as e:
-            return stock_id, [{"error": str(e)}]
+        Args:
+            stock_codes: 5-digit stock codes.
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            path: Also write the table to this Parquet file (optional).
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            row_range: Maximum number of results per stock.
+
+        Returns:
+            Table with ``columnar.announcement_schema()``; stocks that failed are
+            listed in the "failed_stock_codes" schema metadata.
+        """
+        columnar.require_pyarrow()
+        entries = self.search_announcements_batch(
+            stock_codes, from_date, to_date, title=title, market=market, row_range=row_range
+        )
+        return self._export_table(entries, market, path)
+
+    def _fetch_search(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None,
+        market: str,
+        document_type: int,
+        row_range: int,
+        lang: str,
+    ) -> list[dict[str, Any]]:
+        """Run one titleSearchServlet.do query (raises on failure)."""
+        params = self._search_params(
+            stock_id, from_date, to_date, title, market, document_type, row_range, lang
+        )
+        response = self._get(self._search_url(), params=params)
+        announcements = self._parse_search(response)
+        self._index_records(announcements, stock_id=stock_id)
+        return announcements
+
+    def _fetch_windows(
+        self, stock_id: str, windows: list[SearchWindow], query: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], list[SearchWindow]]:
+        """Fetch windows in parallel, narrowing any window that hits the row cap.
+
+        Args:
+            stock_id: Internal stock ID.
+            windows: Disjoint windows to fetch.
+            query: Search filters (title, market, document_type, lang).
+
+        Returns:
+            Tuple of (merged announcements newest first, single-day windows still at the cap).
+        """
+        collected: dict[SearchWindow, list[dict[str, Any]]] = {}
+        truncated: list[SearchWindow] = []
+        pending = windows
+
+        def fetch(window: SearchWindow) -> list[dict[str, Any]]:
+            return self._fetch_search(stock_id, window.from_date, window.to_date, row_range=MAX_ROW_RANGE, **query)
+
+        with ThreadPoolExecutor(max_workers=self.search_concurrency) as pool:
+            while pending:
+                fetched = list(pool.map(fetch, pending))
+                pending = self._split_saturated(zip(pending, fetched), collected, truncated)
+        return merge_window_results(collected), truncated
 
     def get_latest_announcements(
         self,
@@ -227,6 +953,7 @@ class HKEXAPIService:
         stock_code: str | None = None,
         t1_code: str | None = None,
         t2_code: str | None = None,
+        t2g_code: str | None = None,
     ) -> list[dict[str, Any]]:
         """Get latest announcements from HKEX.
 
@@ -235,105 +962,536 @@ class HKEXAPIService:
             stock_code: Filter by stock code (optional).
             t1_code: Filter by tier 1 category code (optional).
             t2_code: Filter by tier 2 category code (optional).
+            t2g_code: Filter by tier 2 group code, resolved locally from the category tables (optional).
 
         Returns:
             List of announcement dictionaries.
         """
-        url = f"{self.BASE_URL}/ncms/json/eds/lcisehk1relsdc_1.json"
+        try:
+            index = self.get_category_index() if t2g_code else None
+            self._refresh_latest()
+            return self._filter_latest(
+                self.latest_feed.items, market, stock_code, t1_code, t2_code, self._group_filter(index, t2g_code)
+            )
+
+        except Exception as e:
+            return [self._error_entry(e)]
+
+    def poll_latest_announcements(
+        self,
+        since: str | None = None,
+        market: str | None = None,
+        stock_code: str | None = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+        t2g_code: str | None = None,
+    ) -> dict[str, Any]:
+        """Poll the latest-announcements feed for items newer than a cursor.
+
+        Uses a conditional request, so polling an unchanged feed every few
+        seconds costs a bodiless 304 and no JSON parsing.
 
+        Args:
+            since: Cursor from a previous poll (None returns the whole feed).
+            market: Filter by market (SEHK/GEM, optional).
+            stock_code: Filter by stock code (optional).
+            t1_code: Filter by tier 1 category code (optional).
+            t2_code: Filter by tier 2 category code (optional).
+            t2g_code: Filter by tier 2 group code, resolved locally from the category tables (optional).
+
+        Returns:
+            Dictionary with the new "announcements", the next "cursor" and
+            "modified" (whether the feed changed on this poll).
+        """
         try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url)
-                response.raise_for_status()
-
-                data = response.json()
-                news_list = data.get("newsInfoLst", [])
-
-                # Apply filters
-                filtered_news = []
-                for item in news_list:
-                    # Market filter
-                    if market and item.get("market") != market:
-                        continue
-
-                    # Stock code filter
-                    if stock_code:
-                        stock_items = item.get("stock", [])
-                        stock_codes = [s.get("sc", "") for s in stock_items]
-                        if stock_code not in stock_codes:
-                            continue
-
-                    # Category filters
-                    if t1_code and item.get("t1Code") != t1_code:
-                        if item.get("t1Code") != "NaN":
-                            continue
-
-                    if t2_code and item.get("t2Code") != t2_code:
-                        if item.get("t2Code") != "NaN":
-                            continue
-
-                    filtered_news.append(item)
-
-                return filtered_news
+            index = self.get_category_index() if t2g_code else None
+            modified = self._refresh_latest()
+            new_items, cursor = self.latest_feed.since(since)
+            group = self._group_filter(index, t2g_code)
+            return {
+                "announcements": self._filter_latest(new_items, market, stock_code, t1_code, t2_code, group),
+                "cursor": cursor,
+                "modified": modified,
+            }
 
         except Exception as e:
-            return [{"error": str(e)}]
+            return {"announcements": [self._error_entry(e)], "cursor": since, "modified": False}
+
+    def _refresh_latest(self) -> bool:
+        """Refresh the feed snapshot with a conditional request."""
+        # no-cache: without validators of its own, the first poll revalidates any HTTP-cached copy
+        headers = {"Cache-Control": "no-cache", **self.latest_feed.conditional_headers()}
+        response = self._get(self._latest_url(), headers=headers)
+        modified = self.latest_feed.update(response)
+        if modified:
+            self._index_records(self.latest_feed.items, latest=True)
+        return modified
 
     def get_categories(
         self, category_type: str = "tierone"
     ) -> list[dict[str, Any]]:
         """Get category data from HKEX.
 
+        Tables are memoized in the category cache and refetched only after the
+        refresh interval; an expired table is still served if the refresh fails.
+        A failed fetch is not retried for ``CategoryCache.failure_seconds``.
+
         Args:
             category_type: Category type - "doc", "tierone", "tiertwo", "tiertwogrp".
 
         Returns:
             List of category dictionaries.
         """
-        category_files = {
-            "doc": "doc_c.json",
-            "tierone": "tierone_c.json",
-            "tiertwo": "tiertwo_c.json",
-            "tiertwogrp": "tiertwogrp_c.json",
-        }
+        category_type = self._category_type(category_type)
+        cached = self.category_cache.get(category_type)
+        if cached is not None:
+            return cached
+        if (error := self.category_cache.recent_failure(category_type)) is not None:
+            # Failed moments ago: do not pay the retry cycle again
+            return self._stale_categories(category_type, error)
+
+        try:
+            response = self._get(self._category_url(category_type))
+            categories = self._parse_categories(response)
+            if categories:
+                self.category_cache.put(category_type, categories)
+            return categories
+
+        except Exception as e:
+            self.category_cache.record_failure(category_type, e)
+            return self._stale_categories(category_type, e)
+
+    def get_category_index(self) -> CategoryIndex:
+        """Return code/name lookups over the tier 1, tier 2 and tier 2 group tables.
+
+        Loads (or refreshes) the tables on first use; later calls are dict lookups.
+
+        Returns:
+            The category index (possibly partial if a table could not be fetched).
+        """
+        for category_type in INDEXED_CATEGORY_TYPES:
+            self.get_categories(category_type)
+        return self.category_cache.index()
+
+
+class AsyncHKEXAPIService(_HKEXAPIBase):
+    """Asyncio variant of HKEXAPIService.
+
+    Exposes the same endpoints as coroutines on the shared ``httpx.AsyncClient``,
+    so concurrent tool calls and subagents overlap their network I/O instead
+    of blocking worker threads.
+    """
+
+    async def _get(
+        self, url: str, params: dict[str, str] | None = None, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        """Issue a GET, sharing the response with identical requests already in flight.
+
+        Args:
+            url: Absolute request URL.
+            params: Optional query parameters.
+            headers: Extra request headers (e.g. conditional request validators).
+
+        Returns:
+            Response with a successful status code or 304 Not Modified.
+        """
+        return await self.single_flight.ado(
+            self._flight_key(url, params, headers), lambda: self._send(url, params, headers)
+        )
+
+    async def _send(
+        self, url: str, params: dict[str, str] | None = None, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        """Issue a GET, retrying transient failures behind the endpoint's circuit breaker.
+
+        Args:
+            url: Absolute request URL.
+            params: Optional query parameters.
+            headers: Extra request headers (e.g. conditional request validators).
 
-        filename = category_files.get(category_type, "tierone_c.json")
-        url = f"{self.BASE_URL}/ncms/script/eds/{filename}"
+        Returns:
+            Response with a successful status code or 304 Not Modified.
 
+        Raises:
+            HKEXError: Typed timeout, connection, HTTP status or circuit-open error.
+        """
+        endpoint = self._endpoint(url)
+        breaker = self.resilience.breaker(endpoint)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.allow()
+            retry_after = None
+            try:
+                response = await self._send_once(endpoint, url, params, headers)
+            except Exception as e:
+                error = classify_error(e, endpoint, attempt)
+            except BaseException:
+                # Cancelled or interrupted: no verdict on the endpoint, but free a half-open trial
+                breaker.release_trial()
+                raise
+            else:
+                error = self._status_error(response, endpoint, attempt)
+                if error is None:
+                    breaker.record_success()
+                    return response
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            await asyncio.sleep(self._retry_delay(endpoint, error, attempt, retry_after))
+
+    async def _send_once(
+        self, endpoint: str, url: str, params: dict[str, str] | None, headers: dict[str, str] | None
+    ) -> httpx.Response:
+        """Issue one GET on the shared pooled async client, paced by the endpoint's rate limiter."""
+        client = self.client_manager.get_async_client()
+        limiter = self.rate_limiter.endpoint(endpoint)
+        started = await limiter.acquire_async()
         try:
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(url)
-                response.raise_for_status()
+            response = await client.get(
+                url, params=params, headers={**self.DEFAULT_HEADERS, **(headers or {})}, timeout=self.timeout
+            )
+        except BaseException as e:
+            limiter.release(started, error=e)
+            raise
+        limiter.release(started, response=response)
+        return response
+
+    async def get_stock_id(self, stock_code: str) -> tuple[str | None, list[dict[str, Any]]]:
+        """Get stock ID from stock code.
 
-                categories = response.json()
-                return categories if isinstance(categories, list) else []
+        Args:
+            stock_code: 5-digit stock code (e.g., "00673").
+
+        Returns:
+            Tuple of (stock_id, stock_info_list). stock_id is None if not found.
+        """
+        cached = self.stock_id_cache.get(stock_code)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self._get(self._stock_id_url(stock_code))
+            stock_id, stock_info = self._parse_stock_id(response)
+            if stock_id is not None:
+                self.stock_id_cache.put(stock_code, stock_id, stock_info)
+            return stock_id, stock_info
 
         except Exception as e:
-            return [{"error": str(e)}]
+            return None, [self._error_entry(e)]
 
-    def parse_date_time(self, date_time_str: str) -> tuple[str, str]:
-        """Parse date time string from API response.
+    async def preload_stock_ids(self, markets: tuple[str, ...] = ("SEHK", "GEM")) -> dict[str, Any]:
+        """Bulk-load every listed stock into the stock ID cache.
 
         Args:
-            date_time_str: Date time string in format "dd/mm/yyyy HH:MM".
+            markets: Markets to load (default: SEHK and GEM).
 
         Returns:
-            Tuple of (date_str in YYYY-MM-DD format, time_str in HH:MM format).
+            Dictionary with the number of loaded entries per market and any errors.
         """
+        loaded: dict[str, int] = {}
+        errors: dict[str, str] = {}
+        for market in markets:
+            try:
+                response = await self._get(self._active_stock_url(market))
+                loaded[market] = self.stock_id_cache.put_many(self._parse_active_stocks(response))
+            except Exception as e:
+                errors[market] = str(e)
+        return {"loaded": loaded, "errors": errors}
+
+    async def search_announcements(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        document_type: int = -1,
+        row_range: int = 100,
+        lang: str = "zh",
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """Search announcements for a stock.
+
+        The range is split into calendar-month windows. Months that ended before
+        the current one (Hong Kong time) can no longer change and are served from the
+        search cache; only the open current-month tail is refetched. Missing
+        windows are fetched in parallel (``search_concurrency``), and any window
+        that hits the 500-row cap is narrowed and refetched, so results are
+        complete even for busy issuers over multi-year ranges.
+
+        Args:
+            stock_id: Internal stock ID from get_stock_id().
+            from_date: Start date in YYYYMMDD format (e.g., "20250101").
+            to_date: End date in YYYYMMDD format (e.g., "20251008").
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            document_type: Document type code (default: -1 for all).
+            row_range: Maximum number of results, newest first (default: 100; may exceed 500).
+            lang: Language code (default: "zh").
+
+        Returns:
+            Tuple of (stock_id, list of announcement dictionaries).
+        """
+        query = {"title": title, "market": market, "document_type": document_type, "lang": lang}
+
         try:
-            # Parse "dd/mm/yyyy HH:MM" format
-            dt = datetime.strptime(date_time_str.split()[0], "%d/%m/%Y")
-            date_str = dt.strftime("%Y-%m-%d")
-            time_str = date_time_str.split()[1] if " " in date_time_str else ""
-            return date_str, time_str
-        except Exception:
-            return "", ""
+            plan = self._plan_search(from_date, to_date)
+            if plan is None:
+                return stock_id, await self._fetch_search(
+                    stock_id, from_date, to_date, row_range=min(row_range, MAX_ROW_RANGE), **query
+                )
+
+            # Search cache and index lookups are SQLite reads: run them off the event loop
+            closed = await asyncio.to_thread(self._cached_windows, stock_id, plan, query)
+            fetched, truncated = await self._fetch_windows(stock_id, self._missing_windows(plan, closed), query)
+            # Stores the fetched windows in the search cache (SQLite writes)
+            return stock_id, await asyncio.to_thread(
+                self._assemble_search, stock_id, from_date, to_date, plan, closed, fetched, truncated, query, row_range
+            )
 
+        except Exception as e:
+            return stock_id, [self._error_entry(e)]
+
+    async def search_announcements_batch(
+        self,
+        stock_codes: list[str],
+        from_date: str,
+        to_date: str,
+        title: str | None = None,
+        market: str = "SEHK",
+        row_range: int = 100,
+        concurrency: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Resolve and search many stocks concurrently.
+
+        Args:
+            stock_codes: 5-digit stock codes; blanks and repeats are dropped.
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            row_range: Maximum number of results per stock (default: 100).
+            concurrency: Stocks searched in parallel (default: ``batch_concurrency``).
+
+        Returns:
+            One dictionary per stock, in input order, with stock_code, stock_id,
+            announcements and error (None on success).
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.batch_concurrency))
+
+        async def search(stock_code: str) -> dict[str, Any]:
+            async with semaphore:
+                stock_id, stock_info = await self.get_stock_id(stock_code)
+                announcements = []
+                if stock_id is not None:
+                    _, announcements = await self.search_announcements(
+                        stock_id, from_date, to_date, title=title, market=market, row_range=row_range
+                    )
+            return self._batch_entry(stock_code, stock_id, stock_info, announcements)
+
+        return list(await asyncio.gather(*(search(code) for code in self._unique_codes(stock_codes))))
+
+    async def export_announcements(
+        self,
+        stock_codes: list[str],
+        from_date: str,
+        to_date: str,
+        path: str | None = None,
+        title: str | None = None,
+        market: str = "SEHK",
+        row_range: int = EXPORT_ROW_RANGE,
+    ) -> "columnar.pa.Table":
+        """Search many stocks and return the results as an Arrow table (requires pyarrow).
+
+        Args:
+            stock_codes: 5-digit stock codes.
+            from_date: Start date in YYYYMMDD format.
+            to_date: End date in YYYYMMDD format.
+            path: Also write the table to this Parquet file (optional).
+            title: Search keyword in title (optional).
+            market: Market code (default: "SEHK").
+            row_range: Maximum number of results per stock.
+
+        Returns:
+            Table with ``columnar.announcement_schema()``; stocks that failed are
+            listed in the "failed_stock_codes" schema metadata.
+        """
+        columnar.require_pyarrow()
+        entries = await self.search_announcements_batch(
+            stock_codes, from_date, to_date, title=title, market=market, row_range=row_range
+        )
+        return self._export_table(entries, market, path)
+
+    async def _fetch_search(
+        self,
+        stock_id: str,
+        from_date: str,
+        to_date: str,
+        title: str | None,
+        market: str,
+        document_type: int,
+        row_range: int,
+        lang: str,
+    ) -> list[dict[str, Any]]:
+        """Run one titleSearchServlet.do query (raises on failure)."""
+        params = self._search_params(
+            stock_id, from_date, to_date, title, market, document_type, row_range, lang
+        )
+        response = await self._get(self._search_url(), params=params)
+        announcements = self._parse_search(response)
+        # SQLite writes stay off the event loop
+        await asyncio.to_thread(self._index_records, announcements, stock_id=stock_id)
+        return announcements
+
+    async def _fetch_windows(
+        self, stock_id: str, windows: list[SearchWindow], query: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], list[SearchWindow]]:
+        """Fetch windows concurrently, narrowing any window that hits the row cap.
+
+        Args:
+            stock_id: Internal stock ID.
+            windows: Disjoint windows to fetch.
+            query: Search filters (title, market, document_type, lang).
+
+        Returns:
+            Tuple of (merged announcements newest first, single-day windows still at the cap).
+        """
+        collected: dict[SearchWindow, list[dict[str, Any]]] = {}
+        truncated: list[SearchWindow] = []
+        semaphore = asyncio.Semaphore(self.search_concurrency)
+
+        async def fetch(window: SearchWindow) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self._fetch_search(
+                    stock_id, window.from_date, window.to_date, row_range=MAX_ROW_RANGE, **query
+                )
+
+        pending = windows
+        while pending:
+            fetched = await asyncio.gather(*(fetch(window) for window in pending))
+            pending = self._split_saturated(zip(pending, fetched), collected, truncated)
+        return merge_window_results(collected), truncated
+
+    async def get_latest_announcements(
+        self,
+        market: str | None = None,
+        stock_code: str | None = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+        t2g_code: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get latest announcements from HKEX.
+
+        Args:
+            market: Filter by market (SEHK/GEM, optional).
+            stock_code: Filter by stock code (optional).
+            t1_code: Filter by tier 1 category code (optional).
+            t2_code: Filter by tier 2 category code (optional).
+            t2g_code: Filter by tier 2 group code, resolved locally from the category tables (optional).
+
+        Returns:
+            List of announcement dictionaries.
+        """
+        try:
+            index = await self.get_category_index() if t2g_code else None
+            await self._refresh_latest()
+            return self._filter_latest(
+                self.latest_feed.items, market, stock_code, t1_code, t2_code, self._group_filter(index, t2g_code)
+            )
+
+        except Exception as e:
+            return [self._error_entry(e)]
+
+    async def poll_latest_announcements(
+        self,
+        since: str | None = None,
+        market: str | None = None,
+        stock_code: str | None = None,
+        t1_code: str | None = None,
+        t2_code: str | None = None,
+        t2g_code: str | None = None,
+    ) -> dict[str, Any]:
+        """Poll the latest-announcements feed for items newer than a cursor.
+
+        Uses a conditional request, so polling an unchanged feed every few
+        seconds costs a bodiless 304 and no JSON parsing.
+
+        Args:
+            since: Cursor from a previous poll (None returns the whole feed).
+            market: Filter by market (SEHK/GEM, optional).
+            stock_code: Filter by stock code (optional).
+            t1_code: Filter by tier 1 category code (optional).
+            t2_code: Filter by tier 2 category code (optional).
+            t2g_code: Filter by tier 2 group code, resolved locally from the category tables (optional).
+
+        Returns:
+            Dictionary with the new "announcements", the next "cursor" and
+            "modified" (whether the feed changed on this poll).
+        """
+        try:
+            index = await self.get_category_index() if t2g_code else None
+            modified = await self._refresh_latest()
+            new_items, cursor = self.latest_feed.since(since)
+            group = self._group_filter(index, t2g_code)
+            return {
+                "announcements": self._filter_latest(new_items, market, stock_code, t1_code, t2_code, group),
+                "cursor": cursor,
+                "modified": modified,
+            }
+
+        except Exception as e:
+            return {"announcements": [self._error_entry(e)], "cursor": since, "modified": False}
+
+    async def _refresh_latest(self) -> bool:
+        """Refresh the feed snapshot with a conditional request."""
+        # no-cache: without validators of its own, the first poll revalidates any HTTP-cached copy
+        headers = {"Cache-Control": "no-cache", **self.latest_feed.conditional_headers()}
+        response = await self._get(self._latest_url(), headers=headers)
+        modified = self.latest_feed.update(response)
+        if modified:
+            await asyncio.to_thread(self._index_records, self.latest_feed.items, latest=True)
+        return modified
+
+    async def get_categories(
+        self, category_type: str = "tierone"
+    ) -> list[dict[str, Any]]:
+        """Get category data from HKEX.
+
+        Tables are memoized in the category cache and refetched only after the
+        refresh interval; an expired table is still served if the refresh fails.
+        A failed fetch is not retried for ``CategoryCache.failure_seconds``.
+
+        Args:
+            category_type: Category type - "doc", "tierone", "tiertwo", "tiertwogrp".
+
+        Returns:
+            List of category dictionaries.
+        """
+        category_type = self._category_type(category_type)
+        cached = self.category_cache.get(category_type)
+        if cached is not None:
+            return cached
+        if (error := self.category_cache.recent_failure(category_type)) is not None:
+            # Failed moments ago: do not pay the retry cycle again
+            return self._stale_categories(category_type, error)
+
+        try:
+            response = await self._get(self._category_url(category_type))
+            categories = self._parse_categories(response)
+            if categories:
+                self.category_cache.put(category_type, categories)
+            return categories
+
+        except Exception as e:
+            self.category_cache.record_failure(category_type, e)
+            return self._stale_categories(category_type, e)
+
+    async def get_category_index(self) -> CategoryIndex:
+        """Return code/name lookups over the tier 1, tier 2 and tier 2 group tables.
+
+        Loads (or refreshes) the tables on first use; later calls are dict lookups.
+
+        Returns:
+            The category index (possibly partial if a table could not be fetched).
+        """
+        for category_type in INDEXED_CATEGORY_TYPES:
+            await self.get_categories(category_type)
+        return self.category_cache.index()
@@ -0,0 +1,483 @@
+"""RFC 9111 disk cache as an httpx transport.
+
+Category JSON, the latest feed, PDFs and other static hkexnews resources used
+to be downloaded in full on every fetch. ``CachingTransport`` (and
+``AsyncCachingTransport``) wrap the pooled transport of ``HTTPClientManager``
+and keep GET responses on disk:
+
+- Fresh responses (``Cache-Control: max-age``, ``Expires``, or heuristic
+  freshness of 10% of the ``Last-Modified`` age for URLs without a query) are
+  served without a request.
+- Stale responses with an ``ETag`` or ``Last-Modified`` are revalidated with
+  a conditional request, so an unchanged resource costs a bodiless 304.
+- The cache is bounded in bytes and evicts least recently used entries.
+
+Requests that carry their own validators (``If-None-Match`` /
+``If-Modified-Since``) bypass the cache, so callers that already do
+conditional requests keep seeing their 304s. Metadata lives in SQLite and
+bodies in files next to it. Served responses carry
+``response.extensions["cache_status"]`` ("HIT", "REVALIDATED" or "MISS").
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_HEURISTIC_MAX_SECONDS = 24 * 60 * 60
+
+# Status codes stored by the cache (RFC 9110 "heuristically cacheable" ones the service sees)
+_CACHEABLE_STATUS = frozenset({200, 203, 301, 308, 404, 410})
+
+# Headers a 304 must not overwrite in the stored response
+_NOT_UPDATED = frozenset({"content-length", "content-encoding", "transfer-encoding", "content-range"})
+
+
+def _directives(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into {directive: argument}."""
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _seconds(directives: dict[str, str | None], name: str) -> float | None:
+    try:
+        return float(directives[name])  # type: ignore[arg-type]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CacheEntry:
+    """A stored response and the times it was requested and received."""
+
+    key: str
+    status: int
+    headers: list[tuple[str, str]]
+    vary: dict[str, str | None]
+    request_time: float
+    response_time: float
+    size: int
+
+    def header(self, name: str) -> str | None:
+        return httpx.Headers(self.headers).get(name)
+
+    def validators(self) -> dict[str, str]:
+        """Return the conditional request headers for revalidation."""
+        validators = {}
+        if etag := self.header("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := self.header("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+    def current_age(self, now: float) -> float:
+        """Return the age of the response (RFC 9111 section 4.2.3)."""
+        date_value = _http_date(self.header("Date")) or self.response_time
+        try:
+            age_value = float(self.header("Age") or 0)
+        except ValueError:
+            age_value = 0.0
+        apparent_age = max(0.0, self.response_time - date_value)
+        corrected_age = age_value + (self.response_time - self.request_time)
+        return max(apparent_age, corrected_age) + (now - self.response_time)
+
+    def freshness_lifetime(self, url: httpx.URL, heuristic_max: float) -> float:
+        """Return how long the response stays fresh (RFC 9111 section 4.2.1)."""
+        directives = _directives(self.header("Cache-Control"))
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _seconds(directives, "max-age")
+        if max_age is not None:
+            return max_age
+        date_value = _http_date(self.header("Date")) or self.response_time
+        if expires := self.header("Expires"):
+            expires_at = _http_date(expires)
+            return max(0.0, expires_at - date_value) if expires_at is not None else 0.0
+        last_modified = _http_date(self.header("Last-Modified"))
+        if last_modified is not None and not url.query:
+            return min(max(0.0, date_value - last_modified) / 10, heuristic_max)
+        return 0.0
+
+
+class HTTPCache:
+    """Size-bounded LRU store of HTTP responses (SQLite metadata, file bodies).
+
+    环境变量:
+        HKEX_HTTP_CACHE: 启用 HTTP 响应磁盘缓存（默认 true）
+        HKEX_HTTP_CACHE_MAX_MB: 缓存大小上限，MB（默认 256）
+        HKEX_HTTP_CACHE_HEURISTIC_MAX: 启发式新鲜度上限，秒（默认 86400）
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        heuristic_max_seconds: float = DEFAULT_HEURISTIC_MAX_SECONDS,
+    ):
+        """Open (and create if needed) the cache.
+
+        Args:
+            cache_dir: Directory holding the index database and bodies.
+            max_bytes: Total body size kept before least recently used entries are evicted.
+            heuristic_max_seconds: Cap on heuristic freshness.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.bodies_dir = self.cache_dir / "bodies"
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.heuristic_max_seconds = heuristic_max_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "http_cache.sqlite3"), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                vary TEXT NOT NULL,
+                request_time REAL NOT NULL,
+                response_time REAL NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+            """
+        )
+        self._conn.commit()
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, cache_dir: str | Path) -> "HTTPCache | None":
+        """Build a cache from ``HKEX_HTTP_CACHE*`` variables (None when disabled)."""
+        if os.getenv("HKEX_HTTP_CACHE", "true").lower() not in ("true", "1", "yes"):
+            return None
+        max_mb = os.getenv("HKEX_HTTP_CACHE_MAX_MB")
+        heuristic_max = os.getenv("HKEX_HTTP_CACHE_HEURISTIC_MAX")
+        return cls(
+            cache_dir,
+            max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES,
+            heuristic_max_seconds=float(heuristic_max) if heuristic_max else DEFAULT_HEURISTIC_MAX_SECONDS,
+        )
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        return f"{request.method} {request.url}"
+
+    def _body_path(self, key: str) -> Path:
+        return self.bodies_dir / hashlib.sha256(key.encode()).hexdigest()
+
+    def lookup(self, request: httpx.Request) -> tuple[CacheEntry, bytes] | None:
+        """Return the stored response for a request, if its Vary headers match."""
+        key = self.key(request)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, vary, request_time, response_time, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(key, row[0], [tuple(pair) for pair in json.loads(row[1])], json.loads(row[2]), row[3], row[4], row[5])
+        if any(request.headers.get(name) != value for name, value in entry.vary.items()):
+            return None
+        try:
+            body = self._body_path(key).read_bytes()
+        except OSError:
+            self._delete(key)
+            return None
+        return entry, body
+
+    def is_fresh(self, entry: CacheEntry, request: httpx.Request, now: float | None = None) -> bool:
+        """Check whether a stored response may be served without revalidation."""
+        directives = _directives(request.headers.get("Cache-Control"))
+        if "no-cache" in directives or "no-cache" in request.headers.get("Pragma", "").lower():
+            return False
+        age = entry.current_age(now if now is not None else time.time())
+        max_age = _seconds(directives, "max-age")
+        if max_age is not None and age > max_age:
+            return False
+        return age < entry.freshness_lifetime(request.url, self.heuristic_max_seconds)
+
+    @staticmethod
+    def storable(request: httpx.Request, response: httpx.Response) -> bool:
+        """Check whether a response may be stored (RFC 9111 section 3)."""
+        if request.method != "GET" or response.status_code not in _CACHEABLE_STATUS:
+            return False
+        if "no-store" in _directives(request.headers.get("Cache-Control")):
+            return False
+        directives = _directives(response.headers.get("Cache-Control"))
+        if "no-store" in directives or response.headers.get("Vary", "").strip() == "*":
+            return False
+        return (
+            "max-age" in directives
+            or "Expires" in response.headers
+            or "ETag" in response.headers
+            or "Last-Modified" in response.headers
+        )
+
+    def store(
+        self, request: httpx.Request, response: httpx.Response, body: bytes, request_time: float, response_time: float
+    ) -> None:
+        """Store a response body and headers, evicting old entries past the size bound."""
+        if len(body) > self.max_bytes:
+            return
+        key = self.key(request)
+        vary = {
+            name.strip().lower(): request.headers.get(name.strip())
+            for name in response.headers.get("Vary", "").split(",")
+            if name.strip()
+        }
+        path = self._body_path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status_code,
+                    json.dumps(list(response.headers.multi_items())),
+                    json.dumps(vary),
+                    request_time,
+                    response_time,
+                    len(body),
+                    time.time(),
+                ),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def freshen(self, entry: CacheEntry, not_modified: httpx.Response, request_time: float, response_time: float) -> CacheEntry:
+        """Apply a 304 to a stored response: update its headers and times."""
+        updated = {name.lower() for name in not_modified.headers if name.lower() not in _NOT_UPDATED}
+        headers = [(name, value) for name, value in entry.headers if name.lower() not in updated]
+        headers += [(name, value) for name, value in not_modified.headers.multi_items() if name.lower() in updated]
+        entry = CacheEntry(entry.key, entry.status, headers, entry.vary, request_time, response_time, entry.size)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET headers = ?, request_time = ?, response_time = ?, last_access = ? WHERE key = ?",
+                (json.dumps(headers), request_time, response_time, time.time(), entry.key),
+            )
+            self._conn.commit()
+        return entry
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Mark an entry as recently used."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), entry.key))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under the size bound (lock held)."""
+        while self._total > self.max_bytes:
+            row = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access LIMIT 1").fetchone()
+            if row is None:
+                self._total = 0
+                return
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._body_path(row[0]).unlink(missing_ok=True)
+            self._total -= row[1]
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            row = self._conn.execute("DELETE FROM responses WHERE key = ? RETURNING size", (key,)).fetchone()
+            if row:
+                self._total -= row[0]
+            self._conn.commit()
+        self._body_path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove every stored response."""
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM responses")]
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total = 0
+        for key in keys:
+            self._body_path(key).unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, stored bytes and hit/revalidation/miss counters."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+    # Shared request/response handling of the sync and async transports
+
+    def prepare(
+        self, request: httpx.Request
+    ) -> tuple[httpx.Request, CacheEntry | None, bytes | None, httpx.Response | None] | None:
+        """Look a request up.
+
+        Returns:
+            None if the request bypasses the cache, else (request to send,
+            stale entry, its body, response to return now). The response is
+            set on a fresh hit; the request gains validators when a stale
+            entry can be revalidated.
+        """
+        if request.method != "GET" or "If-None-Match" in request.headers or "If-Modified-Since" in request.headers:
+            return None
+        cached = self.lookup(request)
+        if cached is None:
+            return request, None, None, None
+        entry, body = cached
+        now = time.time()
+        if self.is_fresh(entry, request, now):
+            with self._lock:
+                self.hits += 1
+            self.touch(entry)
+            return request, entry, body, self._response(entry, body, request, "HIT", now)
+        validators = entry.validators()
+        if not validators:
+            return request, None, None, None
+        headers = request.headers.copy()
+        headers.update(validators)
+        conditional = httpx.Request(request.method, request.url, headers=headers, extensions=request.extensions)
+        return conditional, entry, body, None
+
+    def not_modified(
+        self, request: httpx.Request, entry: CacheEntry, body: bytes, response: httpx.Response, request_time: float
+    ) -> httpx.Response:
+        """Serve a stored response after a 304 revalidation."""
+        now = time.time()
+        entry = self.freshen(entry, response, request_time, now)
+        with self._lock:
+            self.revalidated += 1
+        return self._response(entry, body, request, "REVALIDATED", now)
+
+    def miss(
+        self, request: httpx.Request, response: httpx.Response, body: bytes, request_time: float
+    ) -> httpx.Response:
+        """Store (when allowed) and return a response fetched from the origin."""
+        with self._lock:
+            self.misses += 1
+        now = time.time()
+        if self.storable(request, response):
+            try:
+                self.store(request, response, body, request_time, now)
+            except OSError:
+                logger.warning("Failed to store %s in the HTTP cache", request.url, exc_info=True)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            request=request,
+            extensions={**response.extensions, "cache_status": "MISS"},
+        )
+
+    def _response(self, entry: CacheEntry, body: bytes, request: httpx.Request, status: str, now: float) -> httpx.Response:
+        headers = httpx.Headers(entry.headers)
+        headers["Age"] = str(int(entry.current_age(now)))
+        return httpx.Response(
+            entry.status, headers=headers, stream=httpx.ByteStream(body), request=request, extensions={"cache_status": status}
+        )
+
+
+class CachingTransport(httpx.BaseTransport):
+    """httpx transport that answers GETs from an ``HTTPCache`` when it may."""
+
+    def __init__(self, transport: httpx.BaseTransport, cache: HTTPCache):
+        """Wrap a transport.
+
+        Args:
+            transport: Transport that reaches the origin.
+            cache: Response store.
+        """
+        self.transport = transport
+        self.cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        lookup = self.cache.prepare(request)
+        if lookup is None:
+            return self.transport.handle_request(request)
+        outgoing, entry, body, cached = lookup
+        if cached is not None:
+            return cached
+
+        request_time = time.time()
+        response = self.transport.handle_request(outgoing)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            return self.cache.not_modified(request, entry, body, response, request_time)  # type: ignore[arg-type]
+        try:
+            # The raw stream, not iter_raw(): transports such as MockTransport hand back already-read responses
+            raw = b"".join(response.stream)  # type: ignore[arg-type]
+        finally:
+            response.close()
+        return self.cache.miss(request, response, raw, request_time)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``CachingTransport``."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: HTTPCache):
+        """Wrap a transport.
+
+        Args:
+            transport: Transport that reaches the origin.
+            cache: Response store.
+        """
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        lookup = self.cache.prepare(request)
+        if lookup is None:
+            return await self.transport.handle_async_request(request)
+        outgoing, entry, body, cached = lookup
+        if cached is not None:
+            return cached
+
+        request_time = time.time()
+        response = await self.transport.handle_async_request(outgoing)
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            return self.cache.not_modified(request, entry, body, response, request_time)  # type: ignore[arg-type]
+        try:
+            raw = b"".join([chunk async for chunk in response.stream])  # type: ignore[union-attr]
+        finally:
+            await response.aclose()
+        return self.cache.miss(request, response, raw, request_time)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
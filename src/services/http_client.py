@@ -0,0 +1,307 @@
+"""Shared, pooled HTTP clients for HKEX services.
+
+Every HKEX service used to open a fresh ``httpx.Client`` per call, paying a
+full TCP+TLS handshake to www1.hkexnews.hk each time. This module keeps one
+process-wide client (with keep-alive and optional HTTP/2) that
+``HKEXAPIService`` and ``PDFParserService`` share, plus one
+``httpx.AsyncClient`` per running event loop for ``AsyncHKEXAPIService``.
+With ``HKEX_HTTP_CACHE`` on (the default), both sit on the RFC 9111 disk
+cache of ``src.services.http_cache``, opened when the first client is built.
+"""
+
+import asyncio
+import atexit
+import inspect
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.config.agent_config import get_service_cache_dir
+from src.services.http_cache import AsyncCachingTransport, CachingTransport, HTTPCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    ),
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("true", "1", "yes")
+
+
+def _http2_available() -> bool:
+    """Check whether the optional ``h2`` package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class HTTPClientConfig:
+    """Connection pool settings for the shared HKEX client.
+
+    环境变量:
+        HKEX_HTTP2: 启用 HTTP/2（需安装 h2，默认 false）
+        HKEX_HTTP_MAX_CONNECTIONS: 连接池最大连接数（默认 20）
+        HKEX_HTTP_MAX_KEEPALIVE: 最大保活连接数（默认 10）
+        HKEX_HTTP_KEEPALIVE_EXPIRY: 保活连接过期时间，秒（默认 30）
+    """
+
+    timeout: float = 30.0
+    http2: bool = False
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    verify: bool = False
+    headers: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_HEADERS))
+    # Custom transports replace the pooled ones (and their limits); mainly for tests
+    transport: httpx.BaseTransport | None = None
+    async_transport: httpx.AsyncBaseTransport | None = None
+    # RFC 9111 disk cache layered over the transports (None: no caching)
+    cache: HTTPCache | None = None
+    # Directory of a disk cache opened on the first request (when cache is None)
+    cache_dir: Path | None = None
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientConfig":
+        """Build a config from ``HKEX_HTTP_*`` environment variables."""
+        config = cls()
+        config.http2 = _env_bool("HKEX_HTTP2", config.http2)
+        if value := os.getenv("HKEX_HTTP_MAX_CONNECTIONS"):
+            config.max_connections = int(value)
+        if value := os.getenv("HKEX_HTTP_MAX_KEEPALIVE"):
+            config.max_keepalive_connections = int(value)
+        if value := os.getenv("HKEX_HTTP_KEEPALIVE_EXPIRY"):
+            config.keepalive_expiry = float(value)
+        if _env_bool("HKEX_HTTP_CACHE", True):
+            config.cache_dir = get_service_cache_dir() / "http"
+        return config
+
+    def limits(self) -> httpx.Limits:
+        """Return the ``httpx.Limits`` for this config."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class HTTPClientManager:
+    """Owns the process-wide pooled ``httpx.Client`` and ``httpx.AsyncClient``.
+
+    The clients are created lazily on first use and reused by every caller, so
+    repeated requests to the same host reuse warm keep-alive connections.
+    Per-request timeouts are still passed by each service. Async clients are
+    bound to an event loop, so one is kept per running loop.
+
+    Lifecycle hooks:
+        - ``on_open``: called with the client right after it is created.
+        - ``on_close``: called with the client right before it is closed.
+        - ``add_event_hook``: httpx ``request``/``response`` event hooks,
+          applied to the current client and any future one.
+    """
+
+    def __init__(self, config: HTTPClientConfig | None = None):
+        """Initialize the manager.
+
+        Args:
+            config: Pool settings (default: ``HTTPClientConfig.from_env()``).
+        """
+        self.config = config or HTTPClientConfig.from_env()
+        self._lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._event_hooks: dict[str, list[Callable[..., Any]]] = {"request": [], "response": []}
+        self._open_hooks: list[Callable[[Any], None]] = []
+        self._close_hooks: list[Callable[[Any], None]] = []
+
+    def on_open(self, hook: Callable[[Any], None]) -> None:
+        """Register a callback invoked after a client is created."""
+        self._open_hooks.append(hook)
+
+    def on_close(self, hook: Callable[[Any], None]) -> None:
+        """Register a callback invoked before a client is closed."""
+        self._close_hooks.append(hook)
+
+    def add_event_hook(self, event: str, hook: Callable[..., Any]) -> None:
+        """Register an httpx event hook ("request" or "response").
+
+        Args:
+            event: Event name, "request" or "response".
+            hook: Callable receiving the ``httpx.Request``/``httpx.Response``.
+        """
+        if event not in self._event_hooks:
+            raise ValueError(f"Unknown event hook: {event}")
+        self._event_hooks[event].append(hook)
+        with self._lock:
+            if self._client is not None:
+                self._client.event_hooks = self._copy_event_hooks()
+            for async_client in self._async_clients.values():
+                async_client.event_hooks = self._copy_async_event_hooks()
+
+    def _copy_event_hooks(self) -> dict[str, list[Callable[..., Any]]]:
+        return {event: list(hooks) for event, hooks in self._event_hooks.items()}
+
+    def _copy_async_event_hooks(self) -> dict[str, list[Callable[..., Any]]]:
+        def _wrap(hook: Callable[..., Any]) -> Callable[..., Any]:
+            async def _async_hook(obj: Any) -> None:
+                result = hook(obj)
+                if inspect.isawaitable(result):
+                    await result
+
+            return _async_hook
+
+        return {event: [_wrap(hook) for hook in hooks] for event, hooks in self._event_hooks.items()}
+
+    def _use_http2(self) -> bool:
+        if self.config.http2 and not _http2_available():
+            logger.warning("HKEX_HTTP2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+            return False
+        return self.config.http2
+
+    def _cache(self) -> HTTPCache | None:
+        """Return the HTTP cache, opening the configured disk cache on first use (lock held)."""
+        if self.config.cache is None and self.config.cache_dir is not None:
+            try:
+                self.config.cache = HTTPCache.from_env(self.config.cache_dir)
+            except (OSError, sqlite3.Error):
+                logger.warning("Failed to open the HTTP cache; continuing without it", exc_info=True)
+            self.config.cache_dir = None
+        return self.config.cache
+
+    def _transport(self) -> httpx.BaseTransport | None:
+        """Return the sync transport, wrapped in the HTTP cache when one is configured."""
+        transport = self.config.transport
+        cache = self._cache()
+        if cache is None:
+            return transport
+        if transport is None:
+            transport = httpx.HTTPTransport(verify=self.config.verify, http2=self._use_http2(), limits=self.config.limits())
+        return CachingTransport(transport, cache)
+
+    def _async_transport(self) -> httpx.AsyncBaseTransport | None:
+        """Return the async transport, wrapped in the HTTP cache when one is configured."""
+        transport = self.config.async_transport
+        cache = self._cache()
+        if cache is None:
+            return transport
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                verify=self.config.verify, http2=self._use_http2(), limits=self.config.limits()
+            )
+        return AsyncCachingTransport(transport, cache)
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        """Return HTTP cache statistics (None when caching is off)."""
+        with self._lock:
+            cache = self._cache()
+        return cache.stats() if cache is not None else None
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        return {
+            "headers": self.config.headers,
+            "timeout": self.config.timeout,
+            "verify": self.config.verify,
+            "http2": self._use_http2(),
+            "limits": self.config.limits(),
+        }
+
+    def get_client(self) -> httpx.Client:
+        """Return the shared client, creating it on first use."""
+        client = self._client
+        if client is not None and not client.is_closed:
+            return client
+
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.Client(
+                    event_hooks=self._copy_event_hooks(), transport=self._transport(), **self._client_kwargs()
+                )
+                for hook in self._open_hooks:
+                    hook(self._client)
+            return self._client
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared async client for the running event loop.
+
+        Must be called from within a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    event_hooks=self._copy_async_event_hooks(),
+                    transport=self._async_transport(),
+                    **self._client_kwargs(),
+                )
+                self._async_clients[loop] = client
+                for hook in self._open_hooks:
+                    hook(client)
+            return client
+
+    async def aclose(self) -> None:
+        """Close the async client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None and not client.is_closed:
+            for hook in self._close_hooks:
+                hook(client)
+            await client.aclose()
+
+    def close(self) -> None:
+        """Close the shared client and release pooled connections.
+
+        Async clients of other event loops are dropped; close them from their
+        own loop with ``aclose()`` to release their connections eagerly.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+            self._async_clients.clear()
+        if client is not None and not client.is_closed:
+            for hook in self._close_hooks:
+                hook(client)
+            client.close()
+
+
+_default_manager: HTTPClientManager | None = None
+_default_manager_lock = threading.Lock()
+
+
+def get_client_manager() -> HTTPClientManager:
+    """Return the process-wide ``HTTPClientManager``."""
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                _default_manager = HTTPClientManager()
+    return _default_manager
+
+
+def close_shared_clients() -> None:
+    """Close the process-wide pooled clients (registered with ``atexit``)."""
+    if _default_manager is not None:
+        _default_manager.close()
+
+
+atexit.register(close_shared_clients)
@@ -0,0 +1,120 @@
+"""Incremental state for the HKEX latest-announcements feed.
+
+``lcisehk1relsdc_1.json`` is a full snapshot of recent announcements. Instead
+of downloading and re-parsing it on every call, the last snapshot is kept in
+memory and refreshed with conditional requests (ETag / If-Modified-Since), so
+an unchanged feed costs a bodiless 304. Each newsId gets a sequence number
+when first seen, which lets pollers ask for "only items newer than my cursor".
+"""
+
+import threading
+import time
+import uuid
+from typing import Any
+
+import httpx
+
+
+class LatestFeedState:
+    """Last snapshot of the latest-announcements feed plus its validators."""
+
+    def __init__(self):
+        """Initialize an empty feed state."""
+        self._lock = threading.Lock()
+        # Distinguishes cursors issued by this state from stale ones (other process, restart)
+        self._token = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._first_seen: dict[str, int] = {}
+        self.items: list[dict[str, Any]] = []
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.fetched_at: float | None = None
+        self.fetches = 0
+        self.not_modified = 0
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the validators to send with the next feed request."""
+        headers = {}
+        with self._lock:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update(self, response: httpx.Response) -> bool:
+        """Apply a feed response.
+
+        Args:
+            response: Response to a (conditional) feed request.
+
+        Returns:
+            True if the snapshot changed, False on 304 Not Modified.
+        """
+        with self._lock:
+            self.fetches += 1
+            self.fetched_at = time.time()
+            if response.status_code == 304:
+                self.not_modified += 1
+                return False
+
+            items = response.json().get("newsInfoLst", [])
+            first_seen = {}
+            # The feed is newest first; number oldest first so sequence follows publication order
+            for item in reversed(items):
+                news_id = str(item.get("newsId"))
+                if news_id in self._first_seen:
+                    first_seen[news_id] = self._first_seen[news_id]
+                else:
+                    self._seq += 1
+                    first_seen[news_id] = self._seq
+            # Only ids still in the feed are kept, so memory stays bounded
+            self._first_seen = first_seen
+            self.items = items
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            return True
+
+    def since(self, cursor: str | None) -> tuple[list[dict[str, Any]], str]:
+        """Return items first seen after a cursor.
+
+        Args:
+            cursor: Cursor from a previous call, or None for the whole snapshot.
+                Cursors issued by another state (e.g. before a restart) also
+                return the whole snapshot.
+
+        Returns:
+            Tuple of (new items in feed order, cursor for the next call).
+        """
+        with self._lock:
+            seq = 0
+            if cursor:
+                token, _, value = cursor.partition(":")
+                if token == self._token and value.isdigit():
+                    seq = int(value)
+            new_items = [item for item in self.items if self._first_seen.get(str(item.get("newsId")), 0) > seq]
+            return new_items, f"{self._token}:{self._seq}"
+
+    def stats(self) -> dict[str, Any]:
+        """Return fetch statistics for the feed."""
+        with self._lock:
+            return {
+                "fetches": self.fetches,
+                "not_modified": self.not_modified,
+                "items": len(self.items),
+                "fetched_at": self.fetched_at,
+            }
+
+
+_default_state: LatestFeedState | None = None
+_default_state_lock = threading.Lock()
+
+
+def get_latest_feed_state() -> LatestFeedState:
+    """Return the process-wide ``LatestFeedState``."""
+    global _default_state
+    if _default_state is None:
+        with _default_state_lock:
+            if _default_state is None:
+                _default_state = LatestFeedState()
+    return _default_state
@@ -1,20 +1,60 @@
 """PDF parsing service with caching support."""
 
+import functools
+import hashlib
 import logging
+import multiprocessing
 import os
 import re
 import ssl
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import httpx
+import pdfminer
 import pdfplumber
 
+from src.services.extraction_cache import ExtractionCache, file_digest, get_extraction_cache
+from src.services.http_client import HTTPClientManager, get_client_manager
+from src.services.rate_limit import RateLimiter, get_rate_limiter
+from src.services.single_flight import SingleFlight, get_single_flight
+
 # Suppress pdfminer warnings about color spaces
 # These warnings are common in HKEX PDFs but don't affect text/table extraction
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+# Artifacts PDFParserService.extract_all produces by default in one pass
+PDF_ARTIFACTS = frozenset({"text", "tables", "structure"})
+
+# Per-page text index (one string per page, "" for pages without text)
+PAGE_TEXTS = "page_texts"
+
+# Recent extractions kept in memory per service
+EXTRACTION_MEMO_SIZE = 8
+
+# Pages whose largest font exceeds this are heading candidates
+HEADING_FONT_SIZE = 12
+
+# Options that change extraction output; part of extraction cache keys
+EXTRACTION_OPTIONS = {"heading_font_size": HEADING_FONT_SIZE}
+
+# Bump to invalidate cached extractions whenever the extraction output changes
+EXTRACTOR_REVISION = 1
+
+# Default for PDFParserService(extraction_cache=...): the process-wide cache, opened on first use
+_DEFAULT_EXTRACTION_CACHE: Any = object()
+
+# Page-parallel extraction: PDFs shorter than this are extracted serially
+DEFAULT_PARALLEL_MIN_PAGES = 40
+MIN_SHARD_PAGES = 8
+
+logger = logging.getLogger(__name__)
+
 
 def sanitize_filename(filename: str, max_length: int = 200) -> str:
     """Sanitize filename by removing special characters.
@@ -66,8 +106,160 @@ def format_date_for_filename(date_time_str: str) -> str:
     return ""
 
 
+def parse_page_spec(pages: str | Iterable[int], num_pages: int) -> list[int]:
+    """Resolve a page selection to sorted, distinct 1-based page numbers.
+
+    Args:
+        pages: "12-18", "3", "1,4-6", "20-" (to the last page), or page numbers.
+        num_pages: Number of pages in the document; range ends are clipped to it.
+
+    Returns:
+        Selected page numbers.
+
+    Raises:
+        ValueError: Malformed selection, or no selected page within the document.
+    """
+    selected: set[int] = set()
+    if isinstance(pages, str):
+        for item in pages.replace(" ", "").split(","):
+            if not item:
+                continue
+            start, dash, end = item.partition("-")
+            if not start.isdigit() or (end and not end.isdigit()):
+                raise ValueError(f"Invalid page selection: {pages!r} (expected e.g. \"12-18\" or \"1,4-6\")")
+            first = int(start)
+            last = (int(end) if end else num_pages) if dash else first
+            if first < 1 or last < first:
+                raise ValueError(f"Invalid page range: {item!r}")
+            selected.update(range(first, min(last, num_pages) + 1))
+    else:
+        selected.update(page for page in pages if 1 <= page <= num_pages)
+    if not selected:
+        raise ValueError(f"No pages selected by {pages!r}; the document has {num_pages} pages")
+    return sorted(selected)
+
+
+def _extract_page(page: Any, page_num: int, want: set[str], check_tables: bool = True) -> dict[str, Any]:
+    """Extract the wanted artifacts of one page, as a one-page partial result.
+
+    Args:
+        page: pdfplumber page (closed afterwards to free its parsed objects).
+        page_num: 1-based page number.
+        want: Artifacts being extracted.
+        check_tables: Whether structure still needs to look for tables on this page.
+
+    Returns:
+        Partial result: page texts, tables (with page numbers), whether a
+        table was seen and heading candidates.
+    """
+    texts = []
+    page_texts = []
+    tables = []
+    has_tables = False
+    sections = []
+    if "text" in want or PAGE_TEXTS in want:
+        text = page.extract_text() or ""
+        page_texts.append(text)
+        if text:
+            texts.append(text)
+
+    # Structure only needs to know whether any page has a table
+    if "tables" in want or ("structure" in want and check_tables):
+        page_tables = page.extract_tables()
+        has_tables = bool(page_tables)
+        if "tables" in want:
+            tables = [{"page": page_num, "table": table} for table in page_tables if table]
+
+    if "structure" in want:
+        # Large font sizes might indicate headings (heuristic)
+        sizes = [char.get("size", 0) for char in page.chars]
+        max_size = max((size for size in sizes if size > 0), default=0)
+        if max_size > HEADING_FONT_SIZE:
+            sections.append(
+                {
+                    "page": page_num,
+                    "max_font_size": max_size,
+                }
+            )
+
+    page.close()
+    return {"texts": texts, "page_texts": page_texts, "tables": tables, "has_tables": has_tables, "sections": sections}
+
+
+def _combine(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    """Concatenate partial results of consecutive pages or page ranges."""
+    return {
+        "texts": [text for part in parts for text in part["texts"]],
+        "page_texts": [text for part in parts for text in part["page_texts"]],
+        "tables": [table for part in parts for table in part["tables"]],
+        "has_tables": any(part["has_tables"] for part in parts),
+        "sections": [section for part in parts for section in part["sections"]],
+    }
+
+
+def _extract_range(pdf: Any, start: int, stop: int, want: set[str]) -> dict[str, Any]:
+    """Walk pages ``start:stop`` of an open PDF once, producing a partial result."""
+    parts = []
+    has_tables = False
+    for page_num in range(start + 1, stop + 1):
+        part = _extract_page(pdf.pages[page_num - 1], page_num, want, check_tables=not has_tables)
+        has_tables = has_tables or part["has_tables"]
+        parts.append(part)
+    return _combine(parts)
+
+
+def _extract_shard(pdf_path: str, start: int, stop: int, want: set[str]) -> dict[str, Any]:
+    """Process-pool entry point: open the PDF and extract one page range."""
+    with pdfplumber.open(pdf_path) as pdf:
+        return _extract_range(pdf, start, stop, want)
+
+
+def _merge_shards(num_pages: int, parts: list[dict[str, Any]], want: set[str]) -> dict[str, Any]:
+    """Combine partial results (in page order) into extract_all artifacts."""
+    combined = _combine(parts)
+    artifacts = {
+        "text": "\n\n".join(combined["texts"]),
+        PAGE_TEXTS: combined["page_texts"],
+        "tables": combined["tables"],
+        "structure": {
+            "num_pages": num_pages,
+            "has_tables": combined["has_tables"],
+            "estimated_sections": combined["sections"],
+        },
+    }
+    return {name: artifacts[name] for name in want}
+
+
+def _check_want(want: Iterable[str]) -> set[str]:
+    """Validate requested artifact names."""
+    want = set(want)
+    unknown = want - PDF_ARTIFACTS - {PAGE_TEXTS}
+    if unknown:
+        raise ValueError(f"Unknown PDF artifacts: {sorted(unknown)}")
+    return want
+
+
+@functools.cache
+def extractor_version() -> str:
+    """Identify the extractor for extraction cache keys.
+
+    Covers ``EXTRACTOR_REVISION`` and the pdfplumber and pdfminer.six
+    versions, so upgrading either library invalidates cached results; bump
+    the revision when the page loop's output changes.
+    """
+    material = f"{EXTRACTOR_REVISION}\npdfplumber {pdfplumber.__version__}\npdfminer {pdfminer.__version__}"
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
 class PDFParserService:
-    """Service for parsing PDF files with caching."""
+    """Service for parsing PDF files with caching.
+
+    环境变量:
+        HKEX_PDF_WORKERS: 长 PDF 按页分片并行解析的进程数（默认 CPU 核数，1 为串行）
+        HKEX_PDF_PARALLEL_MIN_PAGES: 页数达到此值才并行解析（默认 40）
+        HKEX_EXTRACTION_CACHE: 按 PDF 内容哈希缓存解析结果（默认 true）
+        HKEX_BASE_URL: 相对 PDF 链接的基础地址（默认 https://www1.hkexnews.hk）
+    """
 
     BASE_URL = "https://www1.hkexnews.hk"
     DEFAULT_HEADERS = {
@@ -76,19 +268,67 @@ class PDFParserService:
         ),
     }
 
-    def __init__(self, timeout: int = 60):
+    def __init__(
+        self,
+        timeout: int = 60,
+        client_manager: HTTPClientManager | None = None,
+        rate_limiter: RateLimiter | None = None,
+        single_flight: SingleFlight | None = None,
+        base_url: str | None = None,
+        extract_workers: int | None = None,
+        parallel_min_pages: int | None = None,
+        extraction_cache: ExtractionCache | None = _DEFAULT_EXTRACTION_CACHE,
+    ):
         """Initialize PDF parser service.
 
         Args:
             timeout: Request timeout in seconds.
+            client_manager: Pooled HTTP client manager (default: process-wide shared pool).
+            rate_limiter: Adaptive rate limiter shared with the HKEX API (default: process-wide limiter).
+            single_flight: Coalescer for concurrent downloads of the same PDF (default: process-wide instance).
+            base_url: Origin that relative PDF links resolve against
+                (default: HKEX_BASE_URL or https://www1.hkexnews.hk).
+            extract_workers: Processes for page-sharded extraction of long PDFs
+                (default: HKEX_PDF_WORKERS or the CPU count; 1 disables).
+            parallel_min_pages: Minimum pages for parallel extraction
+                (default: HKEX_PDF_PARALLEL_MIN_PAGES or 40).
+            extraction_cache: Content-addressed store of extraction results
+                (default: process-wide cache opened on first use, unless
+                HKEX_EXTRACTION_CACHE=false; None disables caching).
         """
+        self.BASE_URL = (base_url or os.getenv("HKEX_BASE_URL") or self.BASE_URL).rstrip("/")
         self.timeout = timeout
+        self.client_manager = client_manager or get_client_manager()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.single_flight = single_flight or get_single_flight()
+        self._extraction_cache = extraction_cache
+        # (path, size, mtime) -> (extraction cache key, artifacts)
+        self._extractions: OrderedDict[tuple[str, int, int], tuple[str | None, dict[str, Any]]] = OrderedDict()
+        self._extractions_lock = threading.Lock()
+        if extract_workers is None:
+            extract_workers = int(os.getenv("HKEX_PDF_WORKERS", os.cpu_count() or 1))
+        if parallel_min_pages is None:
+            parallel_min_pages = int(os.getenv("HKEX_PDF_PARALLEL_MIN_PAGES", DEFAULT_PARALLEL_MIN_PAGES))
+        self.extract_workers = max(1, extract_workers)
+        self.parallel_min_pages = max(1, parallel_min_pages)
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._background: ThreadPoolExecutor | None = None
+        self._background_jobs: dict[str, Future] = {}
+        self._background_lock = threading.Lock()
         # Create SSL context that doesn't verify certificates
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
         self.ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
 
+    @property
+    def extraction_cache(self) -> ExtractionCache | None:
+        """Extraction cache (None when disabled), opened on first use."""
+        if self._extraction_cache is _DEFAULT_EXTRACTION_CACHE:
+            self._extraction_cache = get_extraction_cache()
+        return self._extraction_cache
+
     def get_cached_pdf_path(
         self, stock_code: str, date: str, title: str, cache_dir: str
     ) -> str | None:
@@ -193,6 +433,24 @@ class PDFParserService:
         filename = sanitize_filename(f"{date}-{title}.pdf")
         cache_path = Path(cache_dir) / stock_code / filename
 
+        # Concurrent requests for the same file in this process share one download
+        return self.single_flight.do(
+            ("pdf", str(cache_path)),
+            lambda: self._download(full_url, cache_path, stock_code, date, title, cache_dir),
+        )
+
+    def _download(
+        self,
+        full_url: str,
+        cache_path: Path,
+        stock_code: str,
+        date: str,
+        title: str,
+        cache_dir: str,
+    ) -> str:
+        """Download a PDF to its cache path (raises RuntimeError on failure)."""
+        filename = cache_path.name
+
         # Create directory if needed
         cache_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -210,17 +468,20 @@ class PDFParserService:
             # Create temporary file in the same directory for atomic rename
             temp_file = cache_path.parent / f".{filename}.tmp"
             
-            with httpx.Client(
-                headers=self.DEFAULT_HEADERS,
-                timeout=self.timeout,
-                verify=False,
-            ) as client:
-                response = client.get(full_url)
-                response.raise_for_status()
-
-                # Write to temporary file first
-                with open(temp_file, "wb") as f:
-                    f.write(response.content)
+            client = self.client_manager.get_client()
+            limiter = self.rate_limiter.endpoint("pdf")
+            started = limiter.acquire()
+            try:
+                response = client.get(full_url, headers=self.DEFAULT_HEADERS, timeout=self.timeout)
+            except BaseException as e:
+                limiter.release(started, error=e)
+                raise
+            limiter.release(started, response=response)
+            response.raise_for_status()
+
+            # Write to temporary file first
+            with open(temp_file, "wb") as f:
+                f.write(response.content)
 
             # Double-check cache one more time before atomic rename
             # Another process might have completed the download while we were downloading
@@ -251,110 +512,353 @@ class PDFParserService:
             
             raise RuntimeError(f"Failed to download PDF from {full_url}: {e}") from e
 
-    def extract_text(self, pdf_path: str) -> str:
-        """Extract text from PDF.
+    def extract_all(self, pdf_path: str, want: Iterable[str] = PDF_ARTIFACTS) -> dict[str, Any]:
+        """Extract text, tables and/or structure with one open and one pass over the pages.
+
+        Results are memoized per file (path, size and mtime), so a tool that
+        asks for an artifact another call already produced gets it without
+        reparsing, and stored in the extraction cache under the PDF's content
+        hash, so later processes and copies of the file skip parsing too.
 
         Args:
             pdf_path: Path to PDF file.
+            want: Artifacts to produce, any of "text", "tables", "structure"
+                and "page_texts".
 
         Returns:
-            Extracted text content.
+            Dictionary with the wanted keys: "text" as from ``extract_text``,
+            "tables" as from ``extract_tables``, "structure" as from
+            ``analyze_structure`` and "page_texts", the text of each page
+            ("" for pages without text).
         """
-        text_parts = []
+        want = _check_want(want)
+        memo_key, cache_key, known = self._lookup(pdf_path, want)
+        missing = want - known.keys()
+        if "text" in missing:
+            # The page index falls out of the text pass; keep it for page lookups
+            missing |= {PAGE_TEXTS} - known.keys()
+        self._remember(memo_key, cache_key, known, self._extract_pages(pdf_path, missing) if missing else {})
+        return {name: known[name] for name in want}
+
+    def _lookup(self, pdf_path: str, want: set[str]) -> tuple[tuple[str, int, int], str | None, dict[str, Any]]:
+        """Find artifacts in the memo and the extraction cache, without parsing.
 
+        Returns:
+            Tuple of (memo key, extraction cache key or None, known artifacts).
+        """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-
-            return "\n\n".join(text_parts)
+            stat = Path(pdf_path).stat()
+            memo_key = (str(Path(pdf_path).resolve()), stat.st_size, stat.st_mtime_ns)
+            with self._extractions_lock:
+                cache_key, known = self._extractions.get(memo_key, (None, {}))
+            known = dict(known)
+            missing = want - known.keys()
+            if "text" in missing and PAGE_TEXTS not in known:
+                missing.add(PAGE_TEXTS)
+            if missing and self.extraction_cache is not None:
+                if cache_key is None:
+                    cache_key = ExtractionCache.make_key(file_digest(pdf_path), extractor_version(), EXTRACTION_OPTIONS)
+                known.update(self.extraction_cache.get(cache_key, missing))
+            # The full text is the page index joined, as _merge_shards builds it
+            if "text" in want and "text" not in known and PAGE_TEXTS in known:
+                known["text"] = "\n\n".join(text for text in known[PAGE_TEXTS] if text)
+        except OSError as e:
+            raise RuntimeError(f"Failed to extract PDF content: {e}") from e
+        return memo_key, cache_key, known
+
+    def _remember(
+        self,
+        memo_key: tuple[str, int, int],
+        cache_key: str | None,
+        known: dict[str, Any],
+        extracted: dict[str, Any],
+    ) -> None:
+        """Add freshly extracted artifacts to ``known``, the extraction cache and the memo."""
+        known.update(extracted)
+        if self.extraction_cache is not None and extracted:
+            self.extraction_cache.put(cache_key, extracted)
+        with self._extractions_lock:
+            self._extractions[memo_key] = (cache_key, known)
+            self._extractions.move_to_end(memo_key)
+            while len(self._extractions) > EXTRACTION_MEMO_SIZE:
+                self._extractions.popitem(last=False)
+
+    def _iter_page_parts(
+        self, pdf_path: str, want: set[str], pages: str | Iterable[int] | None = None
+    ) -> Iterator[tuple[int, int, dict[str, Any]]]:
+        """Yield (page number, page count, one-page partial result), parsing each page on demand.
 
+        Args:
+            pdf_path: Path to PDF file.
+            want: Artifacts being extracted.
+            pages: Page selection as for ``parse_page_spec`` (default: all pages).
+        """
+        try:
+            pdf = pdfplumber.open(pdf_path)
         except Exception as e:
-            raise RuntimeError(f"Failed to extract text from PDF: {e}") from e
+            raise RuntimeError(f"Failed to extract PDF content: {e}") from e
+        with pdf:
+            num_pages = len(pdf.pages)
+            selected = range(1, num_pages + 1) if pages is None else parse_page_spec(pages, num_pages)
+            has_tables = False
+            for page_num in selected:
+                try:
+                    part = _extract_page(pdf.pages[page_num - 1], page_num, want, check_tables=not has_tables)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to extract PDF content: {e}") from e
+                has_tables = has_tables or part["has_tables"]
+                yield page_num, num_pages, part
 
-    def extract_tables(self, pdf_path: str) -> list[dict[str, Any]]:
-        """Extract tables from PDF.
+    def iter_pages(self, pdf_path: str, include_tables: bool = True) -> Iterator[dict[str, Any]]:
+        """Yield pages lazily: each page is parsed only when the next item is requested.
+
+        Breaking out of the loop (or closing the generator) stops parsing and
+        closes the file.
 
         Args:
             pdf_path: Path to PDF file.
+            include_tables: Whether to extract each page's tables.
 
-        Returns:
-            List of tables, each as a list of rows.
+        Yields:
+            Dictionary with page (1-based), num_pages, text and tables (as
+            from ``extract_tables``, for this page).
         """
-        tables = []
+        want = {"text", "tables"} if include_tables else {"text"}
+        for page_num, num_pages, part in self._iter_page_parts(pdf_path, want):
+            yield {"page": page_num, "num_pages": num_pages, "text": "\n\n".join(part["texts"]), "tables": part["tables"]}
 
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_tables = page.extract_tables()
-                    for table in page_tables:
-                        if table:
-                            tables.append(
-                                {
-                                    "page": page_num,
-                                    "table": table,
-                                }
-                            )
-
-            return tables
+    def extract_pages(
+        self, pdf_path: str, pages: str | Iterable[int], include_tables: bool = True
+    ) -> dict[str, Any]:
+        """Extract selected pages only.
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to extract tables from PDF: {e}") from e
+        Pages are served from the per-page text index (and cached tables) when
+        the file was indexed before; otherwise only the selected pages are
+        parsed.
 
-    def analyze_structure(self, pdf_path: str) -> dict[str, Any]:
-        """Analyze PDF structure (sections, headings, etc.).
+        Args:
+            pdf_path: Path to PDF file.
+            pages: Page selection as for ``parse_page_spec``, e.g. "12-18".
+            include_tables: Whether to include each page's tables.
+
+        Returns:
+            Dictionary with num_pages and pages, a list of dictionaries with
+            page, text and tables (as from ``iter_pages``).
+
+        Raises:
+            ValueError: Invalid or out-of-range page selection.
+        """
+        indexed = {PAGE_TEXTS, "tables"} if include_tables else {PAGE_TEXTS}
+        memo_key, cache_key, known = self._lookup(pdf_path, indexed)
+        if indexed <= known.keys():
+            self._remember(memo_key, cache_key, known, {})
+            page_texts = known[PAGE_TEXTS]
+            selected = parse_page_spec(pages, len(page_texts))
+            tables_by_page: dict[int, list[dict[str, Any]]] = {}
+            for table in known.get("tables", []):
+                tables_by_page.setdefault(table["page"], []).append(table)
+            return {
+                "num_pages": len(page_texts),
+                "pages": [
+                    {"page": n, "text": page_texts[n - 1], "tables": tables_by_page.get(n, [])} for n in selected
+                ],
+            }
+
+        want = {"text", "tables"} if include_tables else {"text"}
+        num_pages = 0
+        extracted = []
+        for page_num, num_pages, part in self._iter_page_parts(pdf_path, want, pages):
+            extracted.append({"page": page_num, "text": "\n\n".join(part["texts"]), "tables": part["tables"]})
+        return {"num_pages": num_pages, "pages": extracted}
+
+    def page_index(self, pdf_path: str) -> list[str]:
+        """Return the per-page text index (one string per page), building and caching it if needed."""
+        return self.extract_all(pdf_path, {PAGE_TEXTS})[PAGE_TEXTS]
+
+    def extract_preview(
+        self,
+        pdf_path: str,
+        want: Iterable[str] = PDF_ARTIFACTS,
+        max_chars: int = 50_000,
+        max_table_rows: int | None = None,
+    ) -> dict[str, Any]:
+        """Extract a PDF page by page until it is known to exceed the inline budget.
+
+        Documents within the budget are extracted completely and remembered
+        like ``extract_all`` results. For larger ones parsing stops on the page
+        where the text exceeds ``max_chars`` (or the tables exceed
+        ``max_table_rows`` rows) and the full extraction continues with
+        ``extract_in_background``.
 
         Args:
             pdf_path: Path to PDF file.
+            want: Artifacts to produce, any of "text", "tables" and "structure".
+            max_chars: Text budget in characters.
+            max_table_rows: Table budget in rows (default: unlimited).
 
         Returns:
-            Dictionary with structure information.
+            The wanted artifacts plus "complete". Partial results
+            ("complete": False) hold text and tables of the parsed pages only,
+            no structure, and "pages_parsed" and "num_pages".
         """
-        structure = {
-            "num_pages": 0,
-            "has_tables": False,
-            "estimated_sections": [],
+        want = _check_want(want)
+        memo_key, cache_key, known = self._lookup(pdf_path, want)
+        if want <= known.keys():
+            self._remember(memo_key, cache_key, known, {})
+            return {**{name: known[name] for name in want}, "complete": True}
+
+        parts = []
+        chars = rows = num_pages = 0
+        pages = self._iter_page_parts(pdf_path, want)
+        try:
+            for page_num, num_pages, part in pages:
+                parts.append(part)
+                chars += sum(len(text) + 2 for text in part["texts"])
+                rows += sum(len(table["table"]) for table in part["tables"])
+                over_budget = chars > max_chars or (max_table_rows is not None and rows > max_table_rows)
+                if over_budget and page_num < num_pages:
+                    break
+        finally:
+            pages.close()
+
+        if len(parts) == num_pages:
+            extracted = _merge_shards(num_pages, parts, want | ({PAGE_TEXTS} if "text" in want else set()))
+            self._remember(memo_key, cache_key, known, {name: extracted[name] for name in extracted.keys() - known.keys()})
+            return {**{name: known[name] for name in want}, "complete": True}
+
+        self.extract_in_background(pdf_path, want)
+        return {
+            **_merge_shards(num_pages, parts, want - {"structure"}),
+            "complete": False,
+            "pages_parsed": len(parts),
+            "num_pages": num_pages,
         }
 
+    def extract_in_background(self, pdf_path: str, want: Iterable[str] = PDF_ARTIFACTS) -> Future:
+        """Run ``extract_all`` on a background thread and save the text/tables cache files.
+
+        Fills the memo and the extraction cache, and writes the files
+        ``save_extracted_content`` produces (the paths truncated tool results
+        point to). A file already being extracted is not queued twice.
+
+        Returns:
+            Future of the extracted artifacts.
+        """
+        want = _check_want(want)
+        job_key = str(Path(pdf_path).resolve())
+        with self._background_lock:
+            self._background_jobs = {key: job for key, job in self._background_jobs.items() if not job.done()}
+            if job_key in self._background_jobs:
+                return self._background_jobs[job_key]
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-extract")
+            future = self._background.submit(self._finish_extraction, pdf_path, want)
+            self._background_jobs[job_key] = future
+        return future
+
+    def _finish_extraction(self, pdf_path: str, want: set[str]) -> dict[str, Any]:
+        """Background job of ``extract_in_background``."""
+        try:
+            content = self.extract_all(pdf_path, want)
+            if "text" in content:
+                self.save_extracted_content(pdf_path, content["text"], content.get("tables", []), force=True)
+            return content
+        except Exception:
+            logger.warning("Background extraction of %s failed", pdf_path, exc_info=True)
+            raise
+
+    def wait_background(self, timeout: float | None = None) -> None:
+        """Wait for queued background extractions to finish."""
+        with self._background_lock:
+            jobs = list(self._background_jobs.values())
+        wait(jobs, timeout=timeout)
+
+    def _extract_pages(self, pdf_path: str, want: set[str]) -> dict[str, Any]:
+        """Produce the wanted artifacts (no memo), sharded over the process pool for long PDFs."""
         try:
             with pdfplumber.open(pdf_path) as pdf:
-                structure["num_pages"] = len(pdf.pages)
-
-                # Check for tables
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    if tables:
-                        structure["has_tables"] = True
-                        break
-
-                # Try to identify sections by font size (heuristic)
-                for page_num, page in enumerate(pdf.pages, 1):
-                    chars = page.chars
-                    if chars:
-                        # Group by font size to identify potential headings
-                        font_sizes = {}
-                        for char in chars:
-                            size = char.get("size", 0)
-                            if size > 0:
-                                font_sizes[size] = font_sizes.get(size, 0) + 1
-
-                        # Large font sizes might indicate headings
-                        if font_sizes:
-                            max_size = max(font_sizes.keys())
-                            if max_size > 12:  # Threshold for headings
-                                structure["estimated_sections"].append(
-                                    {
-                                        "page": page_num,
-                                        "max_font_size": max_size,
-                                    }
-                                )
-
+                num_pages = len(pdf.pages)
+                shards = self._shard_ranges(num_pages)
+                if len(shards) == 1:
+                    return _merge_shards(num_pages, [_extract_range(pdf, 0, num_pages, want)], want)
+            parts = self._extract_parallel(pdf_path, shards, want)
+            if parts is None:
+                with pdfplumber.open(pdf_path) as pdf:
+                    parts = [_extract_range(pdf, 0, num_pages, want)]
+            return _merge_shards(num_pages, parts, want)
         except Exception as e:
-            raise RuntimeError(f"Failed to analyze PDF structure: {e}") from e
+            raise RuntimeError(f"Failed to extract PDF content: {e}") from e
+
+    def _shard_ranges(self, num_pages: int) -> list[tuple[int, int]]:
+        """Split a document into page ranges, or one range when it should be extracted serially."""
+        if self.extract_workers <= 1 or num_pages < self.parallel_min_pages:
+            return [(0, num_pages)]
+        # A couple of shards per worker evens out pages of uneven cost
+        shards = max(1, min(self.extract_workers * 2, num_pages // MIN_SHARD_PAGES))
+        size = -(-num_pages // shards)
+        return [(start, min(start + size, num_pages)) for start in range(0, num_pages, size)]
+
+    def _extract_parallel(
+        self, pdf_path: str, shards: list[tuple[int, int]], want: set[str]
+    ) -> list[dict[str, Any]] | None:
+        """Extract page ranges on the process pool, in order; None if the pool is unusable."""
+        try:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.extract_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                pool = self._pool
+            futures = [pool.submit(_extract_shard, pdf_path, start, stop, want) for start, stop in shards]
+            return [future.result() for future in futures]
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            logger.warning("PDF process pool unavailable, extracting serially: %s", e)
+            self.close()
+            return None
+
+    def close(self) -> None:
+        """Finish background extractions, then shut down the extraction process pool."""
+        with self._background_lock:
+            background, self._background = self._background, None
+        if background is not None:
+            background.shutdown(wait=True)
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    def extract_text(self, pdf_path: str) -> str:
+        """Extract text from PDF.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Extracted text content.
+        """
+        return self.extract_all(pdf_path, {"text"})["text"]
+
+    def extract_tables(self, pdf_path: str) -> list[dict[str, Any]]:
+        """Extract tables from PDF.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            List of tables, each as a list of rows.
+        """
+        return self.extract_all(pdf_path, {"tables"})["tables"]
 
-        return structure
+    def analyze_structure(self, pdf_path: str) -> dict[str, Any]:
+        """Analyze PDF structure (sections, headings, etc.).
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Dictionary with structure information.
+        """
+        return self.extract_all(pdf_path, {"structure"})["structure"]
 
     def _get_cache_text_path(self, pdf_path: str) -> Path:
         """Get text cache path for a PDF file.
@@ -379,6 +883,10 @@ class PDFParserService:
         pdf_stem = Path(pdf_path).stem
         return Path(pdf_path).parent / f"{pdf_stem}_tables.json"
     
+    def extracted_content_paths(self, pdf_path: str) -> tuple[str, str]:
+        """Return the (text, tables) cache file paths ``save_extracted_content`` writes."""
+        return str(self._get_cache_text_path(pdf_path)), str(self._get_cache_tables_path(pdf_path))
+
     def save_extracted_content(
         self,
         pdf_path: str,
@@ -419,9 +927,33 @@ class PDFParserService:
                 encoding="utf-8"
             )
             tmp_tables.rename(tables_path)
-        
+
         return str(text_path), str(tables_path)
 
+    def load_extracted_content(self, pdf_path: str) -> tuple[str, list[dict[str, Any]]] | None:
+        """Load text and tables saved by ``save_extracted_content``.
+
+        Args:
+            pdf_path: Path to PDF file.
+
+        Returns:
+            Tuple of (text, tables), or None if either cache file is missing
+            or older than the PDF.
+        """
+        import json
+
+        text_path = self._get_cache_text_path(pdf_path)
+        tables_path = self._get_cache_tables_path(pdf_path)
+        try:
+            pdf_mtime = Path(pdf_path).stat().st_mtime
+            if text_path.stat().st_mtime < pdf_mtime or tables_path.stat().st_mtime < pdf_mtime:
+                return None
+            text = text_path.read_text(encoding="utf-8")
+            tables = json.loads(tables_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return text, tables
+
     def cleanup_old_pdfs(self, cache_dir: str, days: int = 30) -> int:
         """Clean up PDFs and related cache files older than specified days.
 
@@ -0,0 +1,271 @@
+"""Adaptive per-endpoint rate limiting for hkexnews requests.
+
+Concurrent searches, batch screening and backfills can easily exceed what
+hkexnews tolerates. Each endpoint gets a token bucket (request rate) and an
+AIMD concurrency controller (requests in flight). Timeouts, 429s and 5xx
+responses halve both; a full window of successes raises them again, so bulk
+jobs settle at the highest throughput the site accepts without manual
+tuning. Current limits and observed latencies are available from
+``RateLimiter.stats()``.
+"""
+
+import asyncio
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+# Status codes that signal throttling or an overloaded server
+OVERLOAD_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Latency samples kept per endpoint
+LATENCY_WINDOW = 200
+
+
+@dataclass
+class RateLimitConfig:
+    """Per-endpoint limiter settings.
+
+    环境变量:
+        HKEX_RATE_LIMIT: 每个端点每秒最大请求数（默认 20）
+        HKEX_MAX_CONCURRENCY: 每个端点最大并发请求数（默认 16）
+    """
+
+    rate: float = 20.0
+    min_rate: float = 0.5
+    max_rate: float = 20.0
+    concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    # Multiplicative decrease applied to rate and concurrency on overload
+    backoff_factor: float = 0.5
+    # Additive increase applied after a full window of successes
+    rate_step: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "RateLimitConfig":
+        """Build a config from ``HKEX_RATE_LIMIT``/``HKEX_MAX_CONCURRENCY``."""
+        config = cls()
+        if value := os.getenv("HKEX_RATE_LIMIT"):
+            config.rate = config.max_rate = float(value)
+        if value := os.getenv("HKEX_MAX_CONCURRENCY"):
+            config.max_concurrency = int(value)
+            config.concurrency = min(config.concurrency, config.max_concurrency)
+        return config
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class EndpointLimiter:
+    """Token bucket plus AIMD concurrency controller for one endpoint.
+
+    Works from threads and from any number of event loops: sync callers block
+    on a condition variable, async callers await a future that ``release``
+    resolves on their own loop.
+    """
+
+    def __init__(self, name: str, config: RateLimitConfig):
+        """Initialize the limiter.
+
+        Args:
+            name: Endpoint name (for stats).
+            config: Limiter settings.
+        """
+        self.name = name
+        self.config = config
+        self.rate = config.rate
+        self.concurrency = float(config.concurrency)
+        self.in_flight = 0
+
+        self._tokens = max(1.0, config.rate)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._cond = threading.Condition()
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        self.requests = 0
+        self.overloads = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def _reserve(self) -> float:
+        """Try to take a concurrency slot and a token (lock held).
+
+        Returns:
+            0 if both were taken, otherwise seconds to wait before retrying
+            (``inf`` when waiting for a slot to be released).
+        """
+        if self.in_flight >= int(self.concurrency):
+            return float("inf")
+
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            return (1.0 - self._tokens) / self.rate
+
+        self._tokens -= 1.0
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self) -> float:
+        """Block until a request may be sent.
+
+        Returns:
+            Monotonic start time to pass to ``release``.
+        """
+        with self._cond:
+            while (wait := self._reserve()) > 0:
+                self._cond.wait(None if wait == float("inf") else wait)
+        return time.monotonic()
+
+    async def acquire_async(self) -> float:
+        """Wait without blocking the event loop until a request may be sent.
+
+        Returns:
+            Monotonic start time to pass to ``release``.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._reserve()
+                if wait == 0:
+                    return time.monotonic()
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            try:
+                timeout = None if wait == float("inf") else wait
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except TimeoutError:
+                pass
+
+    def release(
+        self,
+        started: float,
+        response: httpx.Response | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Free the slot and adapt the limits to the outcome.
+
+        Args:
+            started: Value returned by ``acquire``/``acquire_async``.
+            response: Response received, if any.
+            error: Exception raised instead of a response, if any.
+        """
+        overloaded = isinstance(error, httpx.TimeoutException) or (
+            response is not None and response.status_code in OVERLOAD_STATUS_CODES
+        )
+        succeeded = error is None and not overloaded
+
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+            if succeeded:
+                self._latencies.append(time.monotonic() - started)
+                self._successes += 1
+                # Additive increase once per window of int(concurrency) successes
+                if self._successes >= max(1, int(self.concurrency)):
+                    self._successes = 0
+                    self.concurrency = min(self.config.max_concurrency, self.concurrency + 1)
+                    self.rate = min(self.config.max_rate, self.rate + self.config.rate_step)
+            elif overloaded:
+                self.overloads += 1
+                self._successes = 0
+                self.concurrency = max(self.config.min_concurrency, self.concurrency * self.config.backoff_factor)
+                self.rate = max(self.config.min_rate, self.rate * self.config.backoff_factor)
+                self._tokens = min(self._tokens, 0.0)
+                if response is not None and (delay := retry_after_seconds(response.headers.get("Retry-After"))):
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, future)
+
+    def stats(self) -> dict[str, Any]:
+        """Return current limits and observed latencies."""
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = {
+                "rate": round(self.rate, 3),
+                "concurrency": int(self.concurrency),
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "overloads": self.overloads,
+            }
+        if latencies:
+            stats["latency_ms"] = {
+                "mean": round(statistics.fmean(latencies) * 1000, 2),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2),
+            }
+        return stats
+
+
+class RateLimiter:
+    """Registry of per-endpoint limiters sharing one configuration."""
+
+    def __init__(self, config: RateLimitConfig | None = None):
+        """Initialize the registry.
+
+        Args:
+            config: Settings applied to every endpoint (default: ``RateLimitConfig.from_env()``).
+        """
+        self.config = config or RateLimitConfig.from_env()
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointLimiter] = {}
+
+    def endpoint(self, name: str) -> EndpointLimiter:
+        """Return the limiter for an endpoint, creating it on first use."""
+        with self._lock:
+            limiter = self._endpoints.get(name)
+            if limiter is None:
+                limiter = self._endpoints[name] = EndpointLimiter(name, self.config)
+            return limiter
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return limits and latencies for every endpoint used so far."""
+        with self._lock:
+            endpoints = dict(self._endpoints)
+        return {name: limiter.stats() for name, limiter in sorted(endpoints.items())}
+
+
+_default_limiter: RateLimiter | None = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide ``RateLimiter``."""
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_limiter_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter()
+    return _default_limiter
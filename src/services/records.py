@@ -0,0 +1,182 @@
+"""Compact in-memory announcement records.
+
+Title-search rows are dicts with the same dozen keys, and every row decoded
+from JSON carries its own copies of the stock code, stock name and category
+strings. A multi-year history for hundreds of issuers therefore costs
+hundreds of megabytes, mostly in per-row dict tables and duplicate strings.
+
+``Announcement`` stores a row in ``__slots__`` with the low-cardinality
+values (stock codes and names, file types, category codes and texts)
+interned, and remembers the row's key order as a shared tuple, so
+``to_dict`` gives back exactly the dict it was built from. Tools keep
+working on dicts; long-lived collections hold records.
+"""
+
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+# Dict key → slot, for the keys title searches, the latest feed conversion
+# and the local index use
+_SLOTS = {
+    "NEWS_ID": "news_id",
+    "STOCK_CODE": "stock_code",
+    "STOCK_NAME": "stock_name",
+    "TITLE": "title",
+    "FILE_TYPE": "file_type",
+    "FILE_INFO": "file_info",
+    "FILE_LINK": "file_link",
+    "DATE_TIME": "date_time",
+    "SHORT_TEXT": "short_text",
+    "LONG_TEXT": "long_text",
+    "MARKET": "market",
+    "T1_CODE": "t1_code",
+    "t1Code": "t1_code",
+    "T2_CODE": "t2_code",
+    "t2Code": "t2_code",
+}
+
+# Slots whose values repeat across rows
+_INTERNED = frozenset(
+    {"stock_code", "stock_name", "file_type", "short_text", "long_text", "market", "t1_code", "t2_code"}
+)
+
+# Distinct key orders shared between records (rows have only a handful)
+_MAX_LAYOUTS = 1024
+_layouts: dict[tuple[str, ...], tuple[tuple[str, ...], tuple[str | None, ...]]] = {}
+
+
+def _layout(keys: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[str | None, ...]]:
+    """Return the shared (keys, slots) pair for a key order; None marks keys kept in ``_extra``."""
+    layout = _layouts.get(keys)
+    if layout is None:
+        slots: list[str | None] = []
+        for key in keys:
+            slot = _SLOTS.get(key)
+            slots.append(slot if slot is not None and slot not in slots else None)
+        layout = (tuple(sys.intern(key) for key in keys), tuple(slots))
+        if len(_layouts) < _MAX_LAYOUTS:
+            layout = _layouts.setdefault(keys, layout)
+    return layout
+
+
+class Announcement:
+    """One announcement row, stored compactly.
+
+    Values are read with ``record["TITLE"]`` / ``record.get("TITLE")`` using
+    the original dict keys, or as attributes (``record.title``) when present.
+    """
+
+    __slots__ = (
+        "_layout",
+        "_extra",
+        "news_id",
+        "stock_code",
+        "stock_name",
+        "title",
+        "file_type",
+        "file_info",
+        "file_link",
+        "date_time",
+        "short_text",
+        "long_text",
+        "market",
+        "t1_code",
+        "t2_code",
+    )
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "Announcement":
+        """Build a record from an announcement dict (unknown keys are kept too)."""
+        record = cls.__new__(cls)
+        layout = _layout(tuple(item))
+        record._layout = layout
+        extra = None
+        for key, slot, value in zip(layout[0], layout[1], item.values()):
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if slot in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(record, slot, value)
+        record._extra = extra
+        return record
+
+    def to_dict(self, fields: Sequence[str] | None = None) -> dict[str, Any]:
+        """Return the row as the dict it was built from.
+
+        Args:
+            fields: Keys to keep (default: all, in the original order).
+        """
+        keys, slots = self._layout
+        extra = self._extra
+        row = {
+            key: getattr(self, slot) if slot is not None else extra[key]  # type: ignore[index]
+            for key, slot in zip(keys, slots)
+        }
+        if fields:
+            return {field: row[field] for field in fields if field in row}
+        return row
+
+    def keys(self) -> tuple[str, ...]:
+        """Return the dict keys of the row, in order."""
+        return self._layout[0]
+
+    def __getitem__(self, key: str) -> Any:
+        keys, slots = self._layout
+        try:
+            slot = slots[keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+        return getattr(self, slot) if slot is not None else self._extra[key]  # type: ignore[index]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a value by dict key, or ``default``."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layout[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout[0])
+
+    def __len__(self) -> int:
+        return len(self._layout[0])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Announcement):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Announcement({self.to_dict()!r})"
+
+
+def pack(items: Iterable[Any]) -> list[Any]:
+    """Convert announcement rows (dicts with NEWS_ID) to records; other items are kept as-is."""
+    return [Announcement.from_dict(item) if isinstance(item, dict) and "NEWS_ID" in item else item for item in items]
+
+
+def unpack(items: Iterable[Any], fields: Sequence[str] | None = None) -> list[dict[str, Any]]:
+    """Convert records back to dicts, optionally projected to ``fields``.
+
+    Plain dicts are projected too; without ``fields`` they are returned as-is.
+    """
+    rows = []
+    for item in items:
+        if isinstance(item, Announcement):
+            rows.append(item.to_dict(fields))
+        elif fields:
+            rows.append({field: item[field] for field in fields if field in item})
+        else:
+            rows.append(item)
+    return rows
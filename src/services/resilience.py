@@ -0,0 +1,297 @@
+"""Retries, circuit breaking and typed errors for hkexnews requests.
+
+Every failure used to surface as ``[{"error": str(e)}]`` after a single
+attempt, so one transient connection reset cost the LLM a full turn deciding
+whether to try again. Idempotent GETs are now retried with jittered
+exponential backoff, a per-endpoint circuit breaker fails fast while
+hkexnews is down, and failures are raised as typed ``HKEXError`` subclasses
+whose ``to_dict()`` gives tools a compact, structured error entry.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class HKEXError(Exception):
+    """Base class for structured HKEX service errors."""
+
+    kind = "error"
+    retryable = False
+
+    def __init__(self, message: str, endpoint: str | None = None, attempts: int = 1):
+        """Initialize the error.
+
+        Args:
+            message: Human-readable description.
+            endpoint: Endpoint name ("prefix", "search", ...), if known.
+            attempts: Number of attempts made before giving up.
+        """
+        super().__init__(message)
+        self.message = message
+        self.endpoint = endpoint
+        self.attempts = attempts
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a compact error entry for tool results."""
+        entry = {"error": self.message, "error_type": self.kind}
+        if self.endpoint:
+            entry["endpoint"] = self.endpoint
+        if self.attempts > 1:
+            entry["attempts"] = self.attempts
+        return entry
+
+
+class HKEXTimeoutError(HKEXError):
+    """The request timed out."""
+
+    kind = "timeout"
+    retryable = True
+
+
+class HKEXConnectionError(HKEXError):
+    """The connection failed or was reset."""
+
+    kind = "connection"
+    retryable = True
+
+
+class HKEXHTTPStatusError(HKEXError):
+    """hkexnews answered with an error status."""
+
+    kind = "http_status"
+
+    def __init__(self, status_code: int, message: str, endpoint: str | None = None, attempts: int = 1):
+        """Initialize the error.
+
+        Args:
+            status_code: HTTP status code.
+            message: Human-readable description.
+            endpoint: Endpoint name, if known.
+            attempts: Number of attempts made before giving up.
+        """
+        super().__init__(message, endpoint, attempts)
+        self.status_code = status_code
+        self.retryable = status_code in RETRYABLE_STATUS_CODES
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a compact error entry including the status code."""
+        return {**super().to_dict(), "status_code": self.status_code}
+
+
+class HKEXParseError(HKEXError):
+    """The response could not be parsed."""
+
+    kind = "parse"
+
+
+class HKEXCircuitOpenError(HKEXError):
+    """The endpoint's circuit breaker is open; the request was not sent."""
+
+    kind = "circuit_open"
+
+
+def classify_error(error: Exception, endpoint: str | None = None, attempts: int = 1) -> HKEXError:
+    """Convert any exception raised while fetching or parsing into an ``HKEXError``."""
+    if isinstance(error, HKEXError):
+        return error
+    if isinstance(error, httpx.TimeoutException):
+        return HKEXTimeoutError(f"Request timed out: {error}", endpoint, attempts)
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return HKEXHTTPStatusError(status_code, f"HTTP {status_code} from hkexnews", endpoint, attempts)
+    if isinstance(error, httpx.TransportError):
+        return HKEXConnectionError(f"Connection failed: {error}", endpoint, attempts)
+    if isinstance(error, (json.JSONDecodeError, ValueError, KeyError, TypeError, AttributeError)):
+        return HKEXParseError(f"Unexpected response format: {error}", endpoint, attempts)
+    return HKEXError(str(error), endpoint, attempts)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry settings for idempotent GETs.
+
+    环境变量:
+        HKEX_RETRY_ATTEMPTS: 最大尝试次数，含首次请求（默认 3）
+        HKEX_RETRY_BASE_DELAY: 退避基准时间，秒（默认 0.5）
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from ``HKEX_RETRY_*`` environment variables."""
+        policy = cls()
+        if value := os.getenv("HKEX_RETRY_ATTEMPTS"):
+            policy.max_attempts = max(1, int(value))
+        if value := os.getenv("HKEX_RETRY_BASE_DELAY"):
+            policy.base_delay = float(value)
+        return policy
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the delay before the next attempt ("full jitter" exponential backoff).
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based).
+            retry_after: Server-requested delay (Retry-After), honoured up to ``max_delay``.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))  # noqa: S311
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+@dataclass
+class BreakerConfig:
+    """Circuit breaker settings.
+
+    环境变量:
+        HKEX_BREAKER_THRESHOLD: 连续失败多少次后熔断（默认 5）
+        HKEX_BREAKER_RESET_SECONDS: 熔断后多久允许试探请求，秒（默认 30）
+    """
+
+    failure_threshold: int = 5
+    reset_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "BreakerConfig":
+        """Build a config from ``HKEX_BREAKER_*`` environment variables."""
+        config = cls()
+        if value := os.getenv("HKEX_BREAKER_THRESHOLD"):
+            config.failure_threshold = max(1, int(value))
+        if value := os.getenv("HKEX_BREAKER_RESET_SECONDS"):
+            config.reset_seconds = float(value)
+        return config
+
+
+class CircuitBreaker:
+    """Closed → open → half-open breaker for one endpoint.
+
+    Opens after ``failure_threshold`` consecutive retryable failures. While
+    open, requests fail immediately; after ``reset_seconds`` a single trial
+    request is let through (half-open) and its outcome closes or reopens it.
+    """
+
+    def __init__(self, name: str, config: BreakerConfig):
+        """Initialize a closed breaker.
+
+        Args:
+            name: Endpoint name.
+            config: Breaker settings.
+        """
+        self.name = name
+        self.config = config
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.times_opened = 0
+        self.retries = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raise ``HKEXCircuitOpenError`` unless a request may be sent now."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            remaining = self.opened_at + self.config.reset_seconds - time.monotonic()
+            if remaining <= 0 and not self._trial_in_flight:
+                self.state = "half_open"
+                self._trial_in_flight = True
+                return
+        raise HKEXCircuitOpenError(
+            f"hkexnews {self.name} endpoint is failing; retry in {max(0.0, remaining):.0f}s", self.name
+        )
+
+    def record_success(self) -> None:
+        """Close the breaker after a request that reached a responsive server."""
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a retryable failure and open the breaker at the threshold."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.config.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot after a request that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_retry(self) -> None:
+        """Count a retry issued for this endpoint."""
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return breaker state and retry counters."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "retries": self.retries,
+            }
+
+
+class Resilience:
+    """Retry policy plus per-endpoint circuit breakers."""
+
+    def __init__(self, retry: RetryPolicy | None = None, breaker: BreakerConfig | None = None):
+        """Initialize the registry.
+
+        Args:
+            retry: Retry policy (default: ``RetryPolicy.from_env()``).
+            breaker: Breaker settings for every endpoint (default: ``BreakerConfig.from_env()``).
+        """
+        self.retry = retry or RetryPolicy.from_env()
+        self.breaker_config = breaker or BreakerConfig.from_env()
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Return the breaker for an endpoint, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, self.breaker_config)
+            return breaker
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return breaker state and retry counts for every endpoint used so far."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in sorted(breakers.items())}
+
+
+_default_resilience: Resilience | None = None
+_default_resilience_lock = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """Return the process-wide ``Resilience``."""
+    global _default_resilience
+    if _default_resilience is None:
+        with _default_resilience_lock:
+            if _default_resilience is None:
+                _default_resilience = Resilience()
+    return _default_resilience
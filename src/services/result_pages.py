@@ -0,0 +1,155 @@
+"""Server-side result sets for paging through tool results.
+
+A search can return up to hundreds of announcements, and all of them used to
+land in the tool message, where they inflated every later model call.
+Tools now return one page (optionally projected to a few fields) plus an
+opaque ``next_page_cursor``; the full result set stays here, in a bounded
+in-memory LRU and packed into compact ``Announcement`` records, so the model
+can fetch later pages without repeating the search.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.services.records import pack, unpack
+
+DEFAULT_MAX_RESULT_SETS = 128
+DEFAULT_TTL_SECONDS = 30 * 60
+
+
+@dataclass
+class _ResultSet:
+    items: list[dict[str, Any]]
+    meta: dict[str, Any]
+    fields: tuple[str, ...] | None
+    expires_at: float
+
+
+def project(items: list[dict[str, Any]], fields: Sequence[str] | None) -> list[dict[str, Any]]:
+    """Keep only the given keys of each item (all keys when ``fields`` is empty or None)."""
+    if not fields:
+        return items
+    return unpack(items, fields)
+
+
+class ResultPages:
+    """Bounded LRU of result sets addressed by opaque page cursors."""
+
+    def __init__(self, max_result_sets: int = DEFAULT_MAX_RESULT_SETS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """Initialize the store.
+
+        Args:
+            max_result_sets: Result sets kept before the least recently used is dropped.
+            ttl_seconds: Lifetime of a result set after its last use.
+        """
+        self.max_result_sets = max_result_sets
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._sets: OrderedDict[str, _ResultSet] = OrderedDict()
+
+    def first_page(
+        self,
+        items: list[dict[str, Any]],
+        limit: int,
+        fields: Sequence[str] | None = None,
+        meta: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Return the first page of a result set, storing the rest for later pages.
+
+        Args:
+            items: Full result set.
+            limit: Items per page.
+            fields: Keys to keep per item (default: all).
+            meta: Extra keys repeated in every page (e.g. stock_code).
+
+        Returns:
+            Page dictionary (see ``_page``).
+        """
+        limit = max(1, limit)
+        result_set = _ResultSet(items, dict(meta or {}), tuple(fields) if fields else None, 0.0)
+        result_id = None
+        if len(items) > limit:
+            result_set.items = pack(items)
+            result_id = self._store(result_set)
+        return self._page(result_id, result_set, 0, limit, result_set.fields)
+
+    def next_page(self, cursor: str, limit: int, fields: Sequence[str] | None = None) -> dict[str, Any] | None:
+        """Return the page a cursor points at.
+
+        Args:
+            cursor: ``next_page_cursor`` from a previous page.
+            limit: Items per page.
+            fields: Keys to keep per item (default: those of the first page).
+
+        Returns:
+            Page dictionary, or None if the cursor is malformed or expired.
+        """
+        result_id, _, offset = cursor.partition(":")
+        if not offset.isdigit():
+            return None
+        with self._lock:
+            self._evict_expired()
+            result_set = self._sets.get(result_id)
+            if result_set is None:
+                return None
+            self._sets.move_to_end(result_id)
+            result_set.expires_at = time.monotonic() + self.ttl_seconds
+        return self._page(result_id, result_set, int(offset), max(1, limit), tuple(fields) if fields else result_set.fields)
+
+    @staticmethod
+    def _page(
+        result_id: str | None, result_set: _ResultSet, offset: int, limit: int, fields: tuple[str, ...] | None
+    ) -> dict[str, Any]:
+        """Build a page with items, count, total and next_page_cursor (None on the last page)."""
+        items = result_set.items[offset : offset + limit]
+        end = offset + len(items)
+        return {
+            **result_set.meta,
+            "announcements": unpack(items, fields),
+            "count": len(items),
+            "total": len(result_set.items),
+            "next_page_cursor": f"{result_id}:{end}" if result_id and end < len(result_set.items) else None,
+        }
+
+    def _store(self, result_set: _ResultSet) -> str:
+        result_id = secrets.token_urlsafe(6)
+        result_set.expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._evict_expired()
+            self._sets[result_id] = result_set
+            while len(self._sets) > self.max_result_sets:
+                self._sets.popitem(last=False)
+        return result_id
+
+    def _evict_expired(self) -> None:
+        """Drop expired result sets (lock held)."""
+        now = time.monotonic()
+        for result_id in [rid for rid, result_set in self._sets.items() if result_set.expires_at <= now]:
+            del self._sets[result_id]
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of stored result sets and items."""
+        with self._lock:
+            return {
+                "result_sets": len(self._sets),
+                "items": sum(len(result_set.items) for result_set in self._sets.values()),
+            }
+
+
+_default_pages: ResultPages | None = None
+_default_pages_lock = threading.Lock()
+
+
+def get_result_pages() -> ResultPages:
+    """Return the process-wide ``ResultPages``."""
+    global _default_pages
+    if _default_pages is None:
+        with _default_pages_lock:
+            if _default_pages is None:
+                _default_pages = ResultPages()
+    return _default_pages
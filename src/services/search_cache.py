@@ -0,0 +1,325 @@
+"""Immutable-window cache for announcement title searches.
+
+Announcements published before today can no longer change, so a search
+window that ends before the current Hong Kong date is immutable. Searches are
+split into calendar-month windows; months that ended before the current one
+are served from a SQLite cache under the agent cache directory and only the
+open tail (the current month onwards) is refetched.
+
+titleSearchServlet.do returns at most 500 rows per query. Windows that hit the
+cap are narrowed with ``split_window`` and fetched again, so long or busy
+ranges come back complete instead of silently truncated.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_service_cache_dir
+
+# Hong Kong has no daylight saving time, so a fixed offset is exact
+HK_TZ = timezone(timedelta(hours=8))
+
+# Maximum rowRange accepted by titleSearchServlet.do
+MAX_ROW_RANGE = 500
+
+DATE_FORMAT = "%Y%m%d"
+
+# Sub-window searches run in parallel per search_announcements call
+DEFAULT_SEARCH_CONCURRENCY = 4
+
+
+def hk_today() -> date:
+    """Return the current date in Hong Kong."""
+    return datetime.now(HK_TZ).date()
+
+
+def parse_search_date(value: str) -> date:
+    """Parse a YYYYMMDD search date."""
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+def announcement_date(item: dict[str, Any]) -> date | None:
+    """Return the publication date of a search result row.
+
+    Args:
+        item: Announcement dictionary with DATE_TIME in "dd/mm/yyyy HH:MM" format.
+
+    Returns:
+        Publication date, or None if DATE_TIME is missing or malformed.
+    """
+    try:
+        return datetime.strptime(item["DATE_TIME"].split()[0], "%d/%m/%Y").date()
+    except (KeyError, AttributeError, IndexError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class SearchWindow:
+    """Inclusive date window for a title search."""
+
+    start: date
+    end: date
+
+    @property
+    def from_date(self) -> str:
+        """Start date in YYYYMMDD format."""
+        return self.start.strftime(DATE_FORMAT)
+
+    @property
+    def to_date(self) -> str:
+        """End date in YYYYMMDD format."""
+        return self.end.strftime(DATE_FORMAT)
+
+    def contains(self, day: date) -> bool:
+        """Check whether a date falls inside the window."""
+        return self.start <= day <= self.end
+
+
+@dataclass
+class SearchPlan:
+    """Windows needed to answer one search request.
+
+    Attributes:
+        closed: Immutable month windows, oldest first.
+        tail: Open window from the current month onwards (never cached), if any.
+    """
+
+    closed: list[SearchWindow]
+    tail: SearchWindow | None
+
+
+def month_windows(start: date, end: date) -> list[SearchWindow]:
+    """Split [start, end] at calendar-month boundaries, oldest first.
+
+    The first window starts on the first day of start's month; the last one
+    is clipped at end.
+    """
+    windows: list[SearchWindow] = []
+    month_start = start.replace(day=1)
+    while month_start <= end:
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        windows.append(SearchWindow(month_start, min(next_month - timedelta(days=1), end)))
+        month_start = next_month
+    return windows
+
+
+def plan_search_windows(start: date, end: date, today: date | None = None) -> SearchPlan:
+    """Split a search range into cacheable month windows and an open tail.
+
+    Closed windows cover calendar months that ended before the current one,
+    so a rolling lookback keeps reusing the same cache keys; results are
+    filtered back to the requested range after merging. The current month is
+    still growing, so it always belongs to the open tail instead of being
+    cached under a key that would change every day.
+
+    Args:
+        start: First requested date.
+        end: Last requested date.
+        today: Current Hong Kong date (default: ``hk_today()``).
+
+    Returns:
+        The search plan.
+    """
+    today = today or hk_today()
+    current_month = today.replace(day=1)
+    closed = month_windows(start, min(end, current_month - timedelta(days=1)))
+    tail = SearchWindow(max(start, current_month), end) if end >= current_month else None
+    return SearchPlan(closed=closed, tail=tail)
+
+
+def contiguous_runs(windows: list[SearchWindow]) -> list[list[SearchWindow]]:
+    """Group adjacent windows so each run can be fetched with one request."""
+    runs: list[list[SearchWindow]] = []
+    for window in windows:
+        if runs and runs[-1][-1].end + timedelta(days=1) == window.start:
+            runs[-1].append(window)
+        else:
+            runs.append([window])
+    return runs
+
+
+def split_window(window: SearchWindow) -> list[SearchWindow]:
+    """Narrow a saturated window into smaller ones.
+
+    Windows spanning several calendar months are split at month boundaries
+    (so the pieces line up with cache keys); shorter windows are halved.
+
+    Args:
+        window: Window whose search hit the row cap.
+
+    Returns:
+        Sub-windows covering the window, oldest first; empty for a single day.
+    """
+    if window.start.replace(day=1) != window.end.replace(day=1):
+        pieces = month_windows(window.start, window.end)
+        return [SearchWindow(max(piece.start, window.start), piece.end) for piece in pieces]
+    if window.start == window.end:
+        return []
+    middle = window.start + (window.end - window.start) // 2
+    return [SearchWindow(window.start, middle), SearchWindow(middle + timedelta(days=1), window.end)]
+
+
+def dedupe_by_news_id(announcements: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Drop repeated rows, keeping the first occurrence of each NEWS_ID."""
+    seen = set()
+    unique = []
+    for item in announcements:
+        news_id = item.get("NEWS_ID")
+        if news_id:
+            if news_id in seen:
+                continue
+            seen.add(news_id)
+        unique.append(item)
+    return unique
+
+
+def merge_window_results(results: dict[SearchWindow, list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Concatenate results of disjoint windows newest first, without duplicates."""
+    merged = []
+    for window in sorted(results, key=lambda window: window.start, reverse=True):
+        merged.extend(results[window])
+    return dedupe_by_news_id(merged)
+
+
+def bucket_by_window(
+    announcements: list[dict[str, Any]], windows: list[SearchWindow]
+) -> dict[SearchWindow, list[dict[str, Any]]]:
+    """Distribute search results over the windows they were published in.
+
+    Rows with an unparseable date are kept with the newest window.
+    """
+    buckets: dict[SearchWindow, list[dict[str, Any]]] = {window: [] for window in windows}
+    for item in announcements:
+        day = announcement_date(item)
+        target = windows[-1]
+        if day is not None:
+            target = next((window for window in windows if window.contains(day)), windows[-1])
+        buckets[target].append(item)
+    return buckets
+
+
+def filter_by_range(announcements: list[dict[str, Any]], start: date, end: date) -> list[dict[str, Any]]:
+    """Keep rows published within [start, end] (rows without a date are kept)."""
+    filtered = []
+    for item in announcements:
+        day = announcement_date(item)
+        if day is None or start <= day <= end:
+            filtered.append(item)
+    return filtered
+
+
+class SearchWindowCache:
+    """SQLite store of search results for immutable windows."""
+
+    def __init__(self, db_path: str | Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite file path (default: <cache dir>/search_windows.sqlite3).
+                Use ":memory:" for a process-local cache.
+        """
+        if db_path is None:
+            db_path = get_service_cache_dir() / "search_windows.sqlite3"
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_windows ("
+            " cache_key TEXT PRIMARY KEY,"
+            " announcements TEXT NOT NULL,"
+            " saturated INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        stock_id: Any,
+        market: str,
+        title: str | None,
+        document_type: int,
+        lang: str,
+        window: SearchWindow,
+    ) -> str:
+        """Build the cache key for one search window."""
+        return json.dumps(
+            [str(stock_id), market, title or "", document_type, lang, window.from_date, window.to_date],
+            ensure_ascii=False,
+        )
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """Return cached announcements for a window key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT announcements FROM search_windows WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, announcements: list[dict[str, Any]], saturated: bool = False) -> None:
+        """Store announcements for an immutable window.
+
+        Args:
+            key: Key from ``make_key``.
+            announcements: Search results for the window.
+            saturated: Whether the window hit the row cap (results may be incomplete).
+        """
+        payload = json.dumps(announcements, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_windows VALUES (?, ?, ?, ?)",
+                (key, payload, int(saturated), time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached window and reset statistics."""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_windows")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and windows.
+        """
+        with self._lock:
+            windows = self._conn.execute("SELECT COUNT(*) FROM search_windows").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "windows": windows,
+            }
+
+
+_default_cache: SearchWindowCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_search_window_cache() -> SearchWindowCache:
+    """Return the process-wide ``SearchWindowCache``."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = SearchWindowCache()
+    return _default_cache
@@ -0,0 +1,149 @@
+"""Single-flight coalescing of duplicate in-flight requests.
+
+The main agent and the ``pdf-analyzer``/``report-generator`` subagents often
+ask for the same stock ID, search window or PDF at almost the same moment.
+``SingleFlight`` lets the first caller for a key do the work while identical
+concurrent callers wait for and share its result (or exception). Nothing is
+cached: once the call finishes, the next caller starts a fresh one.
+
+Threads use ``do()``; coroutines use ``ado()``, which coalesces callers on the
+same event loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared async flight whose leader was cancelled; followers start over."""
+
+
+class _Call:
+    """An in-flight sync call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self):
+        """Initialize an empty call table."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._async_calls: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Future]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless an identical call is in flight, then share its outcome.
+
+        Args:
+            key: Normalized request key.
+            fn: Zero-argument function performing the request.
+
+        Returns:
+            The result of ``fn`` (from this call or the one in flight).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` unless an identical call is in flight on this loop, then share its outcome.
+
+        Args:
+            key: Normalized request key.
+            fn: Zero-argument coroutine function performing the request.
+
+        Returns:
+            The result of ``fn()`` (from this call or the one in flight).
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            future = calls.get(key)
+            leader = future is None
+            if leader:
+                future = calls[key] = loop.create_future()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Only the leader was cancelled: retry, the first follower back becomes the leader
+                return await self.ado(key, fn)
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Never cancel the shared future: followers were not cancelled themselves
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no caller was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                calls.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of executed calls and calls served by a shared flight."""
+        with self._lock:
+            in_flight = len(self._calls) + sum(len(calls) for calls in self._async_calls.values())
+            return {"calls": self.calls, "shared": self.shared, "in_flight": in_flight}
+
+
+_default_flight: SingleFlight | None = None
+_default_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide ``SingleFlight``."""
+    global _default_flight
+    if _default_flight is None:
+        with _default_flight_lock:
+            if _default_flight is None:
+                _default_flight = SingleFlight()
+    return _default_flight
@@ -0,0 +1,162 @@
+"""Persistent stock code → stockId resolution cache.
+
+``search_hkex_announcements`` needs the internal HKEX ``stockId`` before every
+search, which used to cost an extra ``prefix.do`` round-trip per call. Stock
+IDs almost never change, so resolved IDs are kept in a small SQLite database
+under the agent cache directory, fronted by an in-memory dict so warm lookups
+take microseconds.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.config.agent_config import get_service_cache_dir
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+
+
+class StockIdCache:
+    """SQLite-backed stock code → (stockId, stock_info) cache with a TTL.
+
+    环境变量:
+        HKEX_STOCK_ID_TTL_DAYS: 缓存有效期，天（默认 7）
+    """
+
+    def __init__(self, db_path: str | Path | None = None, ttl_seconds: float | None = None):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite file path (default: <cache dir>/stock_ids.sqlite3).
+                Use ":memory:" for a process-local cache.
+            ttl_seconds: Entry lifetime in seconds (default: HKEX_STOCK_ID_TTL_DAYS or 7 days).
+        """
+        if ttl_seconds is None:
+            ttl_days = os.getenv("HKEX_STOCK_ID_TTL_DAYS")
+            ttl_seconds = float(ttl_days) * 24 * 60 * 60 if ttl_days else DEFAULT_TTL_SECONDS
+        self.ttl_seconds = ttl_seconds
+
+        if db_path is None:
+            db_path = get_service_cache_dir() / "stock_ids.sqlite3"
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stock_ids ("
+            " stock_code TEXT PRIMARY KEY,"
+            " stock_id TEXT NOT NULL,"
+            " stock_info TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        # In-memory front: stock_code -> (stock_id, stock_info, updated_at)
+        self._memory: dict[str, tuple[Any, list[dict[str, Any]], float]] = {}
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> None:
+        """Load every row into memory on first use."""
+        rows = self._conn.execute("SELECT stock_code, stock_id, stock_info, updated_at FROM stock_ids").fetchall()
+        for stock_code, stock_id, stock_info, updated_at in rows:
+            self._memory[stock_code] = (json.loads(stock_id), json.loads(stock_info), updated_at)
+        self._loaded = True
+
+    def get(self, stock_code: str) -> tuple[Any, list[dict[str, Any]]] | None:
+        """Look up a stock code.
+
+        Args:
+            stock_code: 5-digit stock code (e.g., "00673").
+
+        Returns:
+            Tuple of (stock_id, stock_info_list), or None on a miss or expired entry.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._memory.get(stock_code)
+            if entry is None or time.time() - entry[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, stock_code: str, stock_id: Any, stock_info: list[dict[str, Any]]) -> None:
+        """Store a resolved stock code.
+
+        Args:
+            stock_code: 5-digit stock code.
+            stock_id: Internal HKEX stock ID.
+            stock_info: Stock info list as returned by ``get_stock_id``.
+        """
+        self.put_many([(stock_code, stock_id, stock_info)])
+
+    def put_many(self, entries: list[tuple[str, Any, list[dict[str, Any]]]]) -> int:
+        """Store many resolved stock codes in one transaction.
+
+        Args:
+            entries: List of (stock_code, stock_id, stock_info) tuples.
+
+        Returns:
+            Number of entries written.
+        """
+        now = time.time()
+        rows = [
+            (stock_code, json.dumps(stock_id), json.dumps(stock_info, ensure_ascii=False), now)
+            for stock_code, stock_id, stock_info in entries
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO stock_ids VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+            if self._loaded:
+                for stock_code, stock_id, stock_info in entries:
+                    self._memory[stock_code] = (stock_id, stock_info, now)
+        return len(rows)
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset statistics."""
+        with self._lock:
+            self._conn.execute("DELETE FROM stock_ids")
+            self._conn.commit()
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._memory),
+            }
+
+
+_default_cache: StockIdCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_stock_id_cache() -> StockIdCache:
+    """Return the process-wide ``StockIdCache``."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = StockIdCache()
+    return _default_cache
@@ -0,0 +1,184 @@
+"""Background watcher that pre-warms the PDF cache for a watchlist.
+
+Users tend to ask about an announcement minutes after it is published, and
+the first question used to pay for search, download and extraction in
+sequence. ``AnnouncementWatcher`` polls the latest-announcements feed
+(incrementally, via its cursor), picks out items for watched stocks or
+categories, downloads their PDFs into the cache layout the PDF tools use and
+saves the extracted text and tables next to them, so interactive sessions
+start from a warm cache.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.services.hkex_api import HKEXAPIService
+from src.services.pdf_parser import PDFParserService, format_date_for_filename
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_SECONDS = 60
+DEFAULT_WATCH_CONCURRENCY = 4
+
+
+@dataclass
+class Watchlist:
+    """Stocks and categories to watch.
+
+    Attributes:
+        stock_codes: 5-digit stock codes.
+        t1_codes: Tier 1 category codes.
+        t2_codes: Tier 2 category codes.
+    """
+
+    stock_codes: set[str] = field(default_factory=set)
+    t1_codes: set[str] = field(default_factory=set)
+    t2_codes: set[str] = field(default_factory=set)
+
+    @classmethod
+    def parse(cls, text: str) -> "Watchlist":
+        """Parse a watchlist file.
+
+        One entry per line; "#" starts a comment. Plain entries are stock
+        codes (zero-padded to 5 digits), "t1:<code>" and "t2:<code>" are
+        category codes. Commas also separate entries.
+        """
+        watchlist = cls()
+        for line in text.splitlines():
+            for entry in line.split("#", 1)[0].split(","):
+                entry = entry.strip()
+                if not entry:
+                    continue
+                prefix, _, code = entry.partition(":")
+                if code and prefix.lower() == "t1":
+                    watchlist.t1_codes.add(code.strip())
+                elif code and prefix.lower() == "t2":
+                    watchlist.t2_codes.add(code.strip())
+                else:
+                    watchlist.stock_codes.add(entry.zfill(5) if entry.isdigit() else entry)
+        return watchlist
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Watchlist":
+        """Read and parse a watchlist file."""
+        return cls.parse(Path(path).read_text(encoding="utf-8"))
+
+    def matches(self, item: dict[str, Any]) -> list[str]:
+        """Return the stock codes a latest-feed item should be cached under, or [] if unwatched.
+
+        Category matches are cached under every stock the item lists.
+        """
+        codes = [stock.get("sc", "") for stock in item.get("stock", []) if stock.get("sc")]
+        if str(item.get("t1Code")) in self.t1_codes or str(item.get("t2Code")) in self.t2_codes:
+            return codes
+        return [code for code in codes if code in self.stock_codes]
+
+    def __bool__(self) -> bool:
+        return bool(self.stock_codes or self.t1_codes or self.t2_codes)
+
+
+class AnnouncementWatcher:
+    """Polls the latest feed and pre-downloads and pre-extracts watched announcements."""
+
+    def __init__(
+        self,
+        watchlist: Watchlist,
+        cache_dir: str | Path,
+        hkex_service: HKEXAPIService | None = None,
+        pdf_service: PDFParserService | None = None,
+        extract: bool = True,
+        concurrency: int = DEFAULT_WATCH_CONCURRENCY,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            watchlist: Stocks and categories to watch.
+            cache_dir: PDF cache directory (the one the PDF tools resolve "/pdf_cache/" to).
+            hkex_service: HKEX API service (default: new service on the shared pool).
+            pdf_service: PDF service (default: new service on the shared pool).
+            extract: Also extract and save text and tables.
+            concurrency: Announcements processed in parallel.
+        """
+        self.watchlist = watchlist
+        self.cache_dir = str(cache_dir)
+        self.hkex_service = hkex_service or HKEXAPIService()
+        self.pdf_service = pdf_service or PDFParserService()
+        self.extract = extract
+        self.concurrency = max(1, concurrency)
+        self.cursor: str | None = None
+        self.stats = {"polls": 0, "matched": 0, "downloaded": 0, "extracted": 0, "errors": 0}
+
+    def _warm(self, item: dict[str, Any], stock_code: str) -> dict[str, Any]:
+        """Download one announcement and save its extraction next to the PDF."""
+        outcome = {"news_id": item.get("newsId"), "stock_code": stock_code, "title": item.get("title", "")}
+        try:
+            date = format_date_for_filename(item.get("relTime", ""))
+            cached = self.pdf_service.get_cached_pdf_path(stock_code, date, outcome["title"], self.cache_dir)
+            path = cached or self.pdf_service.download_pdf(
+                item["webPath"], stock_code, date, outcome["title"], self.cache_dir
+            )
+            outcome.update(path=path, downloaded=cached is None, extracted=False)
+            if self.extract and self.pdf_service.load_extracted_content(path) is None:
+                content = self.pdf_service.extract_all(path)
+                self.pdf_service.save_extracted_content(path, content["text"], content["tables"], force=True)
+                outcome["extracted"] = True
+        except Exception as e:
+            logger.warning("Failed to warm %s for %s", item.get("newsId"), stock_code, exc_info=True)
+            outcome["error"] = str(e)
+        return outcome
+
+    def poll_once(self) -> list[dict[str, Any]]:
+        """Fetch new feed items and warm the cache for watched ones.
+
+        Returns:
+            One outcome per (announcement, stock) pair with news_id, stock_code,
+            title, path, downloaded, extracted and error (on failure).
+        """
+        result = self.hkex_service.poll_latest_announcements(since=self.cursor)
+        self.stats["polls"] += 1
+        items = result["announcements"]
+        if len(items) == 1 and "error" in items[0]:
+            self.stats["errors"] += 1
+            logger.warning("Latest feed poll failed: %s", items[0]["error"])
+            return []
+        self.cursor = result["cursor"]
+
+        work = [(item, code) for item in items if item.get("webPath") for code in self.watchlist.matches(item)]
+        self.stats["matched"] += len(work)
+        if not work:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(work))) as executor:
+            outcomes = list(executor.map(lambda pair: self._warm(*pair), work))
+
+        for outcome in outcomes:
+            self.stats["downloaded"] += bool(outcome.get("downloaded"))
+            self.stats["extracted"] += bool(outcome.get("extracted"))
+            self.stats["errors"] += "error" in outcome
+        return outcomes
+
+    def run(
+        self,
+        interval: float = DEFAULT_POLL_SECONDS,
+        stop: threading.Event | None = None,
+        on_poll: Callable[[list[dict[str, Any]]], None] | None = None,
+    ) -> None:
+        """Poll until ``stop`` is set.
+
+        Args:
+            interval: Seconds between polls.
+            stop: Event that ends the loop (default: run forever).
+            on_poll: Optional callback receiving each poll's outcomes.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            outcomes = self.poll_once()
+            if on_poll is not None:
+                on_poll(outcomes)
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1 @@
+"""Offline test and benchmark helpers for the HKEX toolchain."""
@@ -0,0 +1,334 @@
+"""Offline stand-in for hkexnews.
+
+An ASGI app serving the endpoints the HKEX services use, from recorded
+fixtures under ``fixtures/hkex``:
+
+- ``/search/prefix.do`` (JSONP stock lookup)
+- ``/search/titleSearchServlet.do`` (title search, capped at 500 rows)
+- ``/ncms/json/eds/lcisehk1relsdc_1.json`` (latest feed)
+- ``/ncms/script/eds/*_c.json`` (category tables and active-stock lists)
+- ``/listedco/...pdf`` (announcement PDFs)
+
+Static files (everything but the two search endpoints) carry ETag and
+Last-Modified and answer If-None-Match with 304.
+
+Latency and error injection are configurable, and ``synthetic_per_stock``
+generates large deterministic result sets for throughput benchmarks. Point
+the toolchain at it with ``HKEX_BASE_URL``::
+
+    python -m src.testing.hkex_standin --port 8765 --latency 0.05 --error-rate 0.05
+    HKEX_BASE_URL=http://127.0.0.1:8765 hkex
+
+In-process, wrap the app in ``httpx.ASGITransport`` instead of a server.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs
+
+from src.services.hkex_api import HKEXAPIService
+from src.services.search_cache import MAX_ROW_RANGE
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "hkex"
+
+# Announcements listed in the latest feed
+LATEST_FEED_SIZE = 100
+
+# Fixture fields that the title search does not return (used for the latest feed)
+_FEED_ONLY_FIELDS = ("t1Code", "t2Code")
+
+Response = tuple[int, dict[str, str], bytes]
+
+
+@dataclass
+class StandinConfig:
+    """Stand-in behaviour.
+
+    Attributes:
+        latency: Delay added to every response, in seconds.
+        jitter: Extra random delay of up to this many seconds.
+        error_rate: Probability of answering with ``error_status`` instead.
+        error_status: Status code used for injected errors.
+        error_endpoints: Endpoint names ("prefix", "search", "latest",
+            "categories", "active_stocks", "pdf") that get errors; empty means all.
+        synthetic_per_stock: Generated announcements per fixture stock, added
+            to the recorded ones (0 = recorded fixtures only).
+        seed: Random seed for jitter, error injection and synthetic data.
+        fixtures_dir: Directory holding the recorded fixtures.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    error_endpoints: frozenset[str] = field(default_factory=frozenset)
+    synthetic_per_stock: int = 0
+    seed: int | None = 0
+    fixtures_dir: Path = FIXTURES_DIR
+
+
+def _synthetic(stocks: list[dict[str, Any]], per_stock: int, rng: random.Random) -> list[dict[str, Any]]:
+    """Generate announcements spread one or more per day back from yesterday."""
+    titles = ["翌日披露報表", "股份發行人的證券變動月報表", "董事會會議召開日期", "須予披露的交易", "自願性公告 &amp; 業務更新"]
+    t2_codes = ["51600", "51500", "13600", "11500", "13300"]
+    yesterday = date.today() - timedelta(days=1)
+    announcements = []
+    for stock in stocks:
+        for i in range(per_stock):
+            published = datetime.combine(yesterday - timedelta(days=i // 2), datetime.min.time()) + timedelta(
+                hours=rng.randint(7, 23), minutes=rng.randint(0, 59)
+            )
+            kind = rng.randrange(len(titles))
+            news_id = 20_000_000 + stock["stockId"] * 10_000 + i
+            announcements.append(
+                {
+                    "NEWS_ID": str(news_id),
+                    "STOCK_CODE": stock["code"],
+                    "STOCK_NAME": stock["name"],
+                    "TITLE": titles[kind],
+                    "FILE_TYPE": "PDF",
+                    "FILE_INFO": f"{rng.randint(50, 900)}KB",
+                    "FILE_LINK": f"/listedco/listconews/sehk/{published:%Y/%m%d}/{news_id}_c.pdf",
+                    "DATE_TIME": f"{published:%d/%m/%Y %H:%M}",
+                    "SHORT_TEXT": "公告及通告 - [其他]",
+                    "LONG_TEXT": "公告及通告 - [其他]",
+                    "t1Code": t2_codes[kind][0] + "0000",
+                    "t2Code": t2_codes[kind],
+                }
+            )
+    return announcements
+
+
+def _published(item: dict[str, Any]) -> datetime:
+    return datetime.strptime(item["DATE_TIME"], "%d/%m/%Y %H:%M")
+
+
+class HKEXStandin:
+    """ASGI app impersonating hkexnews from fixtures."""
+
+    def __init__(self, config: StandinConfig | None = None):
+        """Load the fixtures.
+
+        Args:
+            config: Stand-in behaviour (default: no latency, no errors, recorded data only).
+        """
+        self.config = config or StandinConfig()
+        self._rng = random.Random(self.config.seed)
+        fixtures = self.config.fixtures_dir
+
+        self.stocks: list[dict[str, Any]] = json.loads((fixtures / "stocks.json").read_text(encoding="utf-8"))
+        announcements = json.loads((fixtures / "announcements.json").read_text(encoding="utf-8"))
+        if self.config.synthetic_per_stock:
+            announcements += _synthetic(self.stocks, self.config.synthetic_per_stock, random.Random(self.config.seed))
+        self.announcements = sorted(announcements, key=_published, reverse=True)
+
+        self._stocks_by_id = {str(stock["stockId"]): stock for stock in self.stocks}
+        self._by_stock: dict[str, list[dict[str, Any]]] = {}
+        for item in self.announcements:
+            self._by_stock.setdefault(item["STOCK_CODE"], []).append(item)
+
+        self._static: dict[str, bytes] = {
+            filename: (fixtures / filename).read_bytes() for filename in HKEXAPIService.CATEGORY_FILES.values()
+        }
+        for market, filename in HKEXAPIService.ACTIVE_STOCK_FILES.items():
+            active = [{"c": s["code"], "i": s["stockId"], "n": s["name"]} for s in self.stocks if s["market"] == market]
+            self._static[filename] = json.dumps(active, ensure_ascii=False).encode()
+        self._static["lcisehk1relsdc_1.json"] = self._latest_feed()
+        self._last_modified = formatdate(usegmt=True)
+
+        self._pdf_dir = fixtures / "pdf"
+        self._sample_pdf = (self._pdf_dir / "sample.pdf").read_bytes()
+
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def _latest_feed(self) -> bytes:
+        """Build the latest-feed snapshot from the newest announcements."""
+        news = []
+        for item in self.announcements[:LATEST_FEED_SIZE]:
+            stock = next((s for s in self.stocks if s["code"] == item["STOCK_CODE"]), {})
+            news.append(
+                {
+                    "newsId": int(item["NEWS_ID"]),
+                    "title": item["TITLE"],
+                    "relTime": item["DATE_TIME"],
+                    "webPath": item["FILE_LINK"],
+                    "ext": item["FILE_TYPE"],
+                    "size": item["FILE_INFO"],
+                    "sTxt": item["SHORT_TEXT"],
+                    "lTxt": item["LONG_TEXT"],
+                    "t1Code": item.get("t1Code", "NaN"),
+                    "t2Code": item.get("t2Code", "NaN"),
+                    "market": stock.get("market", "SEHK"),
+                    "stock": [{"sc": item["STOCK_CODE"], "sn": item["STOCK_NAME"]}],
+                }
+            )
+        return json.dumps({"genTime": datetime.now().strftime("%d/%m/%Y %H:%M"), "newsInfoLst": news}, ensure_ascii=False).encode()
+
+    @staticmethod
+    def endpoint(path: str) -> str:
+        """Return the rate limiter endpoint name of a request path."""
+        if path.endswith(".pdf"):
+            return "pdf"
+        return HKEXAPIService.ENDPOINTS.get(path.rsplit("/", 1)[-1], "other")
+
+    def handle(self, path: str, query: dict[str, str], headers: dict[str, str]) -> Response:
+        """Answer one GET (without latency or error injection).
+
+        Args:
+            path: Request path.
+            query: Query parameters (last value wins).
+            headers: Request headers, lower-cased names.
+
+        Returns:
+            (status, response headers, body).
+        """
+        filename = path.rsplit("/", 1)[-1]
+        if filename == "prefix.do":
+            return self._prefix(query)
+        if filename == "titleSearchServlet.do":
+            return self._search(query)
+        if filename in self._static:
+            return self._static_file(self._static[filename], headers)
+        if path.startswith("/listedco/") and filename.endswith(".pdf"):
+            pdf = self._pdf_dir / filename
+            body = pdf.read_bytes() if pdf.is_file() else self._sample_pdf
+            return self._static_file(body, headers, "application/pdf")
+        return 404, {"content-type": "text/plain"}, b"Not Found"
+
+    def _prefix(self, query: dict[str, str]) -> Response:
+        name = query.get("name", "").strip()
+        matches = [
+            {"stockId": s["stockId"], "code": s["code"], "name": s["name"]}
+            for s in self.stocks
+            if name and (s["code"].startswith(name) or name in s["name"])
+        ]
+        body = json.dumps({"more": "0", "stockInfo": matches}, ensure_ascii=False)
+        callback = query.get("callback", "callback")
+        return 200, {"content-type": "text/javascript;charset=UTF-8"}, f"{callback}({body});".encode()
+
+    def _search(self, query: dict[str, str]) -> Response:
+        stock = self._stocks_by_id.get(query.get("stockId", ""))
+        try:
+            start = datetime.strptime(query.get("fromDate", ""), "%Y%m%d").date()
+            end = datetime.strptime(query.get("toDate", ""), "%Y%m%d").date()
+            row_range = min(int(query.get("rowRange", "100")), MAX_ROW_RANGE)
+        except ValueError:
+            return 400, {"content-type": "text/plain"}, b"Bad Request"
+
+        title = query.get("title", "").lower()
+        rows = [
+            {k: v for k, v in item.items() if k not in _FEED_ONLY_FIELDS}
+            for item in (self._by_stock.get(stock["code"], []) if stock else [])
+            if start <= _published(item).date() <= end and title in item["TITLE"].lower()
+        ]
+        page = rows[:row_range]
+        body = {
+            "result": json.dumps(page, ensure_ascii=False) if page else "null",
+            "hasNextRow": len(rows) > row_range,
+            "rowRange": row_range,
+            "loadedRecord": len(page),
+            "recordCnt": len(rows),
+        }
+        return 200, {"content-type": "application/json;charset=UTF-8"}, json.dumps(body, ensure_ascii=False).encode()
+
+    def _static_file(
+        self, body: bytes, headers: dict[str, str], content_type: str = "application/json;charset=UTF-8"
+    ) -> Response:
+        etag = f'"{hashlib.md5(body).hexdigest()}"'  # noqa: S324
+        validators = {"etag": etag, "last-modified": self._last_modified}
+        if headers.get("if-none-match") == etag:
+            return 304, validators, b""
+        return 200, {"content-type": content_type, **validators}, body
+
+    def _inject_error(self, endpoint: str) -> bool:
+        config = self.config
+        if config.error_rate <= 0 or (config.error_endpoints and endpoint not in config.error_endpoints):
+            return False
+        return self._rng.random() < config.error_rate
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        """ASGI entry point."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        path = scope["path"]
+        endpoint = self.endpoint(path)
+        self.requests[endpoint] += 1
+        delay = self.config.latency + (self._rng.uniform(0, self.config.jitter) if self.config.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if scope["method"] != "GET":
+            status, headers, body = 405, {"content-type": "text/plain"}, b"Method Not Allowed"
+        elif self._inject_error(endpoint):
+            self.errors[endpoint] += 1
+            status, headers, body = self.config.error_status, {"content-type": "text/plain"}, b"Injected error"
+        else:
+            query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+            request_headers = {k.decode().lower(): v.decode() for k, v in scope.get("headers", [])}
+            status, headers, body = self.handle(path, query, request_headers)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(k.encode(), v.encode()) for k, v in {**headers, "content-length": str(len(body))}.items()],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return requests served and errors injected per endpoint."""
+        return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+
+def main() -> None:
+    """Serve the stand-in with uvicorn."""
+    parser = argparse.ArgumentParser(description="Offline hkexnews stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay per response in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to N seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--error-endpoints", default="", help="Comma-separated endpoint names (default: all)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generated announcements per stock")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn is required to serve the stand-in: pip install uvicorn") from None
+
+    config = StandinConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        error_endpoints=frozenset(name for name in args.error_endpoints.split(",") if name),
+        synthetic_per_stock=args.synthetic,
+        seed=args.seed,
+    )
+    print(f"hkexnews stand-in on http://{args.host}:{args.port} (set HKEX_BASE_URL to use it)")
+    uvicorn.run(HKEXStandin(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Synthetic PDFs for extraction tests and benchmarks.
+
+The recorded ``sample.pdf`` is three short pages of plain text. Extraction
+code also has to be exercised on long reports with headings and ruled
+tables; ``report_pdf`` writes such a document (Helvetica text, a large-font
+heading and a grid-lined table on selected pages) without any PDF library.
+"""
+
+from collections.abc import Sequence
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_stream(
+    lines: Sequence[str],
+    heading: str | None = None,
+    table: Sequence[Sequence[str]] | None = None,
+) -> str:
+    """Build the content stream of one page.
+
+    Args:
+        lines: Body text lines (12 pt, top to bottom).
+        heading: Optional 18 pt heading above the body.
+        table: Optional grid-lined table (rows of cells) below the body.
+    """
+    ops = ["BT", "/F1 12 Tf", "14 TL", "72 760 Td"]
+    if heading:
+        ops += ["/F1 18 Tf", f"({_escape(heading)}) Tj", "0 -24 Td", "/F1 12 Tf"]
+    ops += [f"({_escape(line)}) Tj T*" for line in lines]
+    ops.append("ET")
+
+    if table:
+        columns = max(len(row) for row in table)
+        width, height = 120, 20
+        left, top = 72, 740 - 24 - 14 * len(lines) - 20
+        for r, row in enumerate(table):
+            for c, cell in enumerate(row):
+                x, y = left + c * width + 4, top - (r + 1) * height + 6
+                ops.append(f"BT /F1 10 Tf {x} {y} Td ({_escape(cell)}) Tj ET")
+        for r in range(len(table) + 1):
+            y = top - r * height
+            ops.append(f"{left} {y} m {left + columns * width} {y} l S")
+        for c in range(columns + 1):
+            x = left + c * width
+            ops.append(f"{x} {top} m {x} {top - len(table) * height} l S")
+    return "\n".join(ops)
+
+
+def build_pdf(streams: Sequence[str]) -> bytes:
+    """Assemble a PDF with one page per content stream."""
+    num_pages = len(streams)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(num_pages))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, stream in enumerate(streams):
+        data = stream.encode("latin-1")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(data)} >>\nstream\n{stream}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def report_pdf(num_pages: int, lines_per_page: int = 30, heading_every: int = 5, table_every: int = 3) -> bytes:
+    """Write a synthetic financial report.
+
+    Page ``n`` (1-based) carries ``lines_per_page`` lines mentioning
+    "page n"; pages where ``n % heading_every == 1`` start with the heading
+    "SECTION <k>", and pages where ``n % table_every == 0`` end with a 3x3
+    table (0 disables either).
+    """
+    streams = []
+    for n in range(1, num_pages + 1):
+        lines = [f"Page {n} line {i}: segment revenue HK$ {n * 1000 + i:,} thousand" for i in range(lines_per_page)]
+        heading = f"SECTION {n // heading_every + 1}" if heading_every and n % heading_every == 1 else None
+        table = None
+        if table_every and n % table_every == 0:
+            table = [["Item", "2025", "2024"], ["Revenue", f"{n * 10}", f"{n * 9}"], ["Profit", f"{n}", f"{n - 1}"]]
+        streams.append(page_stream(lines[: max(0, lines_per_page - (8 if table else 0))], heading, table))
+    return build_pdf(streams)
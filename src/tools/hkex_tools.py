@@ -4,10 +4,93 @@ from typing import Any
 
 from langchain_core.tools import tool
 
-from src.services.hkex_api import HKEXAPIService
+from src.services.category_cache import CategoryIndex
+from src.services.hkex_api import AsyncHKEXAPIService, HKEXAPIService
+from src.services.result_pages import get_result_pages
 
-# Initialize service instance
+# Initialize service instances
+# The sync service backs tool.invoke(); the async one backs tool.ainvoke(), so
+# parallel tool calls from the agent overlap their network I/O.
 _hkex_service = HKEXAPIService()
+_async_hkex_service = AsyncHKEXAPIService()
+
+
+# Fields kept per announcement in batch results
+BATCH_FIELDS = ("NEWS_ID", "DATE_TIME", "TITLE", "FILE_LINK")
+
+# Announcements per page in search and latest-feed results
+DEFAULT_PAGE_LIMIT = 50
+
+
+def _compact_batch(entries: list[dict[str, Any]], max_per_stock: int) -> dict[str, Any]:
+    """Shrink batch search entries into a compact per-stock table."""
+    results = []
+    for entry in entries:
+        row = {
+            "stock_code": entry["stock_code"],
+            "stock_id": entry["stock_id"],
+            "count": len(entry["announcements"]),
+            "announcements": [
+                {field: item.get(field) for field in BATCH_FIELDS} for item in entry["announcements"][:max_per_stock]
+            ],
+        }
+        if entry["error"]:
+            row["error"] = entry["error"]
+            if entry.get("error_type"):
+                row["error_type"] = entry["error_type"]
+        results.append(row)
+
+    return {
+        "stocks": len(results),
+        "errors": sum(1 for row in results if "error" in row),
+        "results": results,
+    }
+
+
+def _failure(entries: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Return the typed error entry when a service call failed, else None."""
+    if len(entries) == 1 and "error" in entries[0]:
+        return entries[0]
+    return None
+
+
+def _stock_not_found(stock_code: str, stock_info: list[dict[str, Any]]) -> dict[str, Any]:
+    """Build the search result returned when a stock code cannot be resolved."""
+    return {
+        "stock_code": stock_code,
+        "stock_id": None,
+        "error": "Stock not found",
+        "announcements": [],
+        **(_failure(stock_info) or {}),
+    }
+
+
+def _search_result(
+    stock_code: str,
+    stock_id: Any,
+    announcements: list[dict[str, Any]],
+    fields: list[str] | None,
+    limit: int,
+) -> dict[str, Any]:
+    """Build the first page of a search result, lifting a failure into top-level error fields."""
+    if failure := _failure(announcements):
+        return {"stock_code": stock_code, "stock_id": stock_id, "announcements": [], **failure}
+    return get_result_pages().first_page(
+        announcements, limit, fields, meta={"stock_code": stock_code, "stock_id": stock_id}
+    )
+
+
+def _next_page(page_cursor: str, fields: list[str] | None, limit: int) -> dict[str, Any]:
+    """Return the page a cursor points at, or an error if it expired."""
+    page = get_result_pages().next_page(page_cursor, limit, fields)
+    if page is None:
+        return {
+            "announcements": [],
+            "count": 0,
+            "error": "Page cursor expired or unknown; repeat the original call",
+            "error_type": "cursor",
+        }
+    return page
 
 
 @tool
@@ -18,6 +101,9 @@ def search_hkex_announcements(
     title: str | None = None,
     market: str = "SEHK",
     row_range: int = 100,
+    fields: list[str] | None = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    page_cursor: str | None = None,
 ) -> dict[str, Any]:
     """Search HKEX announcements for a specific stock.
 
@@ -30,12 +116,21 @@ def search_hkex_announcements(
         to_date: End date in YYYYMMDD format (e.g., "20251008").
         title: Optional search keyword to filter by title.
         market: Market code - "SEHK" (main board) or "GEM" (default: "SEHK").
-        row_range: Number of results to return, 1-500 (default: 100).
+        row_range: Maximum number of results to search for, newest first (default: 100).
+            Values above 500 are allowed; long ranges are fetched in sub-windows and merged.
+        fields: Announcement fields to return, e.g. ["NEWS_ID", "DATE_TIME", "TITLE", "FILE_LINK"]
+            (default: all). Leaving out LONG_TEXT/SHORT_TEXT keeps results small.
+        limit: Announcements per page (default: 50).
+        page_cursor: "next_page_cursor" from a previous result; returns the next page of
+            that result without searching again (the other arguments except fields/limit are ignored).
 
     Returns:
         Dictionary containing:
         - stock_id: Internal stock ID
         - stock_code: Stock code
+        - count: Number of announcements in this page
+        - total: Number of announcements found
+        - next_page_cursor: Pass as page_cursor to get the next page (None on the last page)
         - announcements: List of announcement dictionaries, each containing:
           - NEWS_ID: News ID
           - TITLE: Announcement title
@@ -47,17 +142,18 @@ def search_hkex_announcements(
           - FILE_INFO: File size information
           - SHORT_TEXT: Short description
           - LONG_TEXT: Long description
+        - error: Error message (only present on failure)
+        - error_type: "timeout", "connection", "http_status", "parse" or "circuit_open"
+          (only present on network failures; "circuit_open" means hkexnews is down, retry later)
     """
+    if page_cursor:
+        return _next_page(page_cursor, fields, limit)
+
     # Get stock ID
     stock_id, stock_info = _hkex_service.get_stock_id(stock_code)
 
     if not stock_id:
-        return {
-            "stock_code": stock_code,
-            "stock_id": None,
-            "error": "Stock not found",
-            "announcements": [],
-        }
+        return _stock_not_found(stock_code, stock_info)
 
     # Search announcements
     stock_id, announcements = _hkex_service.search_announcements(
@@ -69,11 +165,181 @@ def search_hkex_announcements(
         row_range=row_range,
     )
 
-    return {
-        "stock_code": stock_code,
-        "stock_id": stock_id,
-        "announcements": announcements,
-    }
+    return _search_result(stock_code, stock_id, announcements, fields, limit)
+
+
+async def _asearch_hkex_announcements(
+    stock_code: str,
+    from_date: str,
+    to_date: str,
+    title: str | None = None,
+    market: str = "SEHK",
+    row_range: int = 100,
+    fields: list[str] | None = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    page_cursor: str | None = None,
+) -> dict[str, Any]:
+    """Async implementation of search_hkex_announcements."""
+    if page_cursor:
+        return _next_page(page_cursor, fields, limit)
+
+    stock_id, stock_info = await _async_hkex_service.get_stock_id(stock_code)
+
+    if not stock_id:
+        return _stock_not_found(stock_code, stock_info)
+
+    stock_id, announcements = await _async_hkex_service.search_announcements(
+        stock_id=stock_id,
+        from_date=from_date,
+        to_date=to_date,
+        title=title,
+        market=market,
+        row_range=row_range,
+    )
+
+    return _search_result(stock_code, stock_id, announcements, fields, limit)
+
+
+search_hkex_announcements.coroutine = _asearch_hkex_announcements
+
+
+@tool
+def search_hkex_announcements_batch(
+    stock_codes: list[str],
+    from_date: str,
+    to_date: str,
+    title: str | None = None,
+    market: str = "SEHK",
+    max_per_stock: int = 20,
+) -> dict[str, Any]:
+    """Search HKEX announcements for many stocks in one call (watchlist screening).
+
+    Stock IDs are resolved and searches run concurrently, so a whole watchlist is
+    screened in a single tool call. Prefer this over calling search_hkex_announcements
+    once per stock.
+
+    Args:
+        stock_codes: List of 5-digit stock codes (e.g., ["00673", "00001"]).
+        from_date: Start date in YYYYMMDD format (e.g., "20250101").
+        to_date: End date in YYYYMMDD format (e.g., "20251008").
+        title: Optional search keyword to filter by title.
+        market: Market code - "SEHK" (main board) or "GEM" (default: "SEHK").
+        max_per_stock: Maximum announcements listed per stock, newest first (default: 20).
+
+    Returns:
+        Dictionary containing:
+        - stocks: Number of stocks searched
+        - errors: Number of stocks that failed
+        - results: One entry per stock, each containing:
+          - stock_code: Stock code
+          - stock_id: Internal stock ID (None if not found)
+          - count: Number of announcements found
+          - announcements: Up to max_per_stock items with NEWS_ID, DATE_TIME, TITLE, FILE_LINK
+          - error: Error message (only present if this stock failed)
+          - error_type: "timeout", "connection", "http_status", "parse" or "circuit_open" (on network failures)
+    """
+    entries = _hkex_service.search_announcements_batch(
+        stock_codes,
+        from_date=from_date,
+        to_date=to_date,
+        title=title,
+        market=market,
+    )
+
+    return _compact_batch(entries, max_per_stock)
+
+
+async def _asearch_hkex_announcements_batch(
+    stock_codes: list[str],
+    from_date: str,
+    to_date: str,
+    title: str | None = None,
+    market: str = "SEHK",
+    max_per_stock: int = 20,
+) -> dict[str, Any]:
+    """Async implementation of search_hkex_announcements_batch."""
+    entries = await _async_hkex_service.search_announcements_batch(
+        stock_codes,
+        from_date=from_date,
+        to_date=to_date,
+        title=title,
+        market=market,
+    )
+
+    return _compact_batch(entries, max_per_stock)
+
+
+search_hkex_announcements_batch.coroutine = _asearch_hkex_announcements_batch
+
+
+@tool
+def search_local_announcements(
+    query: str,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    stock_code: str | None = None,
+    t1_code: str | None = None,
+    t2_code: str | None = None,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """Search the local announcement index across all issuers (offline, milliseconds).
+
+    Every announcement fetched by the other HKEX tools is stored in a local full-text
+    index. Use this for keyword scans across many issuers, e.g. "供股|配售". Only
+    announcements that were fetched before are covered.
+
+    Args:
+        query: Keywords; "|" means OR, spaces mean AND (e.g. "供股|配售", "關連交易 收購").
+        from_date: Start date in YYYYMMDD format (optional).
+        to_date: End date in YYYYMMDD format (optional).
+        stock_code: Restrict to a 5-digit stock code (optional).
+        t1_code: Restrict to a tier 1 category code (optional).
+        t2_code: Restrict to a tier 2 category code (optional).
+        limit: Maximum number of results (default: 50).
+
+    Returns:
+        Dictionary containing:
+        - query: The query
+        - announcements: Matching announcements, newest first (same fields as search_hkex_announcements)
+        - count: Number of results
+        - indexed: Total number of announcements in the local index
+    """
+    try:
+        from_iso = f"{from_date[:4]}-{from_date[4:6]}-{from_date[6:8]}" if from_date else None
+        to_iso = f"{to_date[:4]}-{to_date[4:6]}-{to_date[6:8]}" if to_date else None
+        index = _hkex_service.announcement_index
+        announcements = index.search(
+            query,
+            from_iso,
+            to_iso,
+            stock_code=stock_code,
+            t1_code=t1_code,
+            t2_code=t2_code,
+            limit=limit,
+        )
+        return {
+            "query": query,
+            "announcements": announcements,
+            "count": len(announcements),
+            "indexed": index.stats()["announcements"],
+        }
+    except Exception as e:
+        return {"query": query, "announcements": [], "count": 0, "error": str(e)}
+
+
+def _names_category(*codes: str | None) -> bool:
+    """Whether a category filter is given as a name, which needs the category index to resolve."""
+    return any(code and not code.isdigit() for code in codes)
+
+
+def _latest_result(
+    result: dict[str, Any], index: CategoryIndex, fields: list[str] | None, limit: int
+) -> dict[str, Any]:
+    """Build the first page of a latest-feed result with category names added to each item."""
+    if failure := _failure(result["announcements"]):
+        return {"announcements": [], "count": 0, "cursor": result["cursor"], **failure}
+    announcements = [index.enrich_latest(item) for item in result["announcements"]]
+    return get_result_pages().first_page(announcements, limit, fields, meta={"cursor": result["cursor"]})
 
 
 @tool
@@ -82,17 +348,30 @@ def get_latest_hkex_announcements(
     stock_code: str | None = None,
     t1_code: str | None = None,
     t2_code: str | None = None,
+    t2g_code: str | None = None,
+    since: str | None = None,
+    fields: list[str] | None = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    page_cursor: str | None = None,
 ) -> dict[str, Any]:
     """Get latest announcements from HKEX.
 
     This tool fetches the most recent announcements from the Hong Kong Stock Exchange.
-    You can filter by market, stock code, or category codes.
+    You can filter by market, stock code, or category codes. Pass the "cursor" from a
+    previous call as `since` to get only announcements published after that call.
 
     Args:
         market: Filter by market - "SEHK" (main board) or "GEM" (optional).
         stock_code: Filter by 5-digit stock code (optional).
-        t1_code: Filter by tier 1 category code (optional).
-        t2_code: Filter by tier 2 category code (optional).
+        t1_code: Filter by tier 1 category code or name (optional).
+        t2_code: Filter by tier 2 category code or name (optional).
+        t2g_code: Filter by tier 2 group code (optional).
+        since: Cursor from a previous call; only newer announcements are returned (optional).
+        fields: Announcement fields to return, e.g. ["newsId", "relTime", "title", "webPath", "stock"]
+            (default: all).
+        limit: Announcements per page (default: 50).
+        page_cursor: "next_page_cursor" from a previous result; returns its next page without
+            fetching the feed again (the other arguments except fields/limit are ignored).
 
     Returns:
         Dictionary containing:
@@ -107,20 +386,68 @@ def get_latest_hkex_announcements(
           - lTxt: Long text description
           - t1Code: Tier 1 category code (may be "NaN")
           - t2Code: Tier 2 category code (may be "NaN")
+          - t1Name: Tier 1 category name (if known)
+          - t2Name: Tier 2 category name (if known)
           - market: Market code
           - stock: List of stock dictionaries with "sc" (stock code) and "sn" (stock name)
+        - count: Number of announcements in this page
+        - total: Number of matching announcements
+        - next_page_cursor: Pass as page_cursor to get the next page (None on the last page)
+        - cursor: Pass as `since` on the next call to get only newer announcements
+        - error, error_type: Present only on failure (same meaning as in search_hkex_announcements)
     """
-    announcements = _hkex_service.get_latest_announcements(
+    if page_cursor:
+        return _next_page(page_cursor, fields, limit)
+
+    # Enrich with whatever tables are cached; fetch them only to resolve a category name
+    if _names_category(t1_code, t2_code):
+        index = _hkex_service.get_category_index()
+    else:
+        index = _hkex_service.category_cache.index()
+    result = _hkex_service.poll_latest_announcements(
+        since=since,
         market=market,
         stock_code=stock_code,
-        t1_code=t1_code,
-        t2_code=t2_code,
+        t1_code=index.resolve_code(t1_code, tier=1) if t1_code else None,
+        t2_code=index.resolve_code(t2_code, tier=2) if t2_code else None,
+        t2g_code=t2g_code,
     )
 
-    return {
-        "announcements": announcements,
-        "count": len(announcements),
-    }
+    return _latest_result(result, index, fields, limit)
+
+
+async def _aget_latest_hkex_announcements(
+    market: str | None = None,
+    stock_code: str | None = None,
+    t1_code: str | None = None,
+    t2_code: str | None = None,
+    t2g_code: str | None = None,
+    since: str | None = None,
+    fields: list[str] | None = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    page_cursor: str | None = None,
+) -> dict[str, Any]:
+    """Async implementation of get_latest_hkex_announcements."""
+    if page_cursor:
+        return _next_page(page_cursor, fields, limit)
+
+    if _names_category(t1_code, t2_code):
+        index = await _async_hkex_service.get_category_index()
+    else:
+        index = _async_hkex_service.category_cache.index()
+    result = await _async_hkex_service.poll_latest_announcements(
+        since=since,
+        market=market,
+        stock_code=stock_code,
+        t1_code=index.resolve_code(t1_code, tier=1) if t1_code else None,
+        t2_code=index.resolve_code(t2_code, tier=2) if t2_code else None,
+        t2g_code=t2g_code,
+    )
+
+    return _latest_result(result, index, fields, limit)
+
+
+get_latest_hkex_announcements.coroutine = _aget_latest_hkex_announcements
 
 
 @tool
@@ -152,6 +479,21 @@ def get_stock_info(stock_code: str) -> dict[str, Any]:
     }
 
 
+async def _aget_stock_info(stock_code: str) -> dict[str, Any]:
+    """Async implementation of get_stock_info."""
+    stock_id, stock_info = await _async_hkex_service.get_stock_id(stock_code)
+
+    return {
+        "stock_code": stock_code,
+        "stock_id": stock_id,
+        "stock_info": stock_info,
+        "found": stock_id is not None,
+    }
+
+
+get_stock_info.coroutine = _aget_stock_info
+
+
 @tool
 def get_announcement_categories(
     category_type: str = "tierone",
@@ -160,6 +502,7 @@ def get_announcement_categories(
 
     This tool retrieves category codes used for filtering announcements.
     Categories help classify announcements by type (e.g., financial statements, notices).
+    The tables are cached locally, so repeated calls cost no network request.
 
     Args:
         category_type: Type of category to retrieve:
@@ -183,3 +526,17 @@ def get_announcement_categories(
         "categories": categories,
     }
 
+
+async def _aget_announcement_categories(
+    category_type: str = "tierone",
+) -> dict[str, Any]:
+    """Async implementation of get_announcement_categories."""
+    categories = await _async_hkex_service.get_categories(category_type)
+
+    return {
+        "category_type": category_type,
+        "categories": categories,
+    }
+
+
+get_announcement_categories.coroutine = _aget_announcement_categories
@@ -1,5 +1,6 @@
 """PDF processing tools for DeepAgents."""
 
+import re
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +22,10 @@ MAX_INLINE_TABLE_ROWS = 200     # Limit total table rows
 TEXT_PREVIEW_CHARS = 5_000      # Preview length for truncated text
 TABLE_PREVIEW_COUNT = 5         # Number of tables to include in preview
 
+# find_in_pdf result limits
+MAX_SEARCH_MATCHES = 50         # Matches returned with snippets
+SNIPPET_CONTEXT_CHARS = 80      # Context on each side of a match
+
 
 def _resolve_cache_dir(cache_dir: str) -> str:
     """Resolve virtual cache directory path to actual filesystem path.
@@ -170,12 +175,47 @@ def download_announcement_pdf(
         }
 
 
+def _partial_result(pdf_path: str, content: dict[str, Any]) -> dict[str, Any]:
+    """Build the extract_pdf_content result of a preview stopped at the inline limits."""
+    text_path, tables_path = _pdf_service.extracted_content_paths(pdf_path)
+    parsed = f"{content['pages_parsed']}/{content['num_pages']}"
+    text = content["text"]
+    tables = content.get("tables", [])
+
+    preview_text = text[:TEXT_PREVIEW_CHARS]
+    preview_text += f"\n\n... (已截断，已解析前 {parsed} 页，内容超出内联上限)\n"
+    preview_text += f"⏳ 完整内容正在后台解析，完成后保存至: {text_path}\n"
+    preview_text += f"📖 稍后使用 read_file('{text_path}') 获取完整文本"
+
+    result = {
+        "success": True,
+        "text": preview_text,
+        "tables": tables[:TABLE_PREVIEW_COUNT],
+        "text_length": len(text),
+        "num_tables": len(tables),
+        "truncated": True,
+        "complete": False,
+        "pages_parsed": content["pages_parsed"],
+        "num_pages": content["num_pages"],
+        "text_path": text_path,
+        "preview_info": {"text": f"已解析前 {parsed} 页，完整文本后台生成中，查看 text_path", "tables": None},
+    }
+    if "tables" in content:
+        result["tables_path"] = tables_path
+        result["preview_info"]["tables"] = (
+            f"⚠️  仅显示前 {TABLE_PREVIEW_COUNT} 个表格（已解析页中共 {len(tables)} 个）\n"
+            f"⏳ 完整表格正在后台解析，完成后保存至: {tables_path}"
+        )
+    return result
+
+
 @tool
 def extract_pdf_content(
     pdf_path: str,
     include_tables: bool = True,
     max_inline_chars: int = MAX_INLINE_TEXT_CHARS,
     max_table_rows: int = MAX_INLINE_TABLE_ROWS,
+    preview: bool = True,
 ) -> dict[str, Any]:
     """Extract text and tables from a PDF file with intelligent truncation.
 
@@ -183,6 +223,11 @@ def extract_pdf_content(
     the full content is automatically saved to cache files, and only a preview
     is returned to avoid exceeding LLM token limits.
 
+    In preview mode (default) parsing of a large PDF stops as soon as it is
+    known to exceed these limits, so the preview comes back quickly; the full
+    content is then extracted in the background and written to text_path /
+    tables_path shortly afterwards (complete is False in that case).
+
     This tool extracts all text content and optionally tables from a PDF announcement.
     The PDF should already be downloaded (use download_announcement_pdf first).
 
@@ -191,6 +236,7 @@ def extract_pdf_content(
         include_tables: Whether to extract tables (default: True).
         max_inline_chars: Maximum inline text characters (default: 50k).
         max_table_rows: Maximum inline table rows (default: 200).
+        preview: Stop parsing at the inline limits and finish in the background (default: True).
 
     Returns:
         Dictionary containing:
@@ -200,16 +246,27 @@ def extract_pdf_content(
         - tables: List of tables (full for small PDFs, preview for large PDFs)
         - tables_path: Full tables cache path (only if truncated)
         - truncated: Boolean indicating if content was truncated
-        - text_length: Total text length (characters)
-        - num_tables: Total number of tables
+        - text_length: Total text length (characters; parsed pages only if not complete)
+        - num_tables: Total number of tables (parsed pages only if not complete)
         - preview_info: Preview information (only if truncated)
+        - complete, pages_parsed, num_pages: Only for a preview stopped at the limits
     """
     try:
-        # 1. Extract full content
-        full_text = _pdf_service.extract_text(pdf_path)
-        full_tables = []
-        if include_tables:
-            full_tables = _pdf_service.extract_tables(pdf_path)
+        # 1. Extract full content in one pass (served from the extraction
+        # cache when this file was extracted before, e.g. by the watcher).
+        # With tables the structure comes almost free and is cached for a
+        # following analyze_pdf_structure.
+        want = {"text", "tables", "structure"} if include_tables else {"text"}
+        if preview:
+            content = _pdf_service.extract_preview(
+                pdf_path, want, max_chars=max_inline_chars, max_table_rows=max_table_rows
+            )
+            if not content["complete"]:
+                return _partial_result(pdf_path, content)
+        else:
+            content = _pdf_service.extract_all(pdf_path, want)
+        full_text = content["text"]
+        full_tables = content.get("tables", [])
 
         # 2. Determine if truncation is needed
         text_truncated = len(full_text) > max_inline_chars
@@ -304,7 +361,7 @@ def analyze_pdf_structure(pdf_path: str) -> dict[str, Any]:
         - estimated_sections: List of potential section markers with page numbers
     """
     try:
-        structure = _pdf_service.analyze_structure(pdf_path)
+        structure = _pdf_service.extract_all(pdf_path, {"structure"})["structure"]
 
         return {
             "success": True,
@@ -320,3 +377,151 @@ def analyze_pdf_structure(pdf_path: str) -> dict[str, Any]:
             "error": str(e),
         }
 
+
+@tool
+def extract_pdf_pages(
+    pdf_path: str,
+    pages: str,
+    include_tables: bool = True,
+    max_inline_chars: int = MAX_INLINE_TEXT_CHARS,
+) -> dict[str, Any]:
+    """Extract the text and tables of selected pages of a PDF file.
+
+    Only the selected pages are parsed (or read from the page index when the
+    PDF was extracted before), so this is much cheaper than extract_pdf_content
+    for a section of a long report. Use find_in_pdf or analyze_pdf_structure
+    to locate the pages first.
+
+    Args:
+        pdf_path: Full path to PDF file.
+        pages: Page selection, 1-based: "12-18", "5", "1,4-6" or "20-" (to the end).
+        include_tables: Whether to extract tables (default: True).
+        max_inline_chars: Maximum inline text characters (default: 50k).
+
+    Returns:
+        Dictionary containing:
+        - success: Boolean indicating success
+        - num_pages: Number of pages in the PDF
+        - pages: List of {page, text, tables} for the selected pages
+        - text_length: Total text length of the selected pages (characters)
+        - truncated: Boolean indicating if text was cut at max_inline_chars
+        - note: Truncation note (only if truncated)
+    """
+    try:
+        content = _pdf_service.extract_pages(pdf_path, pages, include_tables=include_tables)
+        selected = content["pages"]
+        text_length = sum(len(page["text"]) for page in selected)
+
+        # Keep whole pages while they fit the budget; cut the first page that does not
+        max_inline_chars = max(1, max_inline_chars)
+        budget = max_inline_chars
+        result_pages = []
+        for page in selected:
+            if len(page["text"]) > budget:
+                page = {**page, "text": page["text"][:budget]}
+            budget -= len(page["text"])
+            result_pages.append(page)
+            if budget <= 0:
+                break
+        truncated = text_length > max_inline_chars
+
+        result = {
+            "success": True,
+            "num_pages": content["num_pages"],
+            "pages": result_pages,
+            "text_length": text_length,
+            "truncated": truncated,
+        }
+        if truncated:
+            last = result_pages[-1]["page"]
+            result["note"] = (
+                f"已截断，所选页面文本共 {text_length:,} 字符，超出内联上限；"
+                f"内容截止于第 {last} 页，请缩小页码范围后再次调用"
+            )
+        return result
+
+    except Exception as e:
+        return {
+            "success": False,
+            "num_pages": 0,
+            "pages": [],
+            "text_length": 0,
+            "truncated": False,
+            "error": str(e),
+        }
+
+
+@tool
+def find_in_pdf(
+    pdf_path: str,
+    pattern: str,
+    ignore_case: bool = True,
+    max_matches: int = MAX_SEARCH_MATCHES,
+) -> dict[str, Any]:
+    """Find the pages of a PDF file that contain a keyword or regular expression.
+
+    Searches a per-page text index that is built on first use (text only, no
+    tables) and cached with the other extraction results, so later searches
+    of the same PDF do not parse it again. Use the returned page numbers with
+    extract_pdf_pages to read just those pages.
+
+    Args:
+        pdf_path: Full path to PDF file.
+        pattern: Keyword or regular expression (e.g. "segment revenue", "收益|营业额").
+            Invalid regular expressions are searched as plain text.
+        ignore_case: Case-insensitive search (default: True).
+        max_matches: Maximum matches returned with snippets (default: 50).
+
+    Returns:
+        Dictionary containing:
+        - success: Boolean indicating success
+        - pattern: The search pattern
+        - pages: Sorted page numbers (1-based) with at least one match
+        - matches: List of {page, snippet} (at most max_matches)
+        - num_matches: Total number of matches
+        - num_pages: Number of pages in the PDF
+    """
+    try:
+        flags = re.IGNORECASE if ignore_case else 0
+        try:
+            regex = re.compile(pattern, flags)
+        except re.error:
+            regex = re.compile(re.escape(pattern), flags)
+
+        page_texts = _pdf_service.page_index(pdf_path)
+        pages = []
+        matches = []
+        num_matches = 0
+        for page_num, text in enumerate(page_texts, 1):
+            found = False
+            for match in regex.finditer(text):
+                if match.start() == match.end():
+                    continue
+                found = True
+                num_matches += 1
+                if len(matches) < max_matches:
+                    start = max(0, match.start() - SNIPPET_CONTEXT_CHARS)
+                    end = match.end() + SNIPPET_CONTEXT_CHARS
+                    matches.append({"page": page_num, "snippet": " ".join(text[start:end].split())})
+            if found:
+                pages.append(page_num)
+
+        return {
+            "success": True,
+            "pattern": pattern,
+            "pages": pages,
+            "matches": matches,
+            "num_matches": num_matches,
+            "num_pages": len(page_texts),
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "pattern": pattern,
+            "pages": [],
+            "matches": [],
+            "num_matches": 0,
+            "num_pages": 0,
+            "error": str(e),
+        }